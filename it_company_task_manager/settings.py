@@ -42,6 +42,10 @@ INTERNAL_IPS = [
     "127.0.0.1",
 ]
 
+DEBUG_TOOLBAR_CONFIG = {
+    "SHOW_TOOLBAR_CALLBACK": "task_manager.toolbar.show_toolbar",
+}
+
 # Application definition
 
 INSTALLED_APPS = [
@@ -58,22 +62,40 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "task_manager.instrumentation.PerformanceMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
+    # Fails requests over their view's query budget; only active in DEBUG.
+    "task_manager.query_budget.QueryBudgetMiddleware",
+    "task_manager.static_files.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "task_manager.profiling.ProfilingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# The toolbar middleware is sync only: under ASGI it would make every
+# request switch threads, so it is left out unless DEBUG.
+if DEBUG:
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index("task_manager.static_files.WhiteNoiseMiddleware") + 1,
+        "debug_toolbar.middleware.DebugToolbarMiddleware",
+    )
+else:
+    SILENCED_SYSTEM_CHECKS = ["debug_toolbar.W001"]
+
+# Serve the async views of task_manager/async_views.py. Only worth it under
+# an ASGI server (uvicorn), see `manage.py benchmark_servers`.
+ASYNC_VIEWS = env.bool("ASYNC_VIEWS", default=False)
+
 ROOT_URLCONF = "it_company_task_manager.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        # Times rendering for PerformanceMiddleware.
+        "BACKEND": "task_manager.instrumentation.InstrumentedDjangoTemplates",
         "DIRS": [BASE_DIR / "templates"],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -89,6 +111,8 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "it_company_task_manager.wsgi.application"
 
+TEST_RUNNER = "it_company_task_manager.test_runner.TestRunner"
+
 
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
@@ -97,6 +121,95 @@ DATABASES = {
     "default": env.db(default="sqlite:///db.sqlite3")
 }
 
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# Use a shared backend (e.g. redis:// or memcache://) when running several
+# workers, so signal-driven invalidation reaches every process.
+
+CACHES = {
+    "default": env.cache("CACHE_URL", default="locmemcache://")
+}
+
+# Wrap the cache to count hits and misses per request for
+# PerformanceMiddleware; drop this to use the backend directly.
+CACHES["default"] = {
+    **CACHES["default"],
+    "BACKEND": "task_manager.instrumentation.InstrumentedCache",
+    "OPTIONS": {
+        **CACHES["default"].get("OPTIONS", {}),
+        "BACKEND": CACHES["default"]["BACKEND"],
+    },
+}
+
+DASHBOARD_COUNTERS_TIMEOUT = 300
+
+VISIT_COUNTER_FLUSH_EVERY = 10
+
+VISIT_COUNTER_TIMEOUT = None
+
+# The test runner turns it off; see it_company_task_manager/test_runner.py.
+VIEW_CACHE_ENABLED = env.bool("VIEW_CACHE_ENABLED", default=True)
+
+VIEW_CACHE_TIMEOUT = 300
+
+# Read list page counts from the TaskCountRollup table, kept current by
+# signals. Run `manage.py rebuild_task_counts` after enabling it.
+TASK_COUNT_ROLLUPS = env.bool("TASK_COUNT_ROLLUPS", default=False)
+
+# Upper bounds for the JSON API's ?limit= and bulk write batches.
+API_MAX_PAGE_SIZE = 100
+
+API_MAX_BATCH_SIZE = 1000
+
+# Per-request timings: a Server-Timing header and a JSON line per request
+# on the "task_manager.performance" logger (INFO), or a warning with the
+# slowest SQL when a request takes SLOW_REQUEST_THRESHOLD_MS or longer.
+SERVER_TIMING_ENABLED = env.bool("SERVER_TIMING_ENABLED", default=True)
+
+SLOW_REQUEST_THRESHOLD_MS = env.int("SLOW_REQUEST_THRESHOLD_MS", default=500)
+
+SLOW_REQUEST_LOGGED_QUERIES = 10
+
+# Request profiling, see task_manager/profiling.py. PROFILING_SAMPLE_RATE is
+# the fraction of all requests profiled by the sampling collector. Profiles
+# are kept in the PROFILING_CACHE cache, which has to be shared, e.g. set
+# with CACHE_URL, for every worker process to serve them.
+PROFILING_SAMPLE_RATE = env.float("PROFILING_SAMPLE_RATE", default=0.0)
+
+PROFILING_INTERVAL_MS = 5
+
+PROFILING_CACHE = "default"
+
+PROFILING_TIMEOUT = 3600
+
+PROFILING_KEEP = 100
+
+PROFILING_TOKEN_MAX_AGE = 3600
+
+# Prometheus metrics served at /metrics to staff users and to scrapers
+# sending "Authorization: Bearer <METRICS_TOKEN>". Set PROMETHEUS_MULTIPROC_DIR
+# in the environment to aggregate them across worker processes.
+METRICS_ENABLED = env.bool("METRICS_ENABLED", default=True)
+
+METRICS_TOKEN = env("METRICS_TOKEN", default=None)
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {
+            "class": "logging.StreamHandler",
+        },
+    },
+    "loggers": {
+        "task_manager.performance": {
+            "handlers": ["console"],
+            "level": env("PERFORMANCE_LOG_LEVEL", default="INFO"),
+            "propagate": False,
+        },
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -122,6 +235,13 @@ AUTH_PASSWORD_VALIDATORS = [
 
 AUTH_USER_MODEL = "task_manager.Worker"
 
+# Set to "django.contrib.sessions.backends.cached_db" together with a shared
+# CACHE_URL to serve session reads from the cache.
+SESSION_ENGINE = env(
+    "SESSION_ENGINE",
+    default="django.contrib.sessions.backends.db",
+)
+
 LOGIN_REDIRECT_URL = "/"
 
 # Internationalization
@@ -0,0 +1,28 @@
+import logging
+
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+
+
+PERFORMANCE_LOGGER = logging.getLogger("task_manager.performance")
+
+
+class TestRunner(DiscoverRunner):
+    """
+    Turn off the view cache for the test suite: cached responses carry no
+    template context and would leak between tests. Tests that exercise it
+    turn it back on with ``override_settings``. The per-request performance
+    log is kept to warnings and errors.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.view_cache_enabled = settings.VIEW_CACHE_ENABLED
+        settings.VIEW_CACHE_ENABLED = False
+        self.performance_log_level = PERFORMANCE_LOGGER.level
+        PERFORMANCE_LOGGER.setLevel(logging.ERROR)
+
+    def teardown_test_environment(self, **kwargs):
+        settings.VIEW_CACHE_ENABLED = self.view_cache_enabled
+        PERFORMANCE_LOGGER.setLevel(self.performance_log_level)
+        super().teardown_test_environment(**kwargs)
@@ -15,12 +15,18 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
 
+TASK_MANAGER_URLS = (
+    "task_manager.async_urls" if settings.ASYNC_VIEWS
+    else "task_manager.urls"
+)
+
 urlpatterns = [
     path("admin/", admin.site.urls),
-    path("", include("task_manager.urls", namespace="task_manager")),
+    path("", include(TASK_MANAGER_URLS, namespace="task_manager")),
     path("__debug__/", include("debug_toolbar.urls")),
     path("accounts/", include("django.contrib.auth.urls")),
 ]
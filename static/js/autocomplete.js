@@ -0,0 +1,56 @@
+// Adds a search box to every <select multiple data-autocomplete-url>.
+// Matches are fetched from the URL and picked ones are added to the select
+// as selected options, so the form posts only the chosen ids.
+document.addEventListener("DOMContentLoaded", function () {
+  document.querySelectorAll("select[data-autocomplete-url]").forEach(function (select) {
+    const input = document.createElement("input");
+    const results = document.createElement("div");
+    let timer = null;
+
+    input.type = "search";
+    input.placeholder = "Start typing a name or username";
+    input.className = "form-control mb-2";
+    results.className = "list-group mb-2";
+    select.before(input, results);
+
+    function showResults(items) {
+      results.innerHTML = "";
+      items.forEach(function (item) {
+        const button = document.createElement("button");
+        button.type = "button";
+        button.className = "list-group-item list-group-item-action";
+        button.textContent = item.text;
+        button.addEventListener("click", function () {
+          let option = select.querySelector('option[value="' + item.id + '"]');
+          if (!option) {
+            option = new Option(item.text, item.id);
+            select.add(option);
+          }
+          option.selected = true;
+          input.value = "";
+          results.innerHTML = "";
+        });
+        results.appendChild(button);
+      });
+    }
+
+    input.addEventListener("input", function () {
+      clearTimeout(timer);
+      timer = setTimeout(function () {
+        const query = input.value.trim();
+        if (!query) {
+          showResults([]);
+          return;
+        }
+        const url = select.dataset.autocompleteUrl + "?q=" + encodeURIComponent(query);
+        fetch(url, {headers: {"Accept": "application/json"}})
+          .then(function (response) {
+            return response.json();
+          })
+          .then(function (data) {
+            showResults(data.results);
+          });
+      }, 200);
+    });
+  });
+});
@@ -0,0 +1,153 @@
+from django.conf import settings
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from task_manager.models import Task, TaskCountRollup, Worker
+
+
+WORKER_TASK_COUNTS = {"total": 0, "open": 0, "overdue": 0}
+
+
+def rollups_enabled():
+    return getattr(settings, "TASK_COUNT_ROLLUPS", False)
+
+
+def count_worker_tasks_live(worker_ids):
+    """
+    Return ``{worker id: {"total", "open", "overdue"}}`` from one grouped
+    query over the assignment table.
+    """
+    today = timezone.localdate()
+    rows = Task.assignees.through.objects.filter(
+        worker__in=worker_ids
+    ).values("worker").annotate(
+        total=Count("pk"),
+        open=Count("pk", filter=Q(task__is_completed=False)),
+        overdue=Count(
+            "pk",
+            filter=Q(task__is_completed=False, task__deadline__lt=today),
+        ),
+    ).order_by()
+    return {
+        row.pop("worker"): row
+        for row in rows
+    }
+
+
+def count_position_workers_live(position_ids):
+    return dict(
+        Worker.objects.filter(position__in=position_ids).values(
+            "position"
+        ).annotate(count=Count("pk")).order_by().values_list(
+            "position", "count"
+        )
+    )
+
+
+def count_task_type_tasks_live(task_type_ids):
+    return dict(
+        Task.objects.filter(task_type__in=task_type_ids).values(
+            "task_type"
+        ).annotate(count=Count("pk")).order_by().values_list(
+            "task_type", "count"
+        )
+    )
+
+
+def count_overdue_tasks(worker_ids):
+    # Overdue depends on today's date, so it is never stored in a rollup.
+    today = timezone.localdate()
+    return dict(
+        Task.assignees.through.objects.filter(
+            worker__in=worker_ids,
+            task__is_completed=False,
+            task__deadline__lt=today,
+        ).values("worker").annotate(count=Count("pk")).order_by().values_list(
+            "worker", "count"
+        )
+    )
+
+
+def get_rollups(kind, ids):
+    return {
+        rollup.object_id: rollup
+        for rollup in TaskCountRollup.objects.filter(
+            kind=kind, object_id__in=ids
+        )
+    }
+
+
+def count_worker_tasks(worker_ids):
+    if not rollups_enabled():
+        return count_worker_tasks_live(worker_ids)
+    rollups = get_rollups(TaskCountRollup.WORKER, worker_ids)
+    overdue = count_overdue_tasks(worker_ids)
+    return {
+        pk: {
+            "total": rollup.total,
+            "open": rollup.open,
+            "overdue": overdue.get(pk, 0),
+        }
+        for pk, rollup in rollups.items()
+    }
+
+
+def count_position_workers(position_ids):
+    if not rollups_enabled():
+        return count_position_workers_live(position_ids)
+    return {
+        pk: rollup.total
+        for pk, rollup in get_rollups(
+            TaskCountRollup.POSITION, position_ids
+        ).items()
+    }
+
+
+def count_task_type_tasks(task_type_ids):
+    if not rollups_enabled():
+        return count_task_type_tasks_live(task_type_ids)
+    return {
+        pk: rollup.total
+        for pk, rollup in get_rollups(
+            TaskCountRollup.TASK_TYPE, task_type_ids
+        ).items()
+    }
+
+
+def refresh_rollups(kind, ids):
+    """
+    Recompute the stored counts of the given objects from the live tables.
+    """
+    ids = {pk for pk in ids if pk is not None}
+    if not ids:
+        return
+    if kind == TaskCountRollup.WORKER:
+        counts = count_worker_tasks_live(ids)
+        rollups = [
+            TaskCountRollup(
+                kind=kind,
+                object_id=pk,
+                total=counts.get(pk, WORKER_TASK_COUNTS)["total"],
+                open=counts.get(pk, WORKER_TASK_COUNTS)["open"],
+            )
+            for pk in ids
+        ]
+    else:
+        if kind == TaskCountRollup.POSITION:
+            counts = count_position_workers_live(ids)
+        else:
+            counts = count_task_type_tasks_live(ids)
+        rollups = [
+            TaskCountRollup(kind=kind, object_id=pk, total=counts.get(pk, 0))
+            for pk in ids
+        ]
+    TaskCountRollup.objects.bulk_create(
+        rollups,
+        update_conflicts=True,
+        unique_fields=["kind", "object_id"],
+        update_fields=["total", "open"],
+    )
+
+
+def delete_rollup(kind, pk):
+    TaskCountRollup.objects.filter(kind=kind, object_id=pk).delete()
@@ -0,0 +1,585 @@
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import Prefetch
+from django.views import generic
+
+from task_manager.models import Position, Task, TaskType, Worker
+from task_manager.pagination import (
+    CURSOR_VAR,
+    CursorPaginator,
+    InvalidCursor,
+)
+from task_manager.query_budget import query_budget
+from task_manager.search import search
+from task_manager.signals import bulk_saved
+from task_manager.templatetags.query_transform import page_transform
+from task_manager.utils import JsonResponse
+
+
+BATCH_SIZE = 500
+
+
+class ApiError(Exception):
+
+    def __init__(self, message, status=400, errors=None):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+        self.errors = errors
+
+
+class Resource:
+    """
+    Declares how a model is exposed by the API.
+
+    ``fields`` are plain model fields, ``related_fields`` map a foreign key
+    to the fields of the related object it is rendered with, and
+    ``many_fields`` are many-to-many relations rendered as lists of ids.
+    """
+
+    model = None
+    fields = ()
+    related_fields = {}
+    many_fields = ()
+    filter_fields = ()
+    writable_fields = ()
+    allow_create = True
+    allow_delete = True
+
+    @classmethod
+    def all_fields(cls):
+        return (
+            list(cls.fields)
+            + list(cls.related_fields)
+            + list(cls.many_fields)
+        )
+
+    @classmethod
+    def parse_fields(cls, value):
+        if not value:
+            return cls.all_fields()
+        fields = [field.strip() for field in value.split(",") if field]
+        unknown = sorted(set(fields) - set(cls.all_fields()))
+        if unknown:
+            raise ApiError("Unknown fields: %s" % ", ".join(unknown))
+        if "id" not in fields:
+            fields.insert(0, "id")
+        return fields
+
+    @classmethod
+    def get_queryset(cls, fields):
+        queryset = cls.model._default_manager.all()
+        only = [field for field in fields if field in cls.fields]
+        select = [field for field in fields if field in cls.related_fields]
+        for name in select:
+            only.append(name)
+            only.extend(
+                "%s__%s" % (name, related_field)
+                for related_field in cls.related_fields[name]
+            )
+        queryset = queryset.select_related(*select).only(*only)
+
+        for name in fields:
+            if name in cls.many_fields:
+                related_model = cls.model._meta.get_field(name).related_model
+                queryset = queryset.prefetch_related(
+                    Prefetch(
+                        name,
+                        queryset=related_model._default_manager.only("pk"),
+                    )
+                )
+        return queryset
+
+    @classmethod
+    def serialize(cls, obj, fields):
+        data = {}
+        for name in fields:
+            if name in cls.related_fields:
+                related = getattr(obj, name)
+                data[name] = None if related is None else {
+                    related_field: getattr(related, related_field)
+                    for related_field in cls.related_fields[name]
+                }
+            elif name in cls.many_fields:
+                data[name] = [
+                    related.pk for related in getattr(obj, name).all()
+                ]
+            else:
+                data[name] = getattr(obj, name)
+        return data
+
+
+class TaskResource(Resource):
+    model = Task
+    fields = (
+        "id",
+        "name",
+        "description",
+        "deadline",
+        "is_completed",
+        "priority",
+        "updated_at",
+    )
+    related_fields = {"task_type": ("id", "name")}
+    many_fields = ("assignees",)
+    filter_fields = ("is_completed", "priority", "task_type")
+    writable_fields = (
+        "name",
+        "description",
+        "deadline",
+        "is_completed",
+        "priority",
+        "task_type",
+        "assignees",
+    )
+
+
+class WorkerResource(Resource):
+    model = Worker
+    fields = (
+        "id",
+        "username",
+        "first_name",
+        "last_name",
+        "email",
+        "updated_at",
+    )
+    related_fields = {"position": ("id", "name")}
+    many_fields = ("tasks",)
+    filter_fields = ("position",)
+    writable_fields = ("first_name", "last_name", "email", "position")
+    # Accounts are created through WorkerForm, which hashes passwords.
+    allow_create = False
+    allow_delete = False
+
+
+class PositionResource(Resource):
+    model = Position
+    fields = ("id", "name")
+    writable_fields = ("name",)
+
+
+class TaskTypeResource(Resource):
+    model = TaskType
+    fields = ("id", "name")
+    writable_fields = ("name",)
+
+
+class BulkWriter:
+    """
+    Validates a batch of JSON objects against a resource and writes it with
+    ``bulk_create``/``bulk_update``, fetching every referenced related
+    object with one query per relation.
+    """
+
+    def __init__(self, resource, items, partial):
+        self.resource = resource
+        self.model = resource.model
+        self.items = items
+        self.partial = partial
+        self.errors = {}
+
+    def get_relation(self, name):
+        return self.model._meta.get_field(name)
+
+    @staticmethod
+    def clean_reference(model, value):
+        """
+        Return ``value`` as a primary key of ``model``, accepting ids sent
+        as strings, or raise ValueError.
+        """
+        if not isinstance(value, (int, str)) or isinstance(value, bool):
+            raise ValueError("Expected an id")
+        try:
+            return model._meta.pk.to_python(value)
+        except ValidationError:
+            raise ValueError("Expected an id")
+
+    def validate_references(self):
+        referenced = {}
+        for item in self.items:
+            for name, value in item.items():
+                if name not in self.resource.writable_fields:
+                    continue
+                field = self.get_relation(name)
+                if field.many_to_many:
+                    ids = value if isinstance(value, list) else [value]
+                elif field.many_to_one and value is not None:
+                    ids = [value]
+                else:
+                    continue
+                references = referenced.setdefault(name, set())
+                for pk in ids:
+                    try:
+                        references.add(
+                            self.clean_reference(field.related_model, pk)
+                        )
+                    except ValueError:
+                        # Reported by apply().
+                        continue
+
+        existing = {}
+        for name, ids in referenced.items():
+            related_model = self.get_relation(name).related_model
+            try:
+                existing[name] = set(
+                    related_model._default_manager.filter(
+                        pk__in=ids
+                    ).values_list("pk", flat=True)
+                )
+            except (TypeError, ValueError, ValidationError):
+                existing[name] = set()
+        return existing
+
+    def apply(self, obj, item, index, existing):
+        errors = {}
+        unknown = set(item) - set(self.resource.writable_fields) - {"id"}
+        for name in sorted(unknown):
+            errors[name] = ["This field is not writable."]
+        many = {}
+        for name in self.resource.writable_fields:
+            if name not in item:
+                continue
+            value = item[name]
+            field = self.get_relation(name)
+            if field.many_to_many:
+                ids = value if isinstance(value, list) else [value]
+                try:
+                    ids = [
+                        self.clean_reference(field.related_model, pk)
+                        for pk in ids
+                    ]
+                except ValueError:
+                    errors[name] = ["Expected a list of ids."]
+                    continue
+                missing = [pk for pk in ids if pk not in existing[name]]
+                if missing:
+                    errors[name] = ["Unknown ids: %s" % missing]
+                many[name] = ids
+            elif field.many_to_one:
+                if value is not None:
+                    try:
+                        value = self.clean_reference(
+                            field.related_model, value
+                        )
+                    except ValueError:
+                        errors[name] = ["Expected an id."]
+                        continue
+                    if value not in existing[name]:
+                        errors[name] = ["Unknown id: %s" % value]
+                setattr(obj, field.attname, value)
+            else:
+                setattr(obj, name, value)
+
+        exclude = [
+            name for name in self.resource.writable_fields
+            if self.get_relation(name).is_relation
+        ]
+        if self.partial:
+            exclude += [
+                field.name for field in self.model._meta.concrete_fields
+                if field.name not in item
+            ]
+        try:
+            obj.full_clean(exclude=exclude, validate_unique=False)
+        except ValidationError as e:
+            for name, messages in e.message_dict.items():
+                errors.setdefault(name, []).extend(messages)
+        if errors:
+            self.errors[index] = errors
+        return many
+
+    def set_many(self, objects, many_values):
+        for name in self.resource.many_fields:
+            if name not in self.resource.writable_fields:
+                continue
+            field = self.get_relation(name)
+            through = field.remote_field.through
+            source = field.m2m_field_name() + "_id"
+            target = field.m2m_reverse_field_name() + "_id"
+            changed = [
+                (obj, values[name])
+                for obj, values in zip(objects, many_values)
+                if name in values
+            ]
+            if not changed:
+                continue
+            through._default_manager.filter(
+                **{source + "__in": [obj.pk for obj, ids in changed]}
+            ).delete()
+            through._default_manager.bulk_create(
+                [
+                    through(**{source: obj.pk, target: pk})
+                    for obj, ids in changed
+                    for pk in ids
+                ],
+                batch_size=BATCH_SIZE,
+            )
+
+    def create(self):
+        existing = self.validate_references()
+        objects = []
+        many_values = []
+        for index, item in enumerate(self.items):
+            obj = self.model()
+            many_values.append(self.apply(obj, item, index, existing))
+            objects.append(obj)
+        if self.errors:
+            raise ApiError("Invalid objects", errors=self.errors)
+        objects = self.model._default_manager.bulk_create(
+            objects, batch_size=BATCH_SIZE
+        )
+        self.set_many(objects, many_values)
+        return objects
+
+    def update(self):
+        ids = [item.get("id") for item in self.items]
+        if None in ids:
+            raise ApiError("Every object needs an id")
+        try:
+            ids = [self.clean_reference(self.model, pk) for pk in ids]
+        except ValueError:
+            raise ApiError("Invalid ids")
+        try:
+            objects_by_id = self.model._default_manager.in_bulk(ids)
+        except (TypeError, ValueError, ValidationError):
+            raise ApiError("Invalid ids")
+        missing = [pk for pk in ids if pk not in objects_by_id]
+        if missing:
+            raise ApiError("Unknown ids: %s" % missing, status=404)
+
+        existing = self.validate_references()
+        objects = []
+        many_values = []
+        update_fields = set()
+        for index, (pk, item) in enumerate(zip(ids, self.items)):
+            obj = objects_by_id[pk]
+            many_values.append(self.apply(obj, item, index, existing))
+            objects.append(obj)
+            update_fields.update(
+                self.get_relation(name).name for name in item
+                if name in self.resource.writable_fields
+                and not self.get_relation(name).many_to_many
+            )
+        if self.errors:
+            raise ApiError("Invalid objects", errors=self.errors)
+
+        auto_now = [
+            field for field in self.model._meta.concrete_fields
+            if getattr(field, "auto_now", False)
+        ]
+        if update_fields:
+            for field in auto_now:
+                update_fields.add(field.name)
+                for obj in objects:
+                    field.pre_save(obj, add=False)
+            self.model._default_manager.bulk_update(
+                objects, sorted(update_fields), batch_size=BATCH_SIZE
+            )
+        self.set_many(objects, many_values)
+        return objects
+
+
+class ApiView(generic.View):
+    """
+    Base of the JSON endpoints. Subclasses with async handlers are
+    dispatched by ``adispatch``.
+    """
+
+    resource = None
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.view_is_async:
+            return self.adispatch(request, *args, **kwargs)
+        if not request.user.is_authenticated:
+            return self.unauthorized()
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except ApiError as e:
+            return self.error_response(e)
+
+    async def adispatch(self, request, *args, **kwargs):
+        request.user = await request.auser()
+        if not request.user.is_authenticated:
+            return self.unauthorized()
+        try:
+            return await super().dispatch(request, *args, **kwargs)
+        except ApiError as e:
+            return self.error_response(e)
+
+    @staticmethod
+    def unauthorized():
+        return JsonResponse(
+            {"detail": "Authentication credentials were not provided."},
+            status=401,
+        )
+
+    @staticmethod
+    def error_response(error):
+        data = {"detail": error.message}
+        if error.errors:
+            data["errors"] = error.errors
+        return JsonResponse(data, status=error.status)
+
+    def http_method_not_allowed(self, request, *args, **kwargs):
+        response = JsonResponse(
+            {"detail": "Method %s not allowed." % request.method},
+            status=405,
+        )
+        if self.view_is_async:
+
+            async def func():
+                return response
+
+            return func()
+        return response
+
+    def get_fields(self):
+        return self.resource.parse_fields(self.request.GET.get("fields"))
+
+    def get_json_body(self):
+        try:
+            return json.loads(self.request.body)
+        except (ValueError, UnicodeDecodeError):
+            raise ApiError("The request body is not valid JSON")
+
+
+@query_budget(4)
+class ApiListView(ApiView):
+
+    def get_filters(self):
+        filters, errors = {}, {}
+        for name in self.resource.filter_fields:
+            if name not in self.request.GET:
+                continue
+            field = self.resource.model._meta.get_field(name)
+            try:
+                filters[name] = field.to_python(self.request.GET[name])
+            except ValidationError as e:
+                errors[name] = e.messages
+        if errors:
+            raise ApiError("Invalid filter value", errors=errors)
+        return filters
+
+    def get_queryset(self, fields):
+        queryset = self.resource.get_queryset(fields).order_by("pk")
+        filters = self.get_filters()
+        if filters:
+            queryset = queryset.filter(**filters)
+        return search(queryset, self.request.GET.get("search", ""))
+
+    def get_limit(self):
+        max_limit = getattr(settings, "API_MAX_PAGE_SIZE", 100)
+        try:
+            limit = int(self.request.GET.get("limit", 20))
+        except ValueError:
+            raise ApiError("limit must be an integer")
+        return max(1, min(limit, max_limit))
+
+    def get(self, request, *args, **kwargs):
+        fields = self.get_fields()
+        paginator = CursorPaginator(
+            self.get_queryset(fields),
+            self.get_limit(),
+        )
+        try:
+            page = paginator.page(request.GET.get(CURSOR_VAR))
+        except InvalidCursor as e:
+            raise ApiError("Invalid cursor: %s" % e)
+        return self.page_response(page, fields)
+
+    def page_response(self, page, fields):
+        return JsonResponse({
+            "results": [
+                self.resource.serialize(obj, fields) for obj in page
+            ],
+            "next": self.get_page_url(page, "next"),
+            "previous": self.get_page_url(page, "previous"),
+        })
+
+    def get_page_url(self, page, direction):
+        has_page = page.has_next() if direction == "next" else (
+            page.has_previous()
+        )
+        if not has_page:
+            return None
+        return self.request.build_absolute_uri(
+            "?" + page_transform(self.request, page, direction)
+        )
+
+    def get_batch(self):
+        body = self.get_json_body()
+        items = body.get("objects") if isinstance(body, dict) else body
+        if not isinstance(items, list) or not all(
+            isinstance(item, dict) for item in items
+        ):
+            raise ApiError("Expected a list of objects")
+        max_batch = getattr(settings, "API_MAX_BATCH_SIZE", 1000)
+        if len(items) > max_batch:
+            raise ApiError("At most %d objects per request" % max_batch)
+        return items
+
+    def write(self, partial):
+        items = self.get_batch()
+        fields = self.resource.all_fields()
+        writer = BulkWriter(self.resource, items, partial=partial)
+        try:
+            with transaction.atomic():
+                objects = writer.update() if partial else writer.create()
+                bulk_saved.send(
+                    sender=self.resource.model,
+                    instances=objects,
+                    created=not partial,
+                    using=self.resource.model._default_manager.db,
+                )
+        except IntegrityError as e:
+            raise ApiError("Integrity error: %s" % e)
+
+        objects = self.resource.get_queryset(fields).filter(
+            pk__in=[obj.pk for obj in objects]
+        ).order_by("pk")
+        return JsonResponse(
+            {"results": [
+                self.resource.serialize(obj, fields) for obj in objects
+            ]},
+            status=200 if partial else 201,
+        )
+
+    def post(self, request, *args, **kwargs):
+        if not self.resource.allow_create:
+            return self.http_method_not_allowed(request, *args, **kwargs)
+        return self.write(partial=False)
+
+    def patch(self, request, *args, **kwargs):
+        return self.write(partial=True)
+
+    def delete(self, request, *args, **kwargs):
+        if not self.resource.allow_delete:
+            return self.http_method_not_allowed(request, *args, **kwargs)
+        body = self.get_json_body()
+        ids = body.get("ids") if isinstance(body, dict) else None
+        if not isinstance(ids, list):
+            raise ApiError('Expected {"ids": [...]}')
+        try:
+            with transaction.atomic():
+                deleted, _ = self.resource.model._default_manager.filter(
+                    pk__in=ids
+                ).delete()
+        except (TypeError, ValueError, ValidationError):
+            raise ApiError("Invalid ids")
+        return JsonResponse({"deleted": deleted})
+
+
+@query_budget(4)
+class ApiDetailView(ApiView):
+
+    def get(self, request, *args, **kwargs):
+        fields = self.get_fields()
+        try:
+            obj = self.resource.get_queryset(fields).get(pk=kwargs["pk"])
+        except (self.resource.model.DoesNotExist, ValueError):
+            raise ApiError("Not found.", status=404)
+        return JsonResponse(self.resource.serialize(obj, fields))
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class TaskManagerConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "task_manager"
+
+    def ready(self):
+        import task_manager.signals  # noqa: F401
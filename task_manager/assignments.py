@@ -0,0 +1,70 @@
+from django.db import router, transaction
+from django.db.models import Exists, OuterRef
+from django.db.models.signals import m2m_changed
+
+from task_manager.models import Task, Worker
+
+
+def annotate_is_assigned(queryset, worker):
+    """
+    Annotate each task with ``is_assigned``, whether ``worker`` is one of
+    its assignees, without loading the worker's tasks.
+    """
+    return queryset.annotate(
+        is_assigned=Exists(
+            Task.assignees.through.objects.filter(
+                task=OuterRef("pk"), worker=worker.pk
+            )
+        )
+    )
+
+
+def toggle_assignments(worker, task_ids):
+    """
+    Toggle ``worker``'s assignment to each of ``task_ids`` and return
+    ``{task id: assigned}`` for the tasks that exist.
+
+    Membership is read with a single ``EXISTS`` annotation and the through
+    table is changed with one delete and one insert, under a lock on the
+    worker row so that concurrent toggles by the same worker serialise.
+    """
+    through = Task.assignees.through
+    using = router.db_for_write(through)
+    with transaction.atomic(using=using):
+        list(
+            Worker.objects.using(using).select_for_update().filter(
+                pk=worker.pk
+            ).values_list("pk", flat=True)
+        )
+        current = dict(
+            annotate_is_assigned(
+                Task.objects.using(using).filter(pk__in=task_ids), worker
+            ).values_list("pk", "is_assigned")
+        )
+        to_remove = {pk for pk, assigned in current.items() if assigned}
+        to_add = set(current) - to_remove
+
+        if to_remove:
+            through.objects.using(using).filter(
+                worker=worker.pk, task__in=to_remove
+            ).delete()
+        if to_add:
+            through.objects.using(using).bulk_create(
+                [through(task_id=pk, worker_id=worker.pk) for pk in to_add],
+                ignore_conflicts=True,
+            )
+
+    # The through table was written directly, so send what
+    # worker.tasks.add()/remove() would have sent.
+    for action, pk_set in (("post_remove", to_remove), ("post_add", to_add)):
+        if pk_set:
+            m2m_changed.send(
+                sender=through,
+                instance=worker,
+                action=action,
+                reverse=True,
+                model=Task,
+                pk_set=pk_set,
+                using=using,
+            )
+    return {pk: pk in to_add for pk in current}
@@ -0,0 +1,40 @@
+"""
+``task_manager.urls`` with the views of ``task_manager.async_views`` in
+place of their sync versions, included instead of it when ``ASYNC_VIEWS``
+is set.
+"""
+from django.urls import path
+
+from task_manager import api, async_views, urls, views
+
+
+ASYNC_VERSIONS = {
+    views.index: async_views.index,
+    views.TaskListView: async_views.TaskListView,
+    views.TaskDetailView: async_views.TaskDetailView,
+    views.WorkerAutocompleteView: async_views.WorkerAutocompleteView,
+    api.ApiListView: async_views.ApiListView,
+    api.ApiDetailView: async_views.ApiDetailView,
+}
+
+
+def to_async(pattern):
+    callback = pattern.callback
+    view_class = getattr(callback, "view_class", None)
+    if view_class in ASYNC_VERSIONS:
+        callback = ASYNC_VERSIONS[view_class].as_view(
+            **callback.view_initkwargs
+        )
+    else:
+        callback = ASYNC_VERSIONS.get(callback, callback)
+    return path(
+        str(pattern.pattern),
+        callback,
+        pattern.default_args,
+        name=pattern.name,
+    )
+
+
+urlpatterns = [to_async(pattern) for pattern in urls.urlpatterns]
+
+app_name = urls.app_name
@@ -0,0 +1,169 @@
+"""
+Async versions of the read-heavy views, served in place of the sync ones
+by ``task_manager.async_urls`` when ``ASYNC_VIEWS`` is set.
+
+They fetch their rows with the async ORM before rendering. The templates,
+which Django renders in a worker thread, still run the queries of the task
+list's filter form: the task type choices and the selected assignee of the
+autocomplete widget. In Django 5.0 the async ORM and cache calls still go
+through ``sync_to_async`` internally: only enable them under an ASGI
+server, and compare with ``manage.py benchmark_servers`` first.
+"""
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.mixins import AccessMixin
+from django.contrib.auth.views import redirect_to_login
+from django.http import Http404, HttpRequest, HttpResponse
+from django.template.response import TemplateResponse
+
+from task_manager import api, views
+from task_manager.counters import aget_dashboard_counts
+from task_manager.pagination import CURSOR_VAR, CursorPaginator, InvalidCursor
+from task_manager.query_budget import query_budget
+from task_manager.utils import JsonResponse
+from task_manager.visits import record_visit
+
+
+def async_login_required(view):
+    """
+    ``login_required`` for async function views, which Django supports
+    from 5.1 only.
+    """
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        request.user = await request.auser()
+        if not request.user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        return await view(request, *args, **kwargs)
+
+    return wrapper
+
+
+class AsyncLoginRequiredMixin(AccessMixin):
+    """
+    Load the user with ``request.auser()``, so that the sync
+    ``LoginRequiredMixin`` of the parent view finds it already loaded.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        request.user = await request.auser()
+        if not request.user.is_authenticated:
+            return self.handle_no_permission()
+        return await super().dispatch(request, *args, **kwargs)
+
+
+@query_budget(3)
+@async_login_required
+async def index(request: HttpRequest) -> HttpResponse:
+
+    counts = await aget_dashboard_counts()
+
+    # The visit counter reads and writes the session, which has no async API.
+    num_visits = await sync_to_async(record_visit)(request)
+
+    context = views.get_index_context(counts, num_visits)
+
+    return TemplateResponse(request, "task_manager/index.html", context)
+
+
+class TaskListView(AsyncLoginRequiredMixin, views.TaskListView):
+
+    async def get(self, request, *args, **kwargs):
+        # Validating the filter form's model choices runs queries.
+        self.object_list = await sync_to_async(self.get_queryset)()
+        self.pagination = await self.apaginate_queryset(
+            self.object_list, self.get_paginate_by(self.object_list)
+        )
+        rows = self.get_facet_rows(self.filtered_queryset)
+        self.facets = self.count_facets(
+            [row async for row in rows.aiterator()]
+        )
+        return self.render_to_response(self.get_context_data())
+
+    def paginate_queryset(self, queryset, page_size):
+        return self.pagination
+
+    def get_facets(self, queryset):
+        return self.facets
+
+
+class TaskDetailView(AsyncLoginRequiredMixin, views.TaskDetailView):
+
+    async def get(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        context = self.get_context_data(object=self.object)
+        return self.render_to_response(context)
+
+    async def aget_object(self):
+        queryset = self.get_queryset().filter(
+            pk=self.kwargs.get(self.pk_url_kwarg)
+        )
+        try:
+            return await queryset.aget()
+        except self.model.DoesNotExist:
+            raise Http404("No task found matching the query")
+
+
+class WorkerAutocompleteView(
+    AsyncLoginRequiredMixin,
+    views.WorkerAutocompleteView,
+):
+
+    async def get(self, request, *args, **kwargs) -> JsonResponse:
+        query = self.get_query()
+        if len(query) < self.min_query_length:
+            return JsonResponse({"results": []})
+        # Picking the search backend may inspect the database tables.
+        workers = await sync_to_async(self.get_workers)(query)
+        return self.results_response(
+            [worker async for worker in workers.aiterator()]
+        )
+
+
+class ApiListView(api.ApiListView):
+
+    async def get(self, request, *args, **kwargs):
+        fields = self.get_fields()
+        paginator = CursorPaginator(
+            await sync_to_async(self.get_queryset)(fields),
+            self.get_limit(),
+        )
+        try:
+            page = await paginator.apage(request.GET.get(CURSOR_VAR))
+        except InvalidCursor as e:
+            raise api.ApiError("Invalid cursor: %s" % e)
+        return self.page_response(page, fields)
+
+    # Writes run in a transaction, which has to stay on one thread.
+
+    async def post(self, request, *args, **kwargs):
+        if not self.resource.allow_create:
+            return await self.http_method_not_allowed(
+                request, *args, **kwargs
+            )
+        return await sync_to_async(self.write)(partial=False)
+
+    async def patch(self, request, *args, **kwargs):
+        return await sync_to_async(self.write)(partial=True)
+
+    async def delete(self, request, *args, **kwargs):
+        if not self.resource.allow_delete:
+            return await self.http_method_not_allowed(
+                request, *args, **kwargs
+            )
+        return await sync_to_async(super().delete)(request, *args, **kwargs)
+
+
+class ApiDetailView(api.ApiDetailView):
+
+    async def get(self, request, *args, **kwargs):
+        fields = self.get_fields()
+        try:
+            obj = await self.resource.get_queryset(fields).aget(
+                pk=kwargs["pk"]
+            )
+        except (self.resource.model.DoesNotExist, ValueError):
+            raise api.ApiError("Not found.", status=404)
+        return JsonResponse(self.resource.serialize(obj, fields))
@@ -0,0 +1,509 @@
+"""
+Request benchmarks for every URL in ``task_manager.urls``, run by the
+``benchmark_views`` management command.
+"""
+import gc
+import json
+import statistics
+import time
+from itertools import count
+
+from django.core.cache import caches
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+
+from task_manager import urls
+from task_manager.models import Position, Task, TaskType, Worker
+from task_manager.profiling import save_profile
+
+
+class Scenario:
+    """
+    One request to benchmark. ``kwargs``, ``params`` and ``data`` may be
+    callables taking the ``BenchmarkFixtures``; they are evaluated before
+    every request, outside the timed part, so a delete can get a fresh row.
+
+    Form posts are expected to redirect, so an invalid form is not
+    mistaken for a fast request.
+    """
+
+    def __init__(
+        self,
+        name,
+        url_name,
+        method="get",
+        kwargs=None,
+        params=None,
+        data=None,
+        as_json=False,
+        headers=None,
+        status=None,
+    ):
+        self.name = name
+        self.url_name = url_name
+        self.method = method
+        self.kwargs = kwargs
+        self.params = params
+        self.data = data
+        self.as_json = as_json
+        self.headers = headers or {}
+        if status is None:
+            is_form_post = method == "post" and not (as_json or headers)
+            status = 302 if is_form_post else 200
+        self.status = status
+
+    @staticmethod
+    def evaluate(value, fixtures):
+        return value(fixtures) if callable(value) else value
+
+    def get_url(self, fixtures):
+        return reverse(
+            "task_manager:%s" % self.url_name,
+            kwargs=self.evaluate(self.kwargs, fixtures),
+        )
+
+    def request(self, client, fixtures):
+        """
+        Return a callable sending the prepared request.
+        """
+        url = self.get_url(fixtures)
+        send = getattr(client, self.method)
+        if self.method == "get":
+            params = self.evaluate(self.params, fixtures)
+            return lambda: send(url, params, headers=self.headers)
+        data = self.evaluate(self.data, fixtures)
+        if self.as_json:
+            body = json.dumps(data)
+            return lambda: send(
+                url,
+                body,
+                content_type="application/json",
+                headers=self.headers,
+            )
+        return lambda: send(url, data, headers=self.headers)
+
+
+class BenchmarkFixtures:
+    """
+    Existing rows the scenarios point at, looked up after seeding.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self.task = Task.objects.order_by("pk").first()
+        self.worker = (
+            Worker.objects.exclude(pk=user.pk).order_by("pk").first()
+        )
+        self.position = Position.objects.order_by("pk").first()
+        self.task_type = TaskType.objects.order_by("pk").first()
+        self.task_ids = list(
+            Task.objects.order_by("pk").values_list("pk", flat=True)[:10]
+        )
+        self.counter = count()
+
+    def unique(self, prefix):
+        return "%s %d" % (prefix, next(self.counter))
+
+    def task_form(self):
+        return {
+            "name": self.unique("Benchmark task"),
+            "description": "Created by the benchmark",
+            "deadline": "2024-06-01",
+            "priority": Task.Priority.MEDIUM,
+            "task_type": self.task_type.pk,
+            "assignees": [self.worker.pk],
+        }
+
+    def worker_form(self):
+        username = self.unique("benchmark").replace(" ", ".")
+        return {
+            "username": username,
+            "password1": "bench-Pa55word",
+            "password2": "bench-Pa55word",
+            "first_name": "Bench",
+            "last_name": "Mark",
+            "position": self.position.pk,
+            "email": "%s@example.com" % username,
+        }
+
+    def new_position(self):
+        position = Position.objects.create(
+            name=self.unique("Benchmark position")
+        )
+        return {"pk": position.pk}
+
+    def new_task_type(self):
+        task_type = TaskType.objects.create(
+            name=self.unique("Benchmark type")
+        )
+        return {"pk": task_type.pk}
+
+    def new_worker(self):
+        worker = Worker.objects.create(
+            username=self.unique("benchmark.delete").replace(" ", ".")
+        )
+        return {"pk": worker.pk}
+
+    def new_task(self):
+        task = Task.objects.create(
+            name=self.unique("Benchmark delete"),
+            description="Deleted by the benchmark",
+            deadline="2024-06-01",
+            priority=Task.Priority.LOW,
+            task_type=self.task_type,
+        )
+        return {"pk": task.pk}
+
+    def new_profile(self):
+        profile_id = save_profile(
+            "task_manager.views:index 1\n",
+            method="GET",
+            path="/",
+            view="task_manager:index",
+            status=200,
+            duration_ms=1.0,
+        )
+        return {"profile_id": profile_id}
+
+
+def task_pk(fixtures):
+    return {"pk": fixtures.task.pk}
+
+
+def worker_pk(fixtures):
+    return {"pk": fixtures.worker.pk}
+
+
+def position_pk(fixtures):
+    return {"pk": fixtures.position.pk}
+
+
+def task_type_pk(fixtures):
+    return {"pk": fixtures.task_type.pk}
+
+
+def with_saved_profile(fixtures):
+    # The caches, and so the profiles, are cleared before every request.
+    fixtures.new_profile()
+    return None
+
+
+SCENARIOS = [
+    Scenario("index", "index"),
+    Scenario("position list", "position-list"),
+    Scenario(
+        "position list search", "position-list", params={"name": "dev"}
+    ),
+    Scenario(
+        "position list ordered", "position-list", params={"order": "-name"}
+    ),
+    Scenario("position create form", "position-create"),
+    Scenario(
+        "position create",
+        "position-create",
+        method="post",
+        data=lambda f: {"name": f.unique("Benchmark position")},
+    ),
+    Scenario("position update form", "position-update", kwargs=position_pk),
+    Scenario(
+        "position update",
+        "position-update",
+        method="post",
+        kwargs=position_pk,
+        data=lambda f: {"name": f.position.name},
+    ),
+    Scenario(
+        "position delete",
+        "position-delete",
+        method="post",
+        kwargs=lambda f: f.new_position(),
+    ),
+    Scenario("worker list", "worker-list"),
+    Scenario(
+        "worker list search", "worker-list", params={"username": "alex"}
+    ),
+    Scenario(
+        "worker list ordered",
+        "worker-list",
+        params={"order": "-username"},
+    ),
+    Scenario(
+        "worker autocomplete", "worker-autocomplete", params={"q": "mar"}
+    ),
+    Scenario("worker detail", "worker-detail", kwargs=worker_pk),
+    Scenario(
+        "worker tasks",
+        "worker-task-list",
+        kwargs=worker_pk,
+        params={"status": "open"},
+    ),
+    Scenario("worker create form", "worker-create"),
+    Scenario(
+        "worker create",
+        "worker-create",
+        method="post",
+        data=lambda f: f.worker_form(),
+    ),
+    Scenario("worker update form", "worker-update", kwargs=worker_pk),
+    Scenario(
+        "worker update",
+        "worker-update",
+        method="post",
+        kwargs=worker_pk,
+        data=lambda f: {
+            "username": f.worker.username,
+            "first_name": f.worker.first_name,
+            "last_name": f.worker.last_name,
+            "position": f.position.pk,
+            "email": f.worker.email,
+        },
+    ),
+    Scenario(
+        "worker delete",
+        "worker-delete",
+        method="post",
+        kwargs=lambda f: f.new_worker(),
+    ),
+    Scenario("task type list", "task_type-list"),
+    Scenario(
+        "task type list search", "task_type-list", params={"name": "bug"}
+    ),
+    Scenario(
+        "task type list ordered",
+        "task_type-list",
+        params={"order": "name"},
+    ),
+    Scenario("task type create form", "task_type-create"),
+    Scenario(
+        "task type create",
+        "task_type-create",
+        method="post",
+        data=lambda f: {"name": f.unique("Benchmark type")},
+    ),
+    Scenario(
+        "task type update form", "task_type-update", kwargs=task_type_pk
+    ),
+    Scenario(
+        "task type update",
+        "task_type-update",
+        method="post",
+        kwargs=task_type_pk,
+        data=lambda f: {"name": f.task_type.name},
+    ),
+    Scenario(
+        "task type delete",
+        "task_type-delete",
+        method="post",
+        kwargs=lambda f: f.new_task_type(),
+    ),
+    Scenario("task list", "task-list"),
+    Scenario(
+        "task list open by deadline",
+        "task-list",
+        params={"task_completion": "False", "order": "deadline"},
+    ),
+    Scenario(
+        "task list by priority",
+        "task-list",
+        params={"task_completion": "False", "order": "priority"},
+    ),
+    Scenario(
+        "task list search by relevance",
+        "task-list",
+        params={"name": "export", "order": "relevance"},
+    ),
+    Scenario(
+        "task list filtered",
+        "task-list",
+        params=lambda f: {
+            "assignee": f.worker.pk,
+            "task_type": f.task_type.pk,
+            "priority": Task.Priority.MEDIUM,
+        },
+    ),
+    Scenario("task detail", "task-detail", kwargs=task_pk),
+    Scenario("task create form", "task-create"),
+    Scenario(
+        "task create",
+        "task-create",
+        method="post",
+        data=lambda f: f.task_form(),
+    ),
+    Scenario("task update form", "task-update", kwargs=task_pk),
+    Scenario(
+        "task update",
+        "task-update",
+        method="post",
+        kwargs=task_pk,
+        data=lambda f: {**f.task_form(), "name": f.task.name},
+    ),
+    Scenario(
+        "task delete",
+        "task-delete",
+        method="post",
+        kwargs=lambda f: f.new_task(),
+    ),
+    Scenario(
+        "toggle assignment",
+        "toggle-task-assign",
+        method="post",
+        kwargs=task_pk,
+        headers={"accept": "application/json"},
+    ),
+    Scenario(
+        "toggle assignments",
+        "toggle-task-assign",
+        method="post",
+        data=lambda f: {"task_id": f.task_ids},
+        headers={"accept": "application/json"},
+    ),
+    Scenario("api task list", "api-task-list", params={"limit": 50}),
+    Scenario("api task detail", "api-task-detail", kwargs=task_pk),
+    Scenario(
+        "api task create",
+        "api-task-list",
+        method="post",
+        as_json=True,
+        status=201,
+        data=lambda f: [
+            {**f.task_form(), "priority": Task.Priority.LOW}
+            for _ in range(10)
+        ],
+    ),
+    Scenario(
+        "api task update",
+        "api-task-list",
+        method="patch",
+        as_json=True,
+        data=lambda f: [
+            {"id": pk, "priority": Task.Priority.HIGHT}
+            for pk in f.task_ids
+        ],
+    ),
+    Scenario("api worker list", "api-worker-list", params={"limit": 50}),
+    Scenario("api worker detail", "api-worker-detail", kwargs=worker_pk),
+    Scenario("api position list", "api-position-list"),
+    Scenario(
+        "api position detail", "api-position-detail", kwargs=position_pk
+    ),
+    Scenario("api task type list", "api-task_type-list"),
+    Scenario(
+        "api task type detail", "api-task_type-detail", kwargs=task_type_pk
+    ),
+    Scenario("metrics", "metrics"),
+    Scenario("profile list", "profile-list", params=with_saved_profile),
+    Scenario(
+        "profile detail",
+        "profile-detail",
+        kwargs=lambda f: f.new_profile(),
+    ),
+]
+
+
+def get_uncovered_patterns(scenarios, fixtures):
+    """
+    Return the routes of ``task_manager.urls`` no scenario requests.
+    """
+    covered = {
+        resolve(scenario.get_url(fixtures)).func for scenario in scenarios
+    }
+    return [
+        str(pattern.pattern)
+        for pattern in urls.urlpatterns
+        if pattern.callback not in covered
+    ]
+
+
+def percentile(values, percent):
+    values = sorted(values)
+    index = round(percent / 100 * (len(values) - 1))
+    return values[index]
+
+
+def run_scenario(scenario, client, fixtures, repeat):
+    """
+    Send the request ``repeat`` times after one warm-up, each time with
+    empty caches, and return its latency, query count and response size.
+    """
+    latencies = []
+    queries = []
+    size = 0
+    for iteration in range(repeat + 1):
+        for cache in caches.all():
+            cache.clear()
+        client.force_login(fixtures.user)
+        send = scenario.request(client, fixtures)
+        # A full query log stops growing, which would count zero queries.
+        connection.queries_log.clear()
+        gc.collect()
+        with CaptureQueriesContext(connection) as context:
+            started = time.perf_counter()
+            response = send()
+            elapsed = time.perf_counter() - started
+        if response.status_code != scenario.status:
+            raise ValueError(
+                "%s returned %d instead of %d"
+                % (scenario.name, response.status_code, scenario.status)
+            )
+        if iteration:
+            latencies.append(elapsed * 1000)
+            queries.append(len(context.captured_queries))
+            size = len(response.content)
+    return {
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "queries": max(queries),
+        "bytes": size,
+    }
+
+
+def run_benchmarks(fixtures, repeat, scenarios=SCENARIOS):
+    client = Client()
+    return {
+        scenario.name: run_scenario(scenario, client, fixtures, repeat)
+        for scenario in scenarios
+    }
+
+
+def compare(results, baseline, tolerance, query_tolerance, min_delta_ms):
+    """
+    Return a list of regressions of ``results`` against ``baseline``; both
+    map a scale to ``{scenario name: metrics}``.
+
+    Latency and size may grow by the ``tolerance`` fraction, latency also by
+    ``min_delta_ms`` to absorb timer noise on fast pages, and the query
+    count by ``query_tolerance`` queries.
+    """
+    regressions = []
+    for scale, scenarios in results.items():
+        for name, metrics in scenarios.items():
+            expected = baseline.get(scale, {}).get(name)
+            if expected is None:
+                continue
+            limits = {
+                "p50_ms": max(
+                    expected["p50_ms"] * (1 + tolerance),
+                    expected["p50_ms"] + min_delta_ms,
+                ),
+                "p95_ms": max(
+                    expected["p95_ms"] * (1 + tolerance),
+                    expected["p95_ms"] + min_delta_ms,
+                ),
+                "queries": expected["queries"] + query_tolerance,
+                "bytes": expected["bytes"] * (1 + tolerance),
+            }
+            for metric, limit in limits.items():
+                if metrics[metric] > limit:
+                    regressions.append(
+                        "%s [%s] %s: %s > %s"
+                        % (
+                            name,
+                            scale,
+                            metric,
+                            metrics[metric],
+                            expected[metric],
+                        )
+                    )
+    return regressions
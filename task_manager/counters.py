@@ -0,0 +1,67 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+
+from task_manager.models import Position, Task, TaskType, Worker
+
+
+DASHBOARD_CACHE_KEY = "task_manager:dashboard_counts"
+
+DASHBOARD_COUNTERS = {
+    "num_workers": Worker,
+    "num_positions": Position,
+    "num_tasktypes": TaskType,
+    "num_tasks": Task,
+}
+
+
+def count_dashboard_objects():
+    """
+    Count every dashboard model in a single round trip.
+    """
+    sql = "SELECT %s" % ", ".join(
+        "(SELECT COUNT(*) FROM %s)" % connection.ops.quote_name(
+            model._meta.db_table
+        )
+        for model in DASHBOARD_COUNTERS.values()
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql)
+        row = cursor.fetchone()
+    return dict(zip(DASHBOARD_COUNTERS, row))
+
+
+def get_dashboard_counts():
+    counts = cache.get(DASHBOARD_CACHE_KEY)
+    if counts is None:
+        counts = count_dashboard_objects()
+        cache.set(
+            DASHBOARD_CACHE_KEY,
+            counts,
+            getattr(settings, "DASHBOARD_COUNTERS_TIMEOUT", 300),
+        )
+    return counts
+
+
+async def aget_dashboard_counts():
+    counts = await cache.aget(DASHBOARD_CACHE_KEY)
+    if counts is None:
+        # The async ORM has no raw cursors.
+        counts = await sync_to_async(count_dashboard_objects)()
+        await cache.aset(
+            DASHBOARD_CACHE_KEY,
+            counts,
+            getattr(settings, "DASHBOARD_COUNTERS_TIMEOUT", 300),
+        )
+    return counts
+
+
+def invalidate_dashboard_counts(using=None):
+    cache.delete(DASHBOARD_CACHE_KEY)
+    # Drop it again once the change is visible to other connections, so a
+    # concurrent request cannot cache the pre-commit counts.
+    transaction.on_commit(
+        lambda: cache.delete(DASHBOARD_CACHE_KEY),
+        using=using,
+    )
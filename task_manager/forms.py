@@ -1,8 +1,15 @@
 from django import forms
 from django.contrib.auth import get_user_model
 from django.contrib.auth.forms import UserCreationForm
+from django.urls import reverse_lazy
 
-from task_manager.models import Task, Worker
+from task_manager.models import Task, TaskType, Worker
+from task_manager.ordering import (
+    POSITION_ORDERINGS,
+    TASK_ORDERINGS,
+    TASK_TYPE_ORDERINGS,
+    WORKER_ORDERINGS,
+)
 
 
 class WorkerForm(UserCreationForm):
@@ -40,16 +47,99 @@ class WorkerUsernameSearchForm(forms.Form):
             }
         ),
     )
+    order = forms.ChoiceField(
+        choices=WORKER_ORDERINGS.choices,
+        required=False,
+        label="",
+        widget=forms.Select(
+            attrs={
+                "class": "text-white",
+            }
+        ),
+    )
+
+
+class AutocompleteMixin:
+    """
+    Render only the selected options of a model choice field; others are
+    looked up from ``url`` as the user types.
+    """
+
+    class Media:
+        js = ("js/autocomplete.js",)
+
+    def __init__(self, url, attrs=None):
+        super().__init__(attrs)
+        self.url = url
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context["widget"]["attrs"]["data-autocomplete-url"] = str(self.url)
+        return context
+
+    def optgroups(self, name, value, attrs=None):
+        field = self.choices.field
+        ids = [pk for pk in value if str(pk).isdigit()]
+        objects = field.queryset.filter(pk__in=ids) if ids else []
+        options = [
+            (field.prepare_value(obj), field.label_from_instance(obj), True)
+            for obj in objects
+        ]
+        if not self.allow_multiple_selected:
+            options.insert(0, ("", field.empty_label, not objects))
+        return [
+            (
+                None,
+                [
+                    self.create_option(
+                        name, value, label, selected, index, attrs=attrs
+                    )
+                ],
+                index,
+            )
+            for index, (value, label, selected) in enumerate(options)
+        ]
+
+
+class AutocompleteSelect(AutocompleteMixin, forms.Select):
+    pass
+
+
+class AutocompleteSelectMultiple(AutocompleteMixin, forms.SelectMultiple):
+    pass
+
+
+class PriorityField(forms.TypedChoiceField):
+    """
+    Priority choice that also accepts the names ("URGENT", "LOW", ...)
+    submitted before priorities were stored as integers.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("coerce", int)
+        kwargs.setdefault("choices", Task.Priority.choices)
+        super().__init__(**kwargs)
+
+    def to_python(self, value):
+        value = super().to_python(value)
+        if value.upper() in Task.Priority.names:
+            return str(Task.Priority[value.upper()].value)
+        return value
 
 
 class TaskForm(forms.ModelForm):
+    # Validation filters the queryset by the submitted ids only, and the
+    # widget renders just the selected workers.
     assignees = forms.ModelMultipleChoiceField(
         queryset=get_user_model().objects.select_related("position"),
-        widget=forms.CheckboxSelectMultiple,
+        widget=AutocompleteSelectMultiple(
+            url=reverse_lazy("task_manager:worker-autocomplete"),
+        ),
     )
     deadline = forms.DateField(
         widget=forms.DateInput(format="%m/%d/%Y"),
     )
+    priority = PriorityField()
 
     class Meta:
         model = Task
@@ -63,13 +153,7 @@ class TaskFilterForm(forms.Form):
         (False, "Not completed"),
         (True, "Completed"),
     ]
-    TASK_ORDER_BY_CHOICES = [
-        ("none", "None"),
-        ("name", "Name - from A to z"),
-        ("-name", "Name - from z to A"),
-        ("deadline", "Deadline - from closest"),
-        ("-deadline", "Deadline - from farthest"),
-    ]
+    TASK_ORDER_BY_CHOICES = TASK_ORDERINGS.choices
 
     name = forms.CharField(
         max_length=256,
@@ -85,6 +169,7 @@ class TaskFilterForm(forms.Form):
     task_completion = forms.ChoiceField(
         choices=TASK_COMPLETION_CHOICES,
         initial=TASK_COMPLETION_CHOICES[0],
+        required=False,
         label="",
         widget=forms.Select(
             attrs={
@@ -95,6 +180,7 @@ class TaskFilterForm(forms.Form):
     order = forms.ChoiceField(
         choices=TASK_ORDER_BY_CHOICES,
         initial=TASK_ORDER_BY_CHOICES[0],
+        required=False,
         label="",
         widget=forms.Select(
             attrs={
@@ -102,6 +188,76 @@ class TaskFilterForm(forms.Form):
             }
         ),
     )
+    assignee = forms.ModelChoiceField(
+        queryset=get_user_model().objects.select_related("position"),
+        required=False,
+        empty_label="Any assignee",
+        label="",
+        widget=AutocompleteSelect(
+            url=reverse_lazy("task_manager:worker-autocomplete"),
+            attrs={
+                "class": "text-white",
+            },
+        ),
+    )
+    task_type = forms.ModelChoiceField(
+        queryset=TaskType.objects.order_by("name"),
+        required=False,
+        empty_label="Any type",
+        label="",
+        widget=forms.Select(
+            attrs={
+                "class": "text-white",
+            }
+        ),
+    )
+    priority = PriorityField(
+        choices=[("", "Any priority"), *Task.Priority.choices],
+        required=False,
+        empty_value=None,
+        label="",
+        widget=forms.Select(
+            attrs={
+                "class": "text-white",
+            }
+        ),
+    )
+    deadline_from = forms.DateField(
+        required=False,
+        label="Deadline from",
+        widget=forms.DateInput(attrs={"type": "date"}),
+    )
+    deadline_to = forms.DateField(
+        required=False,
+        label="Deadline to",
+        widget=forms.DateInput(attrs={"type": "date"}),
+    )
+
+
+class WorkerTaskFilterForm(forms.Form):
+
+    STATUS_CHOICES = [
+        ("all", "All"),
+        ("open", "Not completed"),
+        ("completed", "Completed"),
+    ]
+
+    status = forms.ChoiceField(
+        choices=STATUS_CHOICES,
+        required=False,
+        label="",
+        widget=forms.Select(),
+    )
+    deadline_from = forms.DateField(
+        required=False,
+        label="Deadline from",
+        widget=forms.DateInput(attrs={"type": "date"}),
+    )
+    deadline_to = forms.DateField(
+        required=False,
+        label="Deadline to",
+        widget=forms.DateInput(attrs={"type": "date"}),
+    )
 
 
 class PositionNameSearchForm(forms.Form):
@@ -116,6 +272,16 @@ class PositionNameSearchForm(forms.Form):
             }
         ),
     )
+    order = forms.ChoiceField(
+        choices=POSITION_ORDERINGS.choices,
+        required=False,
+        label="",
+        widget=forms.Select(
+            attrs={
+                "class": "text-white",
+            }
+        ),
+    )
 
 
 class TaskTypeNameSearchForm(forms.Form):
@@ -129,3 +295,13 @@ class TaskTypeNameSearchForm(forms.Form):
             }
         ),
     )
+    order = forms.ChoiceField(
+        choices=TASK_TYPE_ORDERINGS.choices,
+        required=False,
+        label="",
+        widget=forms.Select(
+            attrs={
+                "class": "text-white",
+            }
+        ),
+    )
@@ -0,0 +1,299 @@
+"""
+Always-on, low-overhead timing of each request: database time and query
+count, template rendering, cache hits and misses, session writes and the
+total.
+
+``PerformanceMiddleware`` reports them in a ``Server-Timing`` header and a
+JSON log line on the ``task_manager.performance`` logger; requests slower
+than ``SLOW_REQUEST_THRESHOLD_MS`` are logged as warnings with their
+slowest SQL. With ``METRICS_ENABLED`` they are also added to the
+Prometheus metrics of ``task_manager.metrics``. Cache hits and misses are
+only counted for caches configured with the ``InstrumentedCache`` backend.
+"""
+import json
+import logging
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.template import TemplateDoesNotExist
+from django.template.backends import django as backends
+from django.utils.module_loading import import_string
+
+from task_manager.metrics import record_request
+
+
+logger = logging.getLogger("task_manager.performance")
+
+current_metrics = ContextVar("task_manager_request_metrics", default=None)
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.total_time = 0.0
+        self.db_time = 0.0
+        self.queries = []
+        self.template_time = 0.0
+        self.rendering = False
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.session_writes = 0
+
+    def as_dict(self):
+        return {
+            "total_ms": round(self.total_time * 1000, 2),
+            "db_ms": round(self.db_time * 1000, 2),
+            "queries": len(self.queries),
+            "template_ms": round(self.template_time * 1000, 2),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "session_writes": self.session_writes,
+        }
+
+    def server_timing(self):
+        return ", ".join(
+            [
+                'db;dur=%.2f;desc="%d queries"'
+                % (self.db_time * 1000, len(self.queries)),
+                "tpl;dur=%.2f" % (self.template_time * 1000),
+                'cache;desc="hits=%d misses=%d"'
+                % (self.cache_hits, self.cache_misses),
+                "total;dur=%.2f" % (self.total_time * 1000),
+            ]
+        )
+
+    def slowest_queries(self, count):
+        return [
+            {"sql": sql, "ms": round(duration * 1000, 2)}
+            for sql, duration in sorted(
+                self.queries, key=lambda query: query[1], reverse=True
+            )[:count]
+        ]
+
+
+def record_query(execute, sql, params, many, context):
+    metrics = current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - started
+        metrics.db_time += duration
+        metrics.queries.append((sql, duration))
+
+
+def install_query_recorder(connection):
+    """
+    Add ``record_query`` to the permanent wrappers of a connection. Async
+    views query on connections of their worker threads, so a wrapper set
+    for the duration of the request in the event loop would miss them.
+    """
+    if record_query not in connection.execute_wrappers:
+        # First, so that an ``execute_wrapper()`` block around the query
+        # that opened the connection still pops its own wrapper.
+        connection.execute_wrappers.insert(0, record_query)
+
+
+@receiver(connection_created)
+def install_query_recorder_on_connect(sender, connection, **kwargs):
+    install_query_recorder(connection)
+
+
+class InstrumentedCache(BaseCache):
+    """
+    A cache backend that wraps the one named in its ``OPTIONS["BACKEND"]``
+    and counts the hits and misses of ``get`` and ``get_many`` into the
+    current request's metrics. The other ``OPTIONS`` and settings go to the
+    wrapped backend::
+
+        CACHES = {
+            "default": {
+                "BACKEND": "task_manager.instrumentation.InstrumentedCache",
+                "LOCATION": "redis://127.0.0.1:6379",
+                "OPTIONS": {
+                    "BACKEND": "django.core.cache.backends.redis.RedisCache",
+                },
+            },
+        }
+    """
+
+    def __init__(self, location, params):
+        options = dict(params.get("OPTIONS") or {})
+        backend = import_string(options.pop("BACKEND"))
+        params = {**params, "OPTIONS": options}
+        super().__init__(params)
+        self.cache = backend(location, params)
+
+    def get(self, key, default=None, version=None):
+        value = self.cache.get(key, self._missing_key, version=version)
+        metrics = current_metrics.get()
+        if metrics is not None:
+            if value is self._missing_key:
+                metrics.cache_misses += 1
+            else:
+                metrics.cache_hits += 1
+        return default if value is self._missing_key else value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        values = self.cache.get_many(keys, version=version)
+        metrics = current_metrics.get()
+        if metrics is not None:
+            metrics.cache_hits += len(values)
+            metrics.cache_misses += len(keys) - len(values)
+        return values
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.cache.add(key, value, timeout, version)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.cache.set(key, value, timeout, version)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.cache.touch(key, timeout, version)
+
+    def delete(self, key, version=None):
+        return self.cache.delete(key, version)
+
+    def has_key(self, key, version=None):
+        return self.cache.has_key(key, version)
+
+    def incr(self, key, delta=1, version=None):
+        return self.cache.incr(key, delta, version)
+
+    def decr(self, key, delta=1, version=None):
+        return self.cache.decr(key, delta, version)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.cache.set_many(data, timeout, version)
+
+    def delete_many(self, keys, version=None):
+        return self.cache.delete_many(keys, version)
+
+    def clear(self):
+        return self.cache.clear()
+
+    def close(self, **kwargs):
+        return self.cache.close(**kwargs)
+
+
+class TimedTemplate(backends.Template):
+    def render(self, context=None, request=None):
+        metrics = current_metrics.get()
+        # Templates rendered while rendering another are already timed.
+        if metrics is None or metrics.rendering:
+            return super().render(context, request)
+        metrics.rendering = True
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            metrics.template_time += time.perf_counter() - started
+            metrics.rendering = False
+
+
+class InstrumentedDjangoTemplates(backends.DjangoTemplates):
+    """
+    The Django template backend, timing each render into the current
+    request's metrics, whether it comes from ``render()``, a
+    ``TemplateResponse`` or ``render_to_string()``.
+    """
+
+    def get_template(self, template_name):
+        try:
+            return TimedTemplate(
+                self.engine.get_template(template_name), self
+            )
+        except TemplateDoesNotExist as exc:
+            backends.reraise(exc, self)
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+
+class PerformanceMiddleware:
+    """
+    Keep it first in MIDDLEWARE, so that the total covers the other
+    middleware.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        # Connections opened from now on get it from connection_created.
+        for connection in connections.all():
+            install_query_recorder(connection)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.finish(request, response, metrics)
+
+    def finish(self, request, response, metrics):
+        metrics.total_time = time.perf_counter() - metrics.started
+        if self.saves_session(request, response):
+            metrics.session_writes += 1
+        if getattr(settings, "SERVER_TIMING_ENABLED", True):
+            response["Server-Timing"] = metrics.server_timing()
+        if getattr(settings, "METRICS_ENABLED", True):
+            record_request(request, response, metrics)
+        self.log(request, response, metrics)
+        return response
+
+    @staticmethod
+    def saves_session(request, response):
+        """
+        Whether ``SessionMiddleware`` saved the session of this response.
+        """
+        session = getattr(request, "session", None)
+        if session is None or session.is_empty():
+            return False
+        return response.status_code < 500 and (
+            session.modified
+            or getattr(settings, "SESSION_SAVE_EVERY_REQUEST", False)
+        )
+
+    def log(self, request, response, metrics):
+        match = request.resolver_match
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "view": match.view_name if match else None,
+            "status": response.status_code,
+            **metrics.as_dict(),
+        }
+        threshold = getattr(settings, "SLOW_REQUEST_THRESHOLD_MS", 500)
+        if threshold is not None and record["total_ms"] >= threshold:
+            record["slow_queries"] = metrics.slowest_queries(
+                getattr(settings, "SLOW_REQUEST_LOGGED_QUERIES", 10)
+            )
+            logger.warning(json.dumps(record))
+        elif logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps(record))
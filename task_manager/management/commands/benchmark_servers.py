@@ -0,0 +1,197 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from task_manager.server_benchmarks import (
+    SERVERS,
+    run_load,
+    start_server,
+    stop_server,
+)
+
+
+# Run by `manage.py shell` against the throwaway database.
+SETUP_SCRIPT = """
+import json
+from django.contrib.auth import get_user_model
+from django.test import Client
+from task_manager.models import Task
+
+user = get_user_model().objects.create_user("benchmark", password="benchmark")
+client = Client()
+client.force_login(user)
+print(json.dumps({
+    "session": client.session.session_key,
+    "task": Task.objects.order_by("id").values_list("id", flat=True)[0],
+    "worker": user.id,
+}))
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway SQLite database, serve it with gunicorn (WSGI) "
+        "and with uvicorn (ASGI, with the sync or the async views) in turn, "
+        "and compare their throughput under concurrent load."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--servers",
+            default=",".join(SERVERS),
+            help="Comma-separated servers among %s." % ", ".join(SERVERS),
+        )
+        parser.add_argument("--tasks", type=int, default=10000)
+        parser.add_argument("--workers", type=int, default=2)
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=4,
+            help="Threads per gunicorn worker.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=32,
+            help="Open keep-alive connections.",
+        )
+        parser.add_argument(
+            "--duration",
+            type=float,
+            default=10.0,
+            help="Seconds of load per server.",
+        )
+        parser.add_argument(
+            "--warmup",
+            type=float,
+            default=2.0,
+            help="Seconds of untimed load before each run.",
+        )
+        parser.add_argument(
+            "--view-cache",
+            action="store_true",
+            help="Keep the view cache on; by default the views do the work.",
+        )
+
+    def handle(self, *args, **options):
+        servers = options["servers"].split(",")
+        unknown = set(servers) - set(SERVERS)
+        if unknown:
+            raise CommandError("Unknown servers: %s" % ", ".join(unknown))
+
+        with tempfile.TemporaryDirectory() as directory:
+            env = {
+                **os.environ,
+                "DATABASE_URL": "sqlite:///%s"
+                % os.path.join(directory, "db.sqlite3"),
+                "VIEW_CACHE_ENABLED": str(options["view_cache"]),
+            }
+            fixtures = self.setup_database(env, options["tasks"])
+            paths = self.get_paths(fixtures)
+            headers = {
+                "Cookie": "%s=%s"
+                % (settings.SESSION_COOKIE_NAME, fixtures["session"])
+            }
+            self.stdout.write(
+                "%d tasks, %d connections, %d workers"
+                % (
+                    options["tasks"],
+                    options["concurrency"],
+                    options["workers"],
+                )
+            )
+            for server in servers:
+                result = self.benchmark(server, env, paths, headers, options)
+                self.stdout.write(
+                    "  %-10s %8.1f req/s  p50 %8.2fms  p95 %8.2fms  "
+                    "%5d errors"
+                    % (
+                        server,
+                        result["requests_per_second"],
+                        result["p50_ms"],
+                        result["p95_ms"],
+                        result["errors"],
+                    )
+                )
+
+    @staticmethod
+    def manage(env, *args):
+        try:
+            return subprocess.run(
+                [sys.executable, str(settings.BASE_DIR / "manage.py"), *args],
+                env=env,
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+        except subprocess.CalledProcessError as e:
+            raise CommandError(
+                "manage.py %s failed:\n%s" % (args[0], e.stderr)
+            )
+
+    def setup_database(self, env, tasks):
+        self.manage(env, "migrate")
+        self.manage(
+            env,
+            "seed_data",
+            "--workers", str(max(tasks // 10, 1)),
+            "--tasks", str(tasks),
+            "--seed", "1",
+        )
+        output = self.manage(env, "shell", "-c", SETUP_SCRIPT)
+        return json.loads(output.splitlines()[-1])
+
+    @staticmethod
+    def get_paths(fixtures):
+        return [
+            reverse("task_manager:index"),
+            reverse("task_manager:task-list"),
+            reverse("task_manager:task-list") + "?order=-deadline",
+            reverse("task_manager:task-detail", args=[fixtures["task"]]),
+            reverse("task_manager:worker-autocomplete") + "?q=an",
+            reverse("task_manager:api-task-list"),
+            reverse("task_manager:api-task-detail", args=[fixtures["task"]]),
+            reverse(
+                "task_manager:api-worker-detail", args=[fixtures["worker"]]
+            ),
+        ]
+
+    def benchmark(self, server, env, paths, headers, options):
+        try:
+            process, port = start_server(
+                server,
+                env,
+                options["workers"],
+                options["threads"],
+                settings.BASE_DIR,
+            )
+        except RuntimeError as e:
+            raise CommandError("%s: %s" % (server, e))
+        try:
+            asyncio.run(
+                run_load(
+                    port,
+                    paths,
+                    options["concurrency"],
+                    options["warmup"],
+                    headers,
+                )
+            )
+            return asyncio.run(
+                run_load(
+                    port,
+                    paths,
+                    options["concurrency"],
+                    options["duration"],
+                    headers,
+                )
+            )
+        finally:
+            stop_server(process)
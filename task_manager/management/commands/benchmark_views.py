@@ -0,0 +1,180 @@
+import datetime
+import json
+import logging
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (
+    setup_test_environment,
+    teardown_test_environment,
+)
+
+from task_manager.benchmarks import (
+    SCENARIOS,
+    BenchmarkFixtures,
+    compare,
+    get_uncovered_patterns,
+    run_benchmarks,
+)
+from task_manager.models import Task, Worker
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database at each scale, request every URL "
+        "of task_manager and compare latency, query counts and response "
+        "sizes against a baseline file."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scales",
+            default="1000,10000",
+            help="Comma-separated numbers of tasks; workers are a tenth.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="Timed requests per scenario and scale.",
+        )
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument(
+            "--baseline",
+            default=str(settings.BASE_DIR / "benchmarks" / "baseline.json"),
+        )
+        parser.add_argument(
+            "--update-baseline",
+            action="store_true",
+            help="Write the results to the baseline file.",
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.5,
+            help="Allowed growth of latency and size, as a fraction.",
+        )
+        parser.add_argument(
+            "--query-tolerance",
+            type=int,
+            default=0,
+            help="Allowed number of extra queries.",
+        )
+        parser.add_argument(
+            "--min-delta-ms",
+            type=float,
+            default=5.0,
+            help="Latency growth always allowed, for timer noise.",
+        )
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            dest="scenarios",
+            help="Only run the scenario with this name; repeatable.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            scales = sorted(
+                int(scale) for scale in options["scales"].split(",")
+            )
+        except ValueError:
+            raise CommandError("--scales must be comma-separated integers.")
+        scenarios = SCENARIOS
+        if options["scenarios"]:
+            scenarios = [
+                scenario
+                for scenario in SCENARIOS
+                if scenario.name in options["scenarios"]
+            ]
+
+        # Measure what production serves: no DEBUG, so no debug toolbar and
+        # no query log outside the captured blocks.
+        setup_test_environment(debug=False)
+        # The per-request log lines would drown the report.
+        performance_logger = logging.getLogger("task_manager.performance")
+        log_level = performance_logger.level
+        performance_logger.setLevel(logging.ERROR)
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        try:
+            results = self.run(scales, scenarios, options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+            performance_logger.setLevel(log_level)
+
+        if options["update_baseline"]:
+            with open(options["baseline"], "w") as baseline_file:
+                json.dump(results, baseline_file, indent=2, sort_keys=True)
+                baseline_file.write("\n")
+            self.stdout.write("Baseline written to %s" % options["baseline"])
+            return
+
+        try:
+            with open(options["baseline"]) as baseline_file:
+                baseline = json.load(baseline_file)
+        except FileNotFoundError:
+            self.stdout.write("No baseline at %s" % options["baseline"])
+            return
+        regressions = compare(
+            results,
+            baseline,
+            options["tolerance"],
+            options["query_tolerance"],
+            options["min_delta_ms"],
+        )
+        for regression in regressions:
+            self.stderr.write(regression)
+        if regressions:
+            raise CommandError(
+                "%d regressions against %s"
+                % (len(regressions), options["baseline"])
+            )
+        self.stdout.write(self.style.SUCCESS("No regressions."))
+
+    def run(self, scales, scenarios, options):
+        user = Worker.objects.create_user(
+            username="benchmark", password="benchmark", is_staff=True
+        )
+        results = {}
+        for scale in scales:
+            call_command(
+                "seed_data",
+                positions=0 if results else 20,
+                task_types=0 if results else 10,
+                workers=max(scale // 10 - Worker.objects.count() + 1, 0),
+                tasks=max(scale - Task.objects.count(), 0),
+                seed=options["seed"],
+                base_date=datetime.date(2024, 6, 1),
+                stdout=StringIO(),
+            )
+            if not results:
+                # The rows the scenarios use come from the first seeding.
+                fixtures = BenchmarkFixtures(user)
+                uncovered = get_uncovered_patterns(SCENARIOS, fixtures)
+                if uncovered:
+                    raise CommandError(
+                        "No scenario for: %s" % ", ".join(uncovered)
+                    )
+            self.stdout.write("Scale %d" % scale)
+            results[str(scale)] = run_benchmarks(
+                fixtures, options["repeat"], scenarios
+            )
+            for name, metrics in results[str(scale)].items():
+                self.stdout.write(
+                    "  %-32s p50 %8.2fms  p95 %8.2fms  %4d queries  "
+                    "%8d bytes"
+                    % (
+                        name,
+                        metrics["p50_ms"],
+                        metrics["p95_ms"],
+                        metrics["queries"],
+                        metrics["bytes"],
+                    )
+                )
+        return results
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from task_manager.profiling import MODES, make_token
+
+
+class Command(BaseCommand):
+    help = (
+        "Print a token that profiles requests sending it in the X-Profile "
+        "header, valid for PROFILING_TOKEN_MAX_AGE seconds."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--mode",
+            choices=MODES,
+            default="sample",
+            help="Profile with the sampling collector or with cProfile.",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(make_token(options["mode"]))
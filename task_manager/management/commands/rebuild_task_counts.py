@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from task_manager.aggregates import refresh_rollups
+from task_manager.models import Position, TaskCountRollup, TaskType, Worker
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the TaskCountRollup table used by the list pages when "
+        "TASK_COUNT_ROLLUPS is enabled."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of objects recomputed per query.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        for kind, model in (
+            (TaskCountRollup.WORKER, Worker),
+            (TaskCountRollup.POSITION, Position),
+            (TaskCountRollup.TASK_TYPE, TaskType),
+        ):
+            ids = list(
+                model._default_manager.order_by("pk").values_list(
+                    "pk", flat=True
+                )
+            )
+            with transaction.atomic():
+                TaskCountRollup.objects.filter(kind=kind).exclude(
+                    object_id__in=model._default_manager.values("pk")
+                ).delete()
+                for start in range(0, len(ids), batch_size):
+                    refresh_rollups(kind, ids[start:start + batch_size])
+            self.stdout.write(
+                "Rebuilt %d %s counts" % (len(ids), kind.replace("_", " "))
+            )
@@ -0,0 +1,342 @@
+import datetime
+from bisect import bisect
+import io
+import random
+import time
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from task_manager.aggregates import rollups_enabled
+from task_manager.counters import invalidate_dashboard_counts
+from task_manager.models import Position, Task, TaskType, Worker
+from task_manager.search import SEARCH_FIELDS, get_search_backend
+from task_manager.view_cache import bump_model_version
+
+
+POSITION_NAMES = [
+    "Developer", "QA Engineer", "DevOps Engineer", "Designer",
+    "Project Manager", "Data Analyst", "Team Lead", "Architect",
+]
+TASK_TYPE_NAMES = [
+    "Bug", "Feature", "Refactoring", "Documentation", "QA", "Research",
+]
+FIRST_NAMES = [
+    "Alex", "Maria", "John", "Olena", "Ivan", "Sofia", "Peter", "Anna",
+    "David", "Kate", "Max", "Iryna", "Tom", "Nina", "Oleh", "Sara",
+]
+LAST_NAMES = [
+    "Smith", "Shevchenko", "Brown", "Kovalenko", "Miller", "Bondarenko",
+    "Wilson", "Tkachenko", "Taylor", "Melnyk", "Clark", "Boyko",
+]
+VERBS = [
+    "Fix", "Add", "Update", "Remove", "Refactor", "Test", "Document",
+    "Migrate", "Optimize", "Review",
+]
+NOUNS = [
+    "login", "logout", "export", "import", "search", "dashboard", "report",
+    "invoice", "profile", "settings", "notifications", "API", "cache",
+    "payments", "permissions", "deadline picker",
+]
+# Cumulative weights of Task.Priority.URGENT, HIGHT, MEDIUM and LOW.
+PRIORITY_CUM_WEIGHTS = [0.1, 0.3, 0.7, 1.0]
+
+# The fields each builder fills, in row order.
+FIELDS = {
+    Position: ("id", "name"),
+    TaskType: ("id", "name"),
+    Worker: (
+        "id", "username", "password", "first_name", "last_name", "email",
+        "is_superuser", "is_staff", "is_active", "date_joined", "updated_at",
+        "position_id",
+    ),
+    Task: (
+        "id", "name", "description", "deadline", "is_completed", "priority",
+        "task_type_id", "updated_at",
+    ),
+    Task.assignees.through: ("task_id", "worker_id"),
+}
+
+
+def picker(rng):
+    """
+    ``rng.choice`` built on a single ``rng.random()`` call, which is several
+    times cheaper when drawing tens of millions of values.
+    """
+    random = rng.random
+
+    def pick(seq):
+        return seq[int(random() * len(seq))]
+
+    return pick
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate positions, task types, workers and tasks with assignees. "
+        "The same seed and base date always produce the same rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--positions", type=int, default=20)
+        parser.add_argument("--task-types", type=int, default=10)
+        parser.add_argument("--workers", type=int, default=1000)
+        parser.add_argument("--tasks", type=int, default=10000)
+        parser.add_argument(
+            "--max-assignees",
+            type=int,
+            default=3,
+            help="Each task gets between 0 and this many assignees.",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--base-date",
+            type=datetime.date.fromisoformat,
+            help="Deadlines are spread around this date (default: today).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Number of rows inserted per query.",
+        )
+        parser.add_argument(
+            "--password",
+            default="seed-password",
+            help="Password of every generated worker.",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database to seed.",
+        )
+        parser.add_argument(
+            "--no-copy",
+            action="store_false",
+            dest="use_copy",
+            help="Use bulk_create on PostgreSQL instead of COPY.",
+        )
+
+    def handle(self, *args, **options):
+        for name in ("positions", "task_types", "workers", "tasks"):
+            if options[name] < 0:
+                raise CommandError("--%s cannot be negative." % name)
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive.")
+        self.using = options["database"]
+        self.connection = connections[self.using]
+        self.batch_size = options["batch_size"]
+        self.use_copy = (
+            options["use_copy"] and self.connection.vendor == "postgresql"
+        )
+        self.seed = options["seed"]
+        self.base_date = options["base_date"] or timezone.localdate()
+        self.now = self.connection.ops.adapt_datetimefield_value(
+            timezone.now()
+        )
+
+        with transaction.atomic(using=self.using):
+            position_ids = self.seed_model(
+                Position,
+                options["positions"],
+                self.build_positions,
+            )
+            task_type_ids = self.seed_model(
+                TaskType,
+                options["task_types"],
+                self.build_task_types,
+            )
+            worker_ids = self.seed_model(
+                Worker,
+                options["workers"],
+                self.build_workers,
+                position_ids,
+                make_password(options["password"]),
+            )
+            self.seed_model(
+                Task,
+                options["tasks"],
+                self.build_tasks,
+                task_type_ids,
+                worker_ids,
+                options["max_assignees"],
+            )
+            if self.connection.vendor == "postgresql":
+                self.reset_sequences()
+            invalidate_dashboard_counts(self.using)
+
+        for model in (Position, TaskType, Worker, Task):
+            bump_model_version(model, self.using)
+        if rollups_enabled():
+            call_command(
+                "rebuild_task_counts",
+                batch_size=self.batch_size,
+                stdout=self.stdout,
+            )
+
+    def seed_model(self, model, count, build, *args):
+        """
+        Insert ``count`` rows with consecutive ids after the current maximum
+        and return those ids.
+
+        Builders yield ``(model, row)`` pairs of database-ready values, which
+        skips the per-field compilation of ``bulk_create`` that dominates at
+        millions of rows.
+        """
+        started = time.monotonic()
+        manager = model._default_manager.using(self.using)
+        first_id = (manager.aggregate(max_id=Max("pk"))["max_id"] or 0) + 1
+        ids = range(first_id, first_id + count)
+        rng = random.Random("%s:%s" % (self.seed, model._meta.label_lower))
+        search_backend = get_search_backend(self.using)
+        search_column = FIELDS[model].index(SEARCH_FIELDS[model])
+        for batch in batched(build(rng, ids, *args), self.batch_size):
+            rows = {}
+            for row_model, row in batch:
+                rows.setdefault(row_model, []).append(row)
+            # Dicts keep insertion order, so parents go in before the
+            # assignments that reference them.
+            for row_model, model_rows in rows.items():
+                self.insert(row_model, model_rows)
+            search_backend.index_values(
+                model,
+                [(row[0], row[search_column]) for row in rows.get(model, ())],
+                self.using,
+            )
+        self.stdout.write(
+            "Created %d %s in %.1fs"
+            % (
+                count,
+                model._meta.verbose_name_plural,
+                time.monotonic() - started,
+            )
+        )
+        return ids
+
+    def insert(self, model, rows):
+        quote = self.connection.ops.quote_name
+        columns = ", ".join(
+            quote(model._meta.get_field(name).column)
+            for name in FIELDS[model]
+        )
+        table = quote(model._meta.db_table)
+        with self.connection.cursor() as cursor:
+            if self.use_copy:
+                self.copy(
+                    cursor, "COPY %s (%s) FROM STDIN" % (table, columns), rows
+                )
+            else:
+                cursor.executemany(
+                    "INSERT INTO %s (%s) VALUES (%s)"
+                    % (table, columns, ", ".join(["%s"] * len(FIELDS[model]))),
+                    rows,
+                )
+
+    def copy(self, cursor, sql, rows):
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write("\t".join(self.copy_value(value) for value in row))
+            buffer.write("\n")
+        buffer.seek(0)
+        if hasattr(cursor.cursor, "copy_expert"):
+            # psycopg2
+            cursor.cursor.copy_expert(sql, buffer)
+        else:
+            with cursor.cursor.copy(sql) as copy:
+                copy.write(buffer.getvalue())
+
+    @staticmethod
+    def copy_value(value):
+        if value is None:
+            return "\\N"
+        if isinstance(value, bool):
+            return "t" if value else "f"
+        return (
+            str(value)
+            .replace("\\", "\\\\")
+            .replace("\t", "\\t")
+            .replace("\n", "\\n")
+            .replace("\r", "\\r")
+        )
+
+    def reset_sequences(self):
+        statements = self.connection.ops.sequence_reset_sql(
+            no_style(), [Position, TaskType, Worker, Task]
+        )
+        with self.connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+    @staticmethod
+    def build_positions(rng, ids):
+        pick = picker(rng)
+        for pk in ids:
+            name = "%s %d" % (pick(POSITION_NAMES), pk)
+            yield Position, (pk, name)
+
+    @staticmethod
+    def build_task_types(rng, ids):
+        pick = picker(rng)
+        for pk in ids:
+            name = "%s %d" % (pick(TASK_TYPE_NAMES), pk)
+            yield TaskType, (pk, name)
+
+    def build_workers(self, rng, ids, position_ids, password):
+        pick = picker(rng)
+        for pk in ids:
+            first_name = pick(FIRST_NAMES)
+            last_name = pick(LAST_NAMES)
+            username = ("%s.%s%d" % (first_name, last_name, pk)).lower()
+            position_id = pick(position_ids) if position_ids else None
+            yield Worker, (
+                pk, username, password, first_name, last_name,
+                "%s@example.com" % username, False, False, True,
+                self.now, self.now, position_id,
+            )
+
+    def build_tasks(self, rng, ids, task_type_ids, worker_ids, max_assignees):
+        pick = picker(rng)
+        random = rng.random
+        deadlines = [
+            self.connection.ops.adapt_datefield_value(
+                self.base_date + datetime.timedelta(days=days)
+            )
+            for days in range(-180, 366)
+        ]
+        past_deadlines = 180
+        priorities = Task.Priority.values
+        assignee_counts = range(min(max_assignees, len(worker_ids)) + 1)
+        for pk in ids:
+            verb = pick(VERBS)
+            noun = pick(NOUNS)
+            deadline_index = int(random() * len(deadlines))
+            # Most past tasks are done, most future ones are not.
+            done_chance = 0.8 if deadline_index < past_deadlines else 0.1
+            task_type_id = pick(task_type_ids) if task_type_ids else None
+            yield Task, (
+                pk,
+                "%s %s #%d" % (verb, noun, pk),
+                "%s the %s for %s." % (verb, noun, pick(FIRST_NAMES)),
+                deadlines[deadline_index],
+                random() < done_chance,
+                priorities[bisect(PRIORITY_CUM_WEIGHTS, random())],
+                task_type_id,
+                self.now,
+            )
+            assignees = {
+                pick(worker_ids) for _ in range(pick(assignee_counts))
+            }
+            for worker_id in sorted(assignees):
+                yield Task.assignees.through, (pk, worker_id)
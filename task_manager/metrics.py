@@ -0,0 +1,128 @@
+"""
+Prometheus metrics of requests, database queries, cache and view cache
+lookups and session writes, labelled by URL name and served at
+``/metrics``.
+
+``PerformanceMiddleware`` feeds them from each request's
+``RequestMetrics``. With several gunicorn or uvicorn worker processes, set
+the ``PROMETHEUS_MULTIPROC_DIR`` environment variable to an empty directory
+before the workers start: each process then writes its values to files
+there and ``/metrics`` adds them up.
+"""
+import os
+
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.http import HttpRequest, HttpResponse
+from django.utils.crypto import constant_time_compare
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+
+UNRESOLVED = "unresolved"
+
+REQUESTS = Counter(
+    "task_manager_requests",
+    "Requests by URL name, method and status code.",
+    ["view", "method", "status"],
+)
+
+REQUEST_DURATION = Histogram(
+    "task_manager_request_duration_seconds",
+    "Time spent in the middleware and the view, by URL name.",
+    ["view"],
+)
+
+QUERIES_PER_REQUEST = Histogram(
+    "task_manager_db_queries_per_request",
+    "SQL queries run per request, by URL name.",
+    ["view"],
+    buckets=(1, 2, 3, 5, 8, 13, 21, 50, 100),
+)
+
+QUERY_DURATION = Histogram(
+    "task_manager_db_query_duration_seconds",
+    "Duration of single SQL queries, by URL name.",
+    ["view"],
+    buckets=(
+        0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0
+    ),
+)
+
+CACHE_LOOKUPS = Counter(
+    "task_manager_cache_lookups",
+    "Cache gets by URL name and result, hit or miss.",
+    ["view", "result"],
+)
+
+VIEW_CACHE_LOOKUPS = Counter(
+    "task_manager_view_cache_lookups",
+    "Cached view responses looked up, by view class and outcome: hit or "
+    "miss.",
+    ["view", "outcome"],
+)
+
+ADMIN_SITE_LOOKUPS = Counter(
+    "task_manager_admin_site_lookups",
+    "Admin site lookups of the menu, by result: cached hit or miss.",
+    ["result"],
+)
+
+SESSION_WRITES = Counter(
+    "task_manager_session_writes",
+    "Saves of the session store, by URL name.",
+    ["view"],
+)
+
+
+def record_request(request, response, metrics):
+    match = request.resolver_match
+    view = match.view_name if match else UNRESOLVED
+    REQUESTS.labels(view, request.method, response.status_code).inc()
+    REQUEST_DURATION.labels(view).observe(metrics.total_time)
+    QUERIES_PER_REQUEST.labels(view).observe(len(metrics.queries))
+    query_duration = QUERY_DURATION.labels(view)
+    for sql, duration in metrics.queries:
+        query_duration.observe(duration)
+    if metrics.cache_hits:
+        CACHE_LOOKUPS.labels(view, "hit").inc(metrics.cache_hits)
+    if metrics.cache_misses:
+        CACHE_LOOKUPS.labels(view, "miss").inc(metrics.cache_misses)
+    if metrics.session_writes:
+        SESSION_WRITES.labels(view).inc(metrics.session_writes)
+
+
+def get_registry():
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def is_authorized(request):
+    if request.user.is_staff:
+        return True
+    token = getattr(settings, "METRICS_TOKEN", None)
+    return bool(token) and constant_time_compare(
+        request.headers.get("Authorization", ""), "Bearer %s" % token
+    )
+
+
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    """
+    Serve the metrics to staff users and to scrapers sending
+    ``METRICS_TOKEN`` as a bearer token.
+    """
+    if not is_authorized(request):
+        raise PermissionDenied
+    return HttpResponse(
+        generate_latest(get_registry()), content_type=CONTENT_TYPE_LATEST
+    )
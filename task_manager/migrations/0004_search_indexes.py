@@ -0,0 +1,71 @@
+from django.db import migrations
+from django.db.utils import OperationalError
+
+
+SEARCH_FIELDS = {
+    "task_manager_task": "name",
+    "task_manager_worker": "username",
+    "task_manager_position": "name",
+    "task_manager_tasktype": "name",
+}
+
+
+def create_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    with schema_editor.connection.cursor() as cursor:
+        if vendor == "postgresql":
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            for table, field in SEARCH_FIELDS.items():
+                cursor.execute(
+                    "CREATE INDEX IF NOT EXISTS {table}_{field}_trgm "
+                    "ON {table} USING gin "
+                    "(UPPER({field}::text) gin_trgm_ops)".format(
+                        table=table, field=field
+                    )
+                )
+        elif vendor == "sqlite":
+            for table, field in SEARCH_FIELDS.items():
+                try:
+                    cursor.execute(
+                        "CREATE VIRTUAL TABLE IF NOT EXISTS {table}_fts "
+                        "USING fts5({field}, tokenize='trigram')".format(
+                            table=table, field=field
+                        )
+                    )
+                except OperationalError:
+                    # SQLite built without FTS5 or older than 3.34:
+                    # searches keep using LIKE.
+                    return
+                cursor.execute(
+                    "INSERT INTO {table}_fts (rowid, {field}) "
+                    "SELECT id, {field} FROM {table}".format(
+                        table=table, field=field
+                    )
+                )
+
+
+def drop_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    with schema_editor.connection.cursor() as cursor:
+        for table, field in SEARCH_FIELDS.items():
+            if vendor == "postgresql":
+                cursor.execute(
+                    "DROP INDEX IF EXISTS {table}_{field}_trgm".format(
+                        table=table, field=field
+                    )
+                )
+            elif vendor == "sqlite":
+                cursor.execute(
+                    "DROP TABLE IF EXISTS {table}_fts".format(table=table)
+                )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task_manager", "0003_task_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
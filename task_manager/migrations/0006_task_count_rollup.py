@@ -0,0 +1,47 @@
+# Generated by Django 5.0.6 on 2026-10-18 19:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task_manager", "0005_updated_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskCountRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("worker", "Worker"),
+                            ("position", "Position"),
+                            ("task_type", "Task type"),
+                        ],
+                        max_length=16,
+                    ),
+                ),
+                ("object_id", models.BigIntegerField()),
+                ("total", models.PositiveIntegerField(default=0)),
+                ("open", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="taskcountrollup",
+            constraint=models.UniqueConstraint(
+                fields=("kind", "object_id"), name="task_count_rollup_unique"
+            ),
+        ),
+    ]
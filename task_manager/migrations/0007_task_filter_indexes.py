@@ -0,0 +1,25 @@
+# Generated by Django 5.0.6 on 2026-10-18 19:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task_manager", "0006_task_count_rollup"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["task_type", "deadline", "id"], name="task_type_deadline_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["priority", "deadline", "id"], name="task_priority_deadline_idx"
+            ),
+        ),
+    ]
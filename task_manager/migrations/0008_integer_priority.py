@@ -0,0 +1,64 @@
+# Generated by Django 5.0.6 on 2026-10-18 19:42
+
+from django.db import migrations, models
+
+PRIORITY_VALUES = {
+    "URGENT": 1,
+    "HIGHT": 2,
+    "MEDIUM": 3,
+    "LOW": 4,
+}
+
+
+def names_to_values(apps, schema_editor):
+    # Rows may hold the choice key ("URGENT") or its label ("Urgent").
+    Task = apps.get_model("task_manager", "Task")
+    known = models.Q()
+    for name in PRIORITY_VALUES:
+        known |= models.Q(priority__iexact=name)
+    unknown = Task.objects.exclude(known).order_by("pk")
+    if unknown.exists():
+        # Nothing is guessed: fix these rows, then migrate again.
+        raise ValueError(
+            "%d tasks have an unknown priority; the first (pk, priority): %s"
+            % (
+                unknown.count(),
+                ", ".join(
+                    "(%s, %r)" % row
+                    for row in unknown.values_list("pk", "priority")[:20]
+                ),
+            )
+        )
+    for name, value in PRIORITY_VALUES.items():
+        Task.objects.filter(priority__iexact=name).update(priority=str(value))
+
+
+def values_to_names(apps, schema_editor):
+    Task = apps.get_model("task_manager", "Task")
+    for name, value in PRIORITY_VALUES.items():
+        Task.objects.filter(priority=str(value)).update(priority=name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task_manager", "0007_task_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(names_to_values, values_to_names),
+        migrations.AlterField(
+            model_name="task",
+            name="priority",
+            field=models.PositiveSmallIntegerField(
+                choices=[(1, "Urgent"), (2, "Hight"), (3, "Medium"), (4, "Low")]
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["is_completed", "priority", "deadline", "id"],
+                name="task_completed_priority_idx",
+            ),
+        ),
+    ]
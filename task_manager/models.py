@@ -22,32 +22,111 @@ class Worker(AbstractUser):
         null=True,
         on_delete=models.SET_NULL,
     )
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self) -> str:
         return f"{self.position} {self.first_name} {self.last_name}"
 
 
 class Task(models.Model):
-    PRIORITY_CHOICES = {
-        "URGENT": "Urgent",
-        "HIGHT": "Hight",
-        "MEDIUM": "Medium",
-        "LOW": "Low",
-    }
+    class Priority(models.IntegerChoices):
+        # Ascending order is most urgent first.
+        URGENT = 1, "Urgent"
+        HIGHT = 2, "Hight"
+        MEDIUM = 3, "Medium"
+        LOW = 4, "Low"
+
+        def __str__(self) -> str:
+            return self.label
+
+    # Kept so that PRIORITY_CHOICES["URGENT"] still names a priority.
+    PRIORITY_CHOICES = Priority
 
     name = models.CharField(max_length=255)
     description = models.TextField()
     deadline = models.DateField()
     is_completed = models.BooleanField(default=False)
-    priority = models.CharField(choices=PRIORITY_CHOICES, max_length=6)
+    priority = models.PositiveSmallIntegerField(choices=Priority.choices)
     task_type = models.ForeignKey(
         TaskType,
         null=True,
         on_delete=models.SET_NULL,
     )
     assignees = models.ManyToManyField(Worker, related_name="tasks")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["is_completed", "deadline", "id"],
+                name="task_completed_deadline_idx",
+            ),
+            models.Index(
+                fields=["is_completed", "name", "id"],
+                name="task_completed_name_idx",
+            ),
+            models.Index(
+                fields=["deadline", "id"],
+                name="task_deadline_idx",
+            ),
+            models.Index(
+                fields=["name", "id"],
+                name="task_name_idx",
+            ),
+            models.Index(
+                fields=["deadline", "id"],
+                condition=models.Q(is_completed=False),
+                name="task_open_deadline_idx",
+            ),
+            models.Index(
+                fields=["task_type", "deadline", "id"],
+                name="task_type_deadline_idx",
+            ),
+            models.Index(
+                fields=["priority", "deadline", "id"],
+                name="task_priority_deadline_idx",
+            ),
+            models.Index(
+                fields=["is_completed", "priority", "deadline", "id"],
+                name="task_completed_priority_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return (
-            f"{self.name} (Till: {self.deadline}, priority: {self.priority})"
+            f"{self.name} (Till: {self.deadline}, "
+            f"priority: {self.get_priority_display()})"
         )
+
+
+class TaskCountRollup(models.Model):
+    """
+    Precomputed counts shown on the list pages, maintained by signals when
+    ``TASK_COUNT_ROLLUPS`` is enabled: tasks (``total``/``open``) per
+    worker, workers per position and tasks per task type.
+    """
+
+    WORKER = "worker"
+    POSITION = "position"
+    TASK_TYPE = "task_type"
+    KIND_CHOICES = {
+        WORKER: "Worker",
+        POSITION: "Position",
+        TASK_TYPE: "Task type",
+    }
+
+    kind = models.CharField(choices=KIND_CHOICES, max_length=16)
+    object_id = models.BigIntegerField()
+    total = models.PositiveIntegerField(default=0)
+    open = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["kind", "object_id"],
+                name="task_count_rollup_unique",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.kind} {self.object_id}: {self.total}"
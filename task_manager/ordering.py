@@ -0,0 +1,112 @@
+from django.core.exceptions import FieldDoesNotExist
+
+from task_manager.models import Position, Task, TaskType, Worker
+from task_manager.pagination import add_tiebreaker
+
+
+class OrderingRegistry:
+    """
+    The public sort keys of a list view, each mapped to a label for the sort
+    controls and to an ordering backed by an index.
+
+    Unknown keys, and orderings on an annotation the queryset does not have
+    (such as ``search_rank`` without a search), fall back to ``default``.
+    """
+
+    def __init__(self, model, orderings, default):
+        self.model = model
+        self.orderings = orderings
+        self.default = default
+
+    def __contains__(self, key):
+        return key in self.orderings
+
+    @property
+    def choices(self):
+        return [(key, label) for key, (label, _) in self.orderings.items()]
+
+    def get_key(self, key):
+        return key if key in self.orderings else self.default
+
+    def get_ordering(self, key, queryset=None):
+        label, fields = self.orderings[self.get_key(key)]
+        if queryset is not None and not self.is_available(fields, queryset):
+            label, fields = self.orderings[self.default]
+        return add_tiebreaker(self.model, fields)
+
+    def is_available(self, fields, queryset):
+        for field in fields:
+            name = field.lstrip("-")
+            if name in queryset.query.annotations or name == "pk":
+                continue
+            try:
+                self.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                return False
+        return True
+
+    def apply(self, queryset, key):
+        return queryset.order_by(*self.get_ordering(key, queryset))
+
+
+class OrderingMixin:
+    """
+    ListView mixin ordering the queryset by the ``orderings`` registry key
+    given in the ``order`` GET parameter.
+    """
+
+    orderings = None
+    ordering_kwarg = "order"
+
+    def get_ordering_key(self):
+        return self.orderings.get_key(
+            self.request.GET.get(self.ordering_kwarg)
+        )
+
+    def order_queryset(self, queryset):
+        return self.orderings.apply(queryset, self.get_ordering_key())
+
+
+TASK_ORDERINGS = OrderingRegistry(
+    Task,
+    {
+        "none": ("None", ("id",)),
+        "name": ("Name - from A to z", ("name",)),
+        "-name": ("Name - from z to A", ("-name",)),
+        "deadline": ("Deadline - from closest", ("deadline",)),
+        "-deadline": ("Deadline - from farthest", ("-deadline",)),
+        "priority": ("Priority - most urgent first", ("priority", "deadline")),
+        "relevance": ("Relevance", ("-search_rank",)),
+    },
+    default="none",
+)
+
+WORKER_ORDERINGS = OrderingRegistry(
+    Worker,
+    {
+        "none": ("None", ("id",)),
+        "username": ("Username - from A to z", ("username",)),
+        "-username": ("Username - from z to A", ("-username",)),
+    },
+    default="none",
+)
+
+POSITION_ORDERINGS = OrderingRegistry(
+    Position,
+    {
+        "none": ("None", ("id",)),
+        "name": ("Name - from A to z", ("name",)),
+        "-name": ("Name - from z to A", ("-name",)),
+    },
+    default="none",
+)
+
+TASK_TYPE_ORDERINGS = OrderingRegistry(
+    TaskType,
+    {
+        "none": ("None", ("id",)),
+        "name": ("Name - from A to z", ("name",)),
+        "-name": ("Name - from z to A", ("-name",)),
+    },
+    default="none",
+)
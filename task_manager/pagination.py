@@ -0,0 +1,296 @@
+import base64
+import binascii
+import json
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.http import Http404
+from django.utils.functional import cached_property
+
+
+CURSOR_VAR = "cursor"
+COUNT_VAR = "count"
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def encode_cursor(values, direction):
+    payload = json.dumps(
+        {"v": values, "d": direction},
+        cls=DjangoJSONEncoder,
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values, direction = payload["v"], payload["d"]
+    except (
+        binascii.Error,
+        ValueError,
+        TypeError,
+        KeyError,
+        UnicodeDecodeError,
+    ):
+        raise InvalidCursor("The cursor is malformed")
+    if direction not in ("n", "p") or not isinstance(values, list):
+        raise InvalidCursor("The cursor is malformed")
+    return values, direction
+
+
+def add_tiebreaker(model, ordering):
+    """
+    Make ``ordering`` total by appending the primary key, unless it already
+    contains the primary key or a non-null unique field.
+
+    The tiebreaker follows the direction of the leading key so that one
+    index over (key, id) can be walked without an extra sort.
+    """
+    ordering = list(ordering)
+    for field in ordering:
+        name = field.lstrip("-")
+        if name == "pk":
+            return ordering
+        try:
+            model_field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            continue
+        if getattr(model_field, "unique", False) and not model_field.null:
+            return ordering
+    descending = bool(ordering) and ordering[0].startswith("-")
+    ordering.append("-pk" if descending else "pk")
+    return ordering
+
+
+class CursorPage:
+    """
+    A page of a keyset-paginated queryset.
+    Mirrors the parts of ``django.core.paginator.Page`` used by templates.
+    """
+
+    is_cursor = True
+    number = None
+
+    def __init__(
+        self,
+        object_list,
+        paginator,
+        next_cursor=None,
+        previous_cursor=None,
+    ):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """
+    Keyset paginator: seeks past the last row of the previous page using
+    the queryset ordering (plus a ``pk`` tiebreaker) instead of
+    ``OFFSET``, and never counts the rows unless ``count`` is accessed.
+    """
+
+    def __init__(self, queryset, per_page):
+        self.per_page = int(per_page)
+        self.ordering = self.get_ordering(queryset)
+        self.queryset = queryset.order_by(*self.ordering)
+
+    @staticmethod
+    def get_ordering(queryset):
+        ordering = [
+            field for field in queryset.query.order_by
+            if isinstance(field, str)
+        ]
+        if not ordering:
+            ordering = list(queryset.model._meta.ordering)
+        return add_tiebreaker(queryset.model, ordering)
+
+    @cached_property
+    def count(self):
+        return self.queryset.count()
+
+    async def acount(self):
+        # Fill the cached ``count``, so templates can read it synchronously.
+        self.__dict__["count"] = await self.queryset.acount()
+        return self.count
+
+    def get_keys(self, obj):
+        keys = []
+        for field in self.ordering:
+            value = obj
+            for attr in field.lstrip("-").split("__"):
+                value = getattr(value, attr)
+                if value is None:
+                    break
+            keys.append(value)
+        return keys
+
+    def get_key_field(self, name):
+        query = self.queryset.query
+        if name in query.annotations:
+            return query.annotations[name].output_field
+        model, field = self.queryset.model, None
+        for attr in name.split("__"):
+            if attr == "pk":
+                field = model._meta.pk
+            else:
+                field = model._meta.get_field(attr)
+            model = field.related_model
+        return field
+
+    def clean_keys(self, values):
+        """
+        Convert the keys read from a cursor to the types of the ordering
+        fields, since the cursor comes from the client.
+        """
+        if len(values) != len(self.ordering):
+            raise InvalidCursor("The cursor does not match the ordering")
+        keys = []
+        for field, value in zip(self.ordering, values):
+            if value is None or isinstance(value, (list, dict)):
+                raise InvalidCursor("The cursor is malformed")
+            try:
+                keys.append(
+                    self.get_key_field(field.lstrip("-")).to_python(value)
+                )
+            except (ValueError, TypeError, ValidationError):
+                raise InvalidCursor("The cursor is malformed")
+        return keys
+
+    def get_seek_filter(self, values, backwards):
+        values = self.clean_keys(values)
+        condition = Q()
+        for position, field in enumerate(self.ordering):
+            term = Q(**{self._seek_lookup(field, backwards): values[position]})
+            for previous, value in zip(self.ordering[:position], values):
+                term &= Q(**{previous.lstrip("-"): value})
+            condition |= term
+        if len(self.ordering) == 1:
+            return condition
+        # The redundant bound on the leading key turns the OR expansion
+        # into a single index range scan.
+        leading = self._seek_lookup(self.ordering[0], backwards) + "e"
+        return Q(**{leading: values[0]}) & condition
+
+    @staticmethod
+    def _seek_lookup(field, backwards):
+        descending = field.startswith("-") != backwards
+        return "%s__%s" % (field.lstrip("-"), "lt" if descending else "gt")
+
+    def page(self, cursor=None):
+        queryset, backwards = self.get_page_queryset(cursor)
+        return self.build_page(list(queryset), cursor, backwards)
+
+    async def apage(self, cursor=None):
+        queryset, backwards = self.get_page_queryset(cursor)
+        rows = [row async for row in queryset.aiterator()]
+        return self.build_page(rows, cursor, backwards)
+
+    def get_page_queryset(self, cursor):
+        """
+        Return the query for the page at ``cursor``, one row longer than a
+        page to tell whether there are more, and whether it walks backwards.
+        """
+        if not cursor:
+            return self.queryset[:self.per_page + 1], False
+        values, direction = decode_cursor(cursor)
+        backwards = direction == "p"
+        queryset = self.queryset.filter(
+            self.get_seek_filter(values, backwards)
+        )
+        if backwards:
+            queryset = queryset.reverse()
+        return queryset[:self.per_page + 1], backwards
+
+    def build_page(self, rows, cursor, backwards):
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if not cursor:
+            return self._build_page(rows, has_next=has_more, has_prev=False)
+        if backwards:
+            rows.reverse()
+            return self._build_page(rows, has_next=True, has_prev=has_more)
+        return self._build_page(rows, has_next=has_more, has_prev=True)
+
+    def _build_page(self, rows, has_next, has_prev):
+        next_cursor = previous_cursor = None
+        if rows and has_next:
+            next_cursor = encode_cursor(self.get_keys(rows[-1]), "n")
+        if rows and has_prev:
+            previous_cursor = encode_cursor(self.get_keys(rows[0]), "p")
+        return CursorPage(rows, self, next_cursor, previous_cursor)
+
+
+class CursorPaginationMixin:
+    """
+    ListView mixin switching ``paginate_by`` to keyset pagination when
+    ``pagination_mode`` is ``"cursor"``. Pass ``?count=1`` to also expose
+    the total number of rows (costs a ``COUNT(*)``).
+    """
+
+    pagination_mode = "cursor"
+    cursor_kwarg = CURSOR_VAR
+
+    def paginate_queryset(self, queryset, page_size):
+        if self.pagination_mode != "cursor":
+            return super().paginate_queryset(queryset, page_size)
+
+        paginator = CursorPaginator(queryset, page_size)
+        cursor = self.request.GET.get(self.cursor_kwarg)
+        try:
+            page = paginator.page(cursor)
+        except InvalidCursor as e:
+            raise Http404("Invalid cursor: %s" % e)
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    async def apaginate_queryset(self, queryset, page_size):
+        """
+        Async ``paginate_queryset``, also running the count when asked for.
+        """
+        if self.pagination_mode != "cursor":
+            return await sync_to_async(super().paginate_queryset)(
+                queryset, page_size
+            )
+
+        paginator = CursorPaginator(queryset, page_size)
+        cursor = self.request.GET.get(self.cursor_kwarg)
+        try:
+            page = await paginator.apage(cursor)
+        except InvalidCursor as e:
+            raise Http404("Invalid cursor: %s" % e)
+        if self.request.GET.get(COUNT_VAR):
+            await paginator.acount()
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        paginator = context.get("paginator")
+        if paginator is not None and self.request.GET.get(COUNT_VAR):
+            context["total_count"] = paginator.count
+        return context
@@ -0,0 +1,288 @@
+"""
+Profiling of single requests, on demand or for a sample of the traffic.
+
+Staff users profile a request by adding ``?profile=sample`` (or
+``?profile=cprofile``) to its URL; scripts and load tools send an
+``X-Profile`` header with a signed token from ``manage.py profile_token``
+instead. ``PROFILING_SAMPLE_RATE`` profiles that fraction of all requests
+with the sampling collector.
+
+Profiles are kept in the ``PROFILING_CACHE`` cache under a random id, sent
+back in the ``X-Profile-Id`` header. ``profiles/<id>/`` serves sampled
+profiles as collapsed stacks, the input of ``flamegraph.pl`` and
+speedscope, and cProfile ones as ``pstats`` text.
+"""
+import cProfile
+import io
+import pstats
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.auth.decorators import user_passes_test
+from django.core import signing
+from django.core.cache import caches
+from django.http import Http404, HttpRequest, HttpResponse
+from django.urls import reverse
+from django.utils import timezone
+
+from task_manager.utils import JsonResponse
+
+
+MODES = ("sample", "cprofile")
+
+TOKEN_SALT = "task_manager.profiling"
+
+INDEX_KEY = "task_manager:profiles"
+
+PROFILE_KEY = "task_manager:profile:%s"
+
+# cProfile records every request on the profiled thread, and Python 3.12
+# allows a single active profiler per process: one cProfile run at a time.
+_cprofile_lock = threading.Lock()
+
+
+def frame_label(frame):
+    code = frame.f_code
+    return "%s:%s" % (
+        frame.f_globals.get("__name__", "?"),
+        getattr(code, "co_qualname", code.co_name),
+    )
+
+
+class StackSampler:
+    """
+    Count the stacks of the thread calling ``start`` every ``interval``
+    seconds from a background thread, keeping only the frames below the
+    one that called ``start``.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.samples = Counter()
+        self.thread_id = threading.get_ident()
+        self.root = None
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        self.root = sys._getframe(1)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        self.thread.join()
+
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None and frame is not self.root:
+                stack.append(frame_label(frame))
+                frame = frame.f_back
+            # Skip samples taken once the profiled call has returned.
+            if frame is not None and stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def collapsed(self):
+        return "".join(
+            "%s %d\n" % (stack, count)
+            for stack, count in sorted(self.samples.items())
+        )
+
+
+def format_stats(profiler, limit=100):
+    output = io.StringIO()
+    stats = pstats.Stats(profiler, stream=output)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+    return output.getvalue()
+
+
+def make_token(mode="sample"):
+    return signing.dumps(mode, salt=TOKEN_SALT)
+
+
+def get_profile_cache():
+    return caches[getattr(settings, "PROFILING_CACHE", "default")]
+
+
+def save_profile(output, mode="sample", **details):
+    """
+    Store a profile with its request ``details`` and return its id.
+    """
+    profile_id = uuid.uuid4().hex
+    cache = get_profile_cache()
+    timeout = getattr(settings, "PROFILING_TIMEOUT", 3600)
+    cache.set(
+        PROFILE_KEY % profile_id,
+        {
+            "id": profile_id,
+            "mode": mode,
+            "created": timezone.now().isoformat(),
+            **details,
+            "output": output,
+        },
+        timeout,
+    )
+    index = [profile_id, *cache.get(INDEX_KEY, [])]
+    cache.set(
+        INDEX_KEY,
+        index[:getattr(settings, "PROFILING_KEEP", 100)],
+        timeout,
+    )
+    return profile_id
+
+
+def get_profile(profile_id):
+    return get_profile_cache().get(PROFILE_KEY % profile_id)
+
+
+class ProfilingMiddleware:
+    """
+    Keep it after ``AuthenticationMiddleware``, which the ``?profile=``
+    flag needs to tell staff users apart.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        mode = self.get_mode(request)
+        if mode is None:
+            return self.get_response(request)
+        started = time.perf_counter()
+        if mode == "cprofile":
+            # Leave the request unprofiled while another is in cProfile.
+            if not _cprofile_lock.acquire(blocking=False):
+                return self.get_response(request)
+            try:
+                profiler = cProfile.Profile()
+                response = profiler.runcall(self.get_response, request)
+            finally:
+                _cprofile_lock.release()
+            output = format_stats(profiler)
+        else:
+            sampler = StackSampler(self.get_interval())
+            sampler.start()
+            try:
+                response = self.get_response(request)
+            finally:
+                sampler.stop()
+            output = sampler.collapsed()
+        return self.save(request, response, mode, output, started)
+
+    async def __acall__(self, request):
+        """
+        Sample the event loop's thread, keeping only this request's frames.
+        cProfile would also record every other request running on the
+        loop, so the cProfile mode falls back to sampling.
+        """
+        if "profile" in request.GET:
+            request.user = await request.auser()
+        if self.get_mode(request) is None:
+            return await self.get_response(request)
+        started = time.perf_counter()
+        sampler = StackSampler(self.get_interval())
+        sampler.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            sampler.stop()
+        return self.save(
+            request, response, "sample", sampler.collapsed(), started
+        )
+
+    @staticmethod
+    def get_interval():
+        return getattr(settings, "PROFILING_INTERVAL_MS", 5) / 1000
+
+    @staticmethod
+    def save(request, response, mode, output, started):
+        match = request.resolver_match
+        response["X-Profile-Id"] = save_profile(
+            output,
+            mode,
+            method=request.method,
+            path=request.get_full_path(),
+            view=match.view_name if match else None,
+            status=response.status_code,
+            duration_ms=round((time.perf_counter() - started) * 1000, 2),
+        )
+        return response
+
+    def get_mode(self, request):
+        if request.path.startswith(reverse("task_manager:profile-list")):
+            return None
+        flag = request.GET.get("profile")
+        user = getattr(request, "user", None)
+        if flag is not None and user is not None and user.is_staff:
+            return flag if flag in MODES else "sample"
+        token = request.headers.get("X-Profile")
+        if token:
+            try:
+                mode = signing.loads(
+                    token,
+                    salt=TOKEN_SALT,
+                    max_age=getattr(settings, "PROFILING_TOKEN_MAX_AGE", 3600),
+                )
+            except signing.BadSignature:
+                return None
+            return mode if mode in MODES else "sample"
+        rate = getattr(settings, "PROFILING_SAMPLE_RATE", 0)
+        if rate and random.random() < rate:
+            return "sample"
+        return None
+
+
+def is_staff(user):
+    return user.is_staff
+
+
+@user_passes_test(is_staff)
+def profile_list(request: HttpRequest) -> JsonResponse:
+    cache = get_profile_cache()
+    keys = [
+        PROFILE_KEY % profile_id for profile_id in cache.get(INDEX_KEY, [])
+    ]
+    profiles = cache.get_many(keys)
+    return JsonResponse(
+        {
+            "results": [
+                {
+                    **{
+                        name: value
+                        for name, value in profiles[key].items()
+                        if name != "output"
+                    },
+                    "url": reverse(
+                        "task_manager:profile-detail",
+                        args=[profiles[key]["id"]],
+                    ),
+                }
+                for key in keys
+                if key in profiles
+            ]
+        }
+    )
+
+
+@user_passes_test(is_staff)
+def profile_detail(request: HttpRequest, profile_id: str) -> HttpResponse:
+    profile = get_profile(profile_id)
+    if profile is None:
+        raise Http404("No profile found with this id.")
+    return HttpResponse(
+        profile["output"], content_type="text/plain; charset=utf-8"
+    )
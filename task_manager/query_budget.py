@@ -0,0 +1,138 @@
+"""
+Per-view limits on the number of SQL queries, to catch N+1 regressions.
+
+Views declare a budget with the ``query_budget`` decorator. In DEBUG the
+``QueryBudgetMiddleware`` fails requests that go over it, and tests use
+``QueryBudgetTestMixin.assertQueryBudget`` to also check that the count
+does not grow with the number of rows.
+"""
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class QueryBudget:
+    def __init__(self, max_queries, methods=("GET", "HEAD")):
+        self.max_queries = max_queries
+        self.methods = methods
+
+    def applies_to(self, method):
+        return method in self.methods
+
+    def check(self, view_name, queries):
+        """
+        Raise ``QueryBudgetExceeded`` if ``queries``, a list of captured
+        ``{"sql", "time"}`` dicts, is over budget.
+        """
+        if len(queries) <= self.max_queries:
+            return
+        repeated = Counter(query["sql"] for query in queries).most_common(3)
+        raise QueryBudgetExceeded(
+            "%s ran %d queries, over its budget of %d. Most repeated:\n%s"
+            % (
+                view_name,
+                len(queries),
+                self.max_queries,
+                "\n".join(
+                    "%dx %s" % (count, sql) for sql, count in repeated
+                ),
+            )
+        )
+
+
+def query_budget(max_queries, methods=("GET", "HEAD")):
+    """
+    Limit a function view or a class-based view to ``max_queries`` queries
+    per request with one of ``methods``, middleware queries included.
+    """
+
+    def decorator(view):
+        view.query_budget = QueryBudget(max_queries, methods)
+        return view
+
+    return decorator
+
+
+def get_query_budget(view_func):
+    budget = getattr(view_func, "query_budget", None)
+    if budget is None:
+        view_class = getattr(view_func, "view_class", None)
+        budget = getattr(view_class, "query_budget", None)
+    return budget
+
+
+class QueryBudgetMiddleware:
+    """
+    Count the queries of each request to a view with a budget and raise
+    ``QueryBudgetExceeded`` when it is over. Only active in DEBUG.
+    """
+
+    def __init__(self, get_response):
+        if not settings.DEBUG:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with CaptureQueriesContext(connection) as context:
+            response = self.get_response(request)
+        budget = getattr(request, "_query_budget", None)
+        if budget is not None and budget.applies_to(request.method):
+            budget.check(
+                request.resolver_match.view_name, context.captured_queries
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._query_budget = get_query_budget(view_func)
+
+
+class QueryBudgetTestMixin:
+    """
+    TestCase mixin checking a view's query count against its budget at two
+    data sizes.
+    """
+
+    def count_queries(self, url, params=None):
+        # Measure the uncached path.
+        for cache in caches.all():
+            cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def assertQueryBudget(self, url, add_rows, sizes=(2, 10), params=None):
+        """
+        Call ``add_rows(count)`` to bring the data to each of ``sizes``, then
+        request ``url``. Fails if the query count differs between sizes or
+        is over the view's budget.
+        """
+        budget = get_query_budget(resolve(url).func)
+        self.assertIsNotNone(budget, "%s has no query budget" % url)
+        counts = []
+        previous = 0
+        for size in sizes:
+            add_rows(size - previous)
+            previous = size
+            counts.append(self.count_queries(url, params))
+        self.assertEqual(
+            len(set(counts)),
+            1,
+            "Query count of %s grows with rows: %s at sizes %s"
+            % (url, counts, sizes),
+        )
+        self.assertLessEqual(
+            counts[0],
+            budget.max_queries,
+            "%s ran %d queries, over its budget of %d"
+            % (url, counts[0], budget.max_queries),
+        )
@@ -0,0 +1,184 @@
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connections, router
+from django.db.models import FloatField, Value
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from task_manager.models import Position, Task, TaskType, Worker
+
+
+SEARCH_FIELDS = {
+    Task: "name",
+    Worker: "username",
+    Position: "name",
+    TaskType: "name",
+}
+
+
+class IContainsSearchBackend:
+    """
+    The plain ``__icontains`` lookup. Used as a fallback by every backend.
+    """
+
+    def search(self, queryset, field, query):
+        return queryset.filter(**{"%s__icontains" % field: query})
+
+    def rank(self, queryset, field, query):
+        return self.search(queryset, field, query).annotate(
+            search_rank=Value(0.0, output_field=FloatField())
+        )
+
+    def index_object(self, instance):
+        pass
+
+    def index_objects(self, instances):
+        for instance in instances:
+            self.index_object(instance)
+
+    def index_values(self, model, values, using):
+        """
+        Index ``(pk, text)`` pairs of the search field of ``model`` without
+        loading instances.
+        """
+
+    def remove_object(self, instance):
+        pass
+
+
+class PostgresTrigramSearchBackend(IContainsSearchBackend):
+    """
+    Keeps the ``__icontains`` semantics, which ``pg_trgm`` GIN indexes over
+    ``UPPER(field)`` serve directly, and ranks by trigram similarity.
+    """
+
+    def rank(self, queryset, field, query):
+        from django.contrib.postgres.search import TrigramSimilarity
+
+        return self.search(queryset, field, query).annotate(
+            search_rank=TrigramSimilarity(field, query)
+        )
+
+
+class SQLiteFTSSearchBackend(IContainsSearchBackend):
+    """
+    Matches against FTS5 trigram tables named ``<db_table>_fts``, which are
+    kept in sync by the signals in ``task_manager.signals``.
+    Queries shorter than a trigram fall back to ``__icontains``.
+    """
+
+    min_query_length = 3
+
+    @staticmethod
+    def get_fts_table(model):
+        return "%s_fts" % model._meta.db_table
+
+    @staticmethod
+    def get_match_query(query):
+        return '"%s"' % query.replace('"', '""')
+
+    def search(self, queryset, field, query):
+        if len(query) < self.min_query_length:
+            return super().search(queryset, field, query)
+        table = self.get_fts_table(queryset.model)
+        return queryset.filter(
+            pk__in=RawSQL(
+                "SELECT rowid FROM %s WHERE %s MATCH %%s" % (table, table),
+                [self.get_match_query(query)],
+            )
+        )
+
+    def rank(self, queryset, field, query):
+        if len(query) < self.min_query_length:
+            return super().rank(queryset, field, query)
+        table = self.get_fts_table(queryset.model)
+        rank_sql = (
+            "SELECT -bm25({fts}) FROM {fts} "
+            "WHERE {fts} MATCH %s AND rowid = {table}.{pk}"
+        ).format(
+            fts=table,
+            table=queryset.model._meta.db_table,
+            pk=queryset.model._meta.pk.column,
+        )
+        return self.search(queryset, field, query).annotate(
+            search_rank=RawSQL(
+                rank_sql,
+                [self.get_match_query(query)],
+                output_field=FloatField(),
+            )
+        )
+
+    def index_object(self, instance):
+        field = SEARCH_FIELDS[type(instance)]
+        with self._cursor(instance) as cursor:
+            cursor.execute(
+                "INSERT OR REPLACE INTO %s (rowid, %s) VALUES (%%s, %%s)"
+                % (self.get_fts_table(instance), field),
+                [instance.pk, getattr(instance, field)],
+            )
+
+    def index_objects(self, instances):
+        if not instances:
+            return
+        model = type(instances[0])
+        field = SEARCH_FIELDS[model]
+        self.index_values(
+            model,
+            [
+                (instance.pk, getattr(instance, field))
+                for instance in instances
+            ],
+            router.db_for_write(model, instance=instances[0]),
+        )
+
+    def index_values(self, model, values, using):
+        with connections[using].cursor() as cursor:
+            cursor.executemany(
+                "INSERT OR REPLACE INTO %s (rowid, %s) VALUES (%%s, %%s)"
+                % (self.get_fts_table(model), SEARCH_FIELDS[model]),
+                values,
+            )
+
+    def remove_object(self, instance):
+        with self._cursor(instance) as cursor:
+            cursor.execute(
+                "DELETE FROM %s WHERE rowid = %%s"
+                % self.get_fts_table(instance),
+                [instance.pk],
+            )
+
+    @staticmethod
+    def _cursor(instance):
+        alias = router.db_for_write(type(instance), instance=instance)
+        return connections[alias].cursor()
+
+
+@lru_cache(maxsize=None)
+def get_search_backend(alias="default"):
+    backend_path = getattr(settings, "TASK_MANAGER_SEARCH_BACKEND", None)
+    if backend_path:
+        return import_string(backend_path)()
+
+    connection = connections[alias]
+    if connection.vendor == "postgresql":
+        return PostgresTrigramSearchBackend()
+    if connection.vendor == "sqlite":
+        fts_table = SQLiteFTSSearchBackend.get_fts_table(Task)
+        if fts_table in connection.introspection.table_names():
+            return SQLiteFTSSearchBackend()
+    return IContainsSearchBackend()
+
+
+def search(queryset, query, ranked=False):
+    field = SEARCH_FIELDS[queryset.model]
+    if not query:
+        if ranked:
+            return queryset.annotate(
+                search_rank=Value(0.0, output_field=FloatField())
+            )
+        return queryset
+    backend = get_search_backend(queryset.db)
+    if ranked:
+        return backend.rank(queryset, field, query)
+    return backend.search(queryset, field, query)
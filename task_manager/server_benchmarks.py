@@ -0,0 +1,184 @@
+"""
+Throughput of the app behind real servers, gunicorn over WSGI and uvicorn
+over ASGI with the sync or the async views, run by the
+``benchmark_servers`` management command.
+"""
+import asyncio
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+from task_manager.benchmarks import percentile
+
+
+HOST = "127.0.0.1"
+
+SERVERS = ("wsgi", "asgi", "asgi-async")
+
+
+def get_server_command(server, port, workers, threads):
+    if server == "wsgi":
+        return [
+            sys.executable, "-m", "gunicorn",
+            "it_company_task_manager.wsgi",
+            "--bind", "%s:%d" % (HOST, port),
+            "--workers", str(workers),
+            "--threads", str(threads),
+            "--log-level", "warning",
+        ]
+    return [
+        sys.executable, "-m", "uvicorn",
+        "it_company_task_manager.asgi:application",
+        "--host", HOST,
+        "--port", str(port),
+        "--workers", str(workers),
+        "--log-level", "warning",
+        "--no-access-log",
+    ]
+
+
+def get_server_env(server, env):
+    return {
+        **env,
+        "ASYNC_VIEWS": str(server == "asgi-async"),
+        "DEBUG": "False",
+        "PERFORMANCE_LOG_LEVEL": "ERROR",
+    }
+
+
+def get_free_port():
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_server(process, port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(
+                "The server exited with code %d" % process.returncode
+            )
+        try:
+            with socket.create_connection((HOST, port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("The server did not start in %d seconds" % timeout)
+
+
+def start_server(server, env, workers, threads, cwd):
+    port = get_free_port()
+    process = subprocess.Popen(
+        get_server_command(server, port, workers, threads),
+        env=get_server_env(server, env),
+        cwd=cwd,
+    )
+    try:
+        wait_for_server(process, port)
+    except RuntimeError:
+        stop_server(process)
+        raise
+    return process, port
+
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+async def fetch(reader, writer, path, headers):
+    """
+    Send a GET over an open HTTP/1.1 connection and read the whole
+    response. Return its status, body size and whether the connection
+    stays open.
+    """
+    request = "GET %s HTTP/1.1\r\nHost: %s\r\n" % (path, HOST)
+    for name, value in headers.items():
+        request += "%s: %s\r\n" % (name, value)
+    writer.write((request + "\r\n").encode("latin-1"))
+    await writer.drain()
+
+    head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+    status_line, *header_lines = head.split("\r\n")
+    status = int(status_line.split()[1])
+    fields = {}
+    for line in header_lines:
+        if line:
+            name, _, value = line.partition(":")
+            fields[name.strip().lower()] = value.strip().lower()
+
+    keep_alive = fields.get("connection") != "close"
+    if fields.get("transfer-encoding") == "chunked":
+        size = 0
+        while True:
+            chunk_size = int((await reader.readline()).split(b";")[0], 16)
+            # The chunk and its CRLF; the last chunk is empty.
+            await reader.readexactly(chunk_size + 2)
+            size += chunk_size
+            if not chunk_size:
+                break
+    elif "content-length" in fields:
+        size = len(await reader.readexactly(int(fields["content-length"])))
+    else:
+        size = len(await reader.read())
+        keep_alive = False
+    return status, size, keep_alive
+
+
+async def run_load(port, paths, concurrency, duration, headers=None):
+    """
+    Request ``paths`` in turn over ``concurrency`` keep-alive connections
+    for ``duration`` seconds. Responses other than 200 and broken
+    connections count as errors.
+    """
+    headers = headers or {}
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def connection(offset):
+        nonlocal errors
+        writer = None
+        index = offset
+        while time.perf_counter() < deadline:
+            path = paths[index % len(paths)]
+            index += 1
+            started = time.perf_counter()
+            try:
+                if writer is None:
+                    reader, writer = await asyncio.open_connection(
+                        HOST, port
+                    )
+                status, size, keep_alive = await fetch(
+                    reader, writer, path, headers
+                )
+            except (OSError, ValueError, asyncio.IncompleteReadError):
+                errors += 1
+                status, keep_alive = None, False
+            if status == 200:
+                latencies.append((time.perf_counter() - started) * 1000)
+            elif status is not None:
+                errors += 1
+            if not keep_alive and writer is not None:
+                writer.close()
+                writer = None
+        if writer is not None:
+            writer.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(connection(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies), 2) if latencies else 0,
+        "p95_ms": round(percentile(latencies, 95), 2) if latencies else 0,
+    }
@@ -0,0 +1,227 @@
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import Signal, receiver
+
+from task_manager.aggregates import (
+    delete_rollup,
+    refresh_rollups,
+    rollups_enabled,
+)
+from task_manager.counters import invalidate_dashboard_counts
+from task_manager.models import (
+    Position,
+    Task,
+    TaskCountRollup,
+    TaskType,
+    Worker,
+)
+from task_manager.search import get_search_backend
+from task_manager.view_cache import bump_model_version
+
+
+# Sent after bulk_create/bulk_update, which skip the model signals.
+# Arguments: sender (model), instances, created, using.
+bulk_saved = Signal()
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Worker)
+@receiver(post_save, sender=Position)
+@receiver(post_save, sender=TaskType)
+def update_search_index(sender, instance, using, **kwargs):
+    get_search_backend(using).index_object(instance)
+
+
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Worker)
+@receiver(post_delete, sender=Position)
+@receiver(post_delete, sender=TaskType)
+def remove_from_search_index(sender, instance, using, **kwargs):
+    get_search_backend(using).remove_object(instance)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Worker)
+@receiver(post_save, sender=Position)
+@receiver(post_save, sender=TaskType)
+def invalidate_counts_on_create(sender, created, using, **kwargs):
+    if created:
+        invalidate_dashboard_counts(using)
+
+
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Worker)
+@receiver(post_delete, sender=Position)
+@receiver(post_delete, sender=TaskType)
+def invalidate_counts_on_delete(sender, using, **kwargs):
+    invalidate_dashboard_counts(using)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Worker)
+@receiver(post_save, sender=Position)
+@receiver(post_save, sender=TaskType)
+def bump_version_on_save(sender, using, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) == {"last_login"}:
+        return
+    bump_model_version(sender, using)
+
+
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Worker)
+@receiver(post_delete, sender=Position)
+@receiver(post_delete, sender=TaskType)
+def bump_version_on_delete(sender, using, **kwargs):
+    bump_model_version(sender, using)
+
+
+@receiver(m2m_changed, sender=Task.assignees.through)
+def bump_version_on_assignment(sender, action, using, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        bump_model_version(Task, using)
+
+
+@receiver(bulk_saved)
+def update_search_index_in_bulk(sender, instances, using, **kwargs):
+    get_search_backend(using).index_objects(instances)
+
+
+@receiver(bulk_saved)
+def invalidate_counts_on_bulk_create(sender, created, using, **kwargs):
+    if created:
+        invalidate_dashboard_counts(using)
+
+
+@receiver(bulk_saved)
+def bump_version_on_bulk_save(sender, using, **kwargs):
+    bump_model_version(sender, using)
+
+
+ROLLUP_PARENTS = {
+    Task: ("task_type_id", TaskCountRollup.TASK_TYPE),
+    Worker: ("position_id", TaskCountRollup.POSITION),
+}
+
+
+@receiver(pre_save, sender=Task)
+@receiver(pre_save, sender=Worker)
+def remember_rollup_parent(sender, instance, update_fields=None, **kwargs):
+    field, kind = ROLLUP_PARENTS[sender]
+    if not rollups_enabled() or instance.pk is None:
+        return
+    if update_fields is not None and not {field, field[:-3]} & set(
+        update_fields
+    ):
+        return
+    instance._rollup_parent = sender._default_manager.filter(
+        pk=instance.pk
+    ).values_list(field, flat=True).first()
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Worker)
+def refresh_rollups_on_save(
+    sender, instance, created, update_fields=None, **kwargs
+):
+    if not rollups_enabled():
+        return
+    field, kind = ROLLUP_PARENTS[sender]
+    new_parent = getattr(instance, field)
+    if created:
+        refresh_rollups(kind, {new_parent})
+    elif "_rollup_parent" in instance.__dict__:
+        old_parent = instance.__dict__.pop("_rollup_parent")
+        if old_parent != new_parent:
+            refresh_rollups(kind, {old_parent, new_parent})
+    if sender is Task and not created and (
+        update_fields is None or "is_completed" in update_fields
+    ):
+        refresh_rollups(
+            TaskCountRollup.WORKER,
+            instance.assignees.values_list("pk", flat=True),
+        )
+    if sender is Worker and created:
+        refresh_rollups(TaskCountRollup.WORKER, {instance.pk})
+
+
+@receiver(pre_delete, sender=Task)
+def remember_rollup_assignees(sender, instance, **kwargs):
+    if rollups_enabled():
+        instance._rollup_assignees = set(
+            instance.assignees.values_list("pk", flat=True)
+        )
+
+
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Worker)
+@receiver(post_delete, sender=Position)
+@receiver(post_delete, sender=TaskType)
+def refresh_rollups_on_delete(sender, instance, **kwargs):
+    if not rollups_enabled():
+        return
+    if sender in ROLLUP_PARENTS:
+        field, kind = ROLLUP_PARENTS[sender]
+        refresh_rollups(kind, {getattr(instance, field)})
+    if sender is Task:
+        refresh_rollups(
+            TaskCountRollup.WORKER,
+            instance.__dict__.pop("_rollup_assignees", ()),
+        )
+    else:
+        kind = {
+            Worker: TaskCountRollup.WORKER,
+            Position: TaskCountRollup.POSITION,
+            TaskType: TaskCountRollup.TASK_TYPE,
+        }[sender]
+        delete_rollup(kind, instance.pk)
+
+
+@receiver(m2m_changed, sender=Task.assignees.through)
+def refresh_rollups_on_assignment(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if not rollups_enabled():
+        return
+    if reverse:
+        workers = {instance.pk}
+    elif action == "pre_clear":
+        instance._rollup_assignees = set(
+            instance.assignees.values_list("pk", flat=True)
+        )
+        return
+    elif action == "post_clear":
+        workers = instance.__dict__.pop("_rollup_assignees", ())
+    else:
+        workers = pk_set or ()
+    if action in ("post_add", "post_remove", "post_clear"):
+        refresh_rollups(TaskCountRollup.WORKER, workers)
+
+
+@receiver(bulk_saved, sender=Task)
+@receiver(bulk_saved, sender=Worker)
+def refresh_rollups_on_bulk_save(sender, instances, **kwargs):
+    if not rollups_enabled():
+        return
+    # The previous parents are unknown here, so refresh all of them; both
+    # are small lookup tables.
+    field, kind = ROLLUP_PARENTS[sender]
+    parent_model = TaskType if sender is Task else Position
+    refresh_rollups(
+        kind, parent_model._default_manager.values_list("pk", flat=True)
+    )
+    if sender is Task:
+        refresh_rollups(
+            TaskCountRollup.WORKER,
+            Task.assignees.through.objects.filter(
+                task__in=instances
+            ).values_list("worker", flat=True),
+        )
+    else:
+        refresh_rollups(
+            TaskCountRollup.WORKER, [instance.pk for instance in instances]
+        )
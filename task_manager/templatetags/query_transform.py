@@ -1,5 +1,7 @@
 from django import template
 
+from task_manager.pagination import CURSOR_VAR
+
 register = template.Library()
 
 
@@ -13,3 +15,21 @@ def query_transform(request, **kwargs):
             updated.pop(key, 0)
 
     return updated.urlencode()
+
+
+@register.simple_tag
+def page_transform(request, page_obj, direction):
+    if getattr(page_obj, "is_cursor", False):
+        cursor = (
+            page_obj.next_cursor
+            if direction == "next"
+            else page_obj.previous_cursor
+        )
+        return query_transform(request, **{CURSOR_VAR: cursor, "page": None})
+
+    number = (
+        page_obj.next_page_number()
+        if direction == "next"
+        else page_obj.previous_page_number()
+    )
+    return query_transform(request, page=number, **{CURSOR_VAR: None})
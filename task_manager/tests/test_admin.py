@@ -1,7 +1,12 @@
-from django.test import TestCase
+from unittest import mock
+
+from django.contrib import admin
+from django.test import RequestFactory, TestCase
 from django.contrib.auth import get_user_model
 from django.urls import reverse
+from prometheus_client import REGISTRY
 
+from task_manager import utils
 from task_manager.models import Task, TaskType, Position
 
 
@@ -86,3 +91,86 @@ class AdminPanelTest(TestCase):
         )
         res = self.client.get(url)
         self.assertContains(res, self.worker.position)
+
+
+class AdminMenuTest(TestCase):
+
+    def setUp(self) -> None:
+        utils.clear_menu_cache()
+        self.admin_user = get_user_model().objects.create_superuser(
+            username="admin",
+            password="admin123",
+        )
+
+    def get_menu(self, url) -> list:
+        request = RequestFactory().get(url)
+        request.user = self.admin_user
+        return utils.get_menu_items({"request": request})
+
+    def current_models(self, app_list) -> list:
+        return [
+            model["name"]
+            for app in app_list
+            for model in app["items"]
+            if model.get("current")
+        ]
+
+    def test_menu_is_built_once_per_permission_scope(self) -> None:
+        with mock.patch(
+            "task_manager.utils.build_menu_items",
+            wraps=utils.build_menu_items,
+        ) as build:
+            self.get_menu(reverse("admin:task_manager_task_changelist"))
+            self.get_menu(reverse("admin:task_manager_position_changelist"))
+        self.assertEqual(build.call_count, 1)
+
+    def test_current_flag_follows_request_path(self) -> None:
+        task_menu = self.get_menu(
+            reverse("admin:task_manager_task_changelist")
+        )
+        position_menu = self.get_menu(
+            reverse("admin:task_manager_position_changelist")
+        )
+        self.assertEqual(self.current_models(task_menu), ["task"])
+        self.assertEqual(self.current_models(position_menu), ["position"])
+
+
+class AdminSiteResolutionTest(TestCase):
+
+    def test_admin_site_resolved_once_per_request(self) -> None:
+        request = RequestFactory().get(
+            reverse("admin:task_manager_task_changelist")
+        )
+        with mock.patch(
+            "task_manager.utils.resolve",
+            wraps=utils.resolve,
+        ) as resolve:
+            for _ in range(3):
+                self.assertEqual(
+                    utils.get_admin_site({"request": request}).name,
+                    admin.site.name,
+                )
+        self.assertLessEqual(resolve.call_count, 2)
+
+    @staticmethod
+    def lookups(result) -> float:
+        return REGISTRY.get_sample_value(
+            "task_manager_admin_site_lookups_total", {"result": result}
+        ) or 0
+
+    def test_unresolvable_path_counts_a_miss(self) -> None:
+        before = self.lookups("miss")
+        request = RequestFactory().get("/no/such/page/")
+        self.assertIs(utils.get_admin_site({"request": request}), admin.site)
+        self.assertEqual(self.lookups("miss"), before + 1)
+
+    def test_first_lookup_of_a_namespace_counts_a_miss(self) -> None:
+        request = RequestFactory().get(
+            reverse("admin:task_manager_task_changelist")
+        )
+        misses, hits = self.lookups("miss"), self.lookups("hit")
+        with mock.patch.dict(utils._admin_sites_by_namespace, clear=True):
+            utils.resolve_admin_site(request)
+            utils.resolve_admin_site(request)
+        self.assertEqual(self.lookups("miss"), misses + 1)
+        self.assertEqual(self.lookups("hit"), hits + 1)
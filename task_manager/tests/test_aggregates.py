@@ -0,0 +1,157 @@
+import datetime
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from task_manager.aggregates import (
+    WORKER_TASK_COUNTS,
+    count_position_workers,
+    count_task_type_tasks,
+    count_worker_tasks,
+)
+from task_manager.models import Position, Task, TaskCountRollup, TaskType
+from task_manager.views import PageCountsMixin
+
+
+WORKER_LIST_URL = reverse("task_manager:worker-list")
+POSITION_LIST_URL = reverse("task_manager:position-list")
+TASK_TYPE_LIST_URL = reverse("task_manager:task_type-list")
+
+
+class AggregateCountsTest(TestCase):
+
+    def setUp(self) -> None:
+        self.position = Position.objects.create(name="Developer")
+        self.task_type = TaskType.objects.create(name="Bug")
+        self.user = get_user_model().objects.create_user(
+            username="test.user",
+            password="1qazcde3",
+            position=self.position,
+        )
+        self.other = get_user_model().objects.create_user(
+            username="other.user",
+            password="1qazcde3",
+        )
+        self.client.force_login(self.user)
+        today = timezone.localdate()
+        self.tasks = []
+        for index, (deadline, is_completed) in enumerate(
+            [
+                (today - datetime.timedelta(days=1), False),
+                (today - datetime.timedelta(days=1), True),
+                (today + datetime.timedelta(days=1), False),
+            ]
+        ):
+            task = Task.objects.create(
+                name=f"Task {index}",
+                description="Test description",
+                deadline=deadline,
+                is_completed=is_completed,
+                priority=Task.PRIORITY_CHOICES["LOW"],
+                task_type=self.task_type,
+            )
+            task.assignees.add(self.user)
+            self.tasks.append(task)
+
+    def assert_counts(self) -> None:
+        self.assertEqual(
+            count_worker_tasks([self.user.id, self.other.id]).get(
+                self.user.id
+            ),
+            {"total": 3, "open": 2, "overdue": 1},
+        )
+        self.assertEqual(
+            count_worker_tasks([self.other.id]).get(
+                self.other.id, WORKER_TASK_COUNTS
+            ),
+            WORKER_TASK_COUNTS,
+        )
+        self.assertEqual(
+            count_position_workers([self.position.id]),
+            {self.position.id: 1},
+        )
+        self.assertEqual(
+            count_task_type_tasks([self.task_type.id]),
+            {self.task_type.id: 3},
+        )
+
+    def test_live_counts(self) -> None:
+        self.assert_counts()
+
+    def test_list_pages_count_with_one_query(self) -> None:
+        for url, expected in (
+            (WORKER_LIST_URL, "overdue: 1"),
+            (POSITION_LIST_URL, "Workers: 1"),
+            (TASK_TYPE_LIST_URL, "Tasks: 3"),
+        ):
+            with self.subTest(url):
+                # session, user, page, counts
+                with self.assertNumQueries(4):
+                    response = self.client.get(url)
+                self.assertContains(response, expected)
+
+    @override_settings(TASK_COUNT_ROLLUPS=True)
+    def test_rollups_follow_changes(self) -> None:
+        call_command("rebuild_task_counts", stdout=StringIO())
+        self.assert_counts()
+
+        self.tasks[2].is_completed = True
+        self.tasks[2].save()
+        self.assertEqual(
+            count_worker_tasks([self.user.id])[self.user.id]["open"], 1
+        )
+        self.tasks[2].assignees.remove(self.user)
+        self.assertEqual(
+            count_worker_tasks([self.user.id])[self.user.id]["total"], 2
+        )
+        self.user.tasks.clear()
+        self.assertEqual(
+            count_worker_tasks([self.user.id])[self.user.id]["total"], 0
+        )
+
+        other_type = TaskType.objects.create(name="Feature")
+        self.tasks[0].task_type = other_type
+        self.tasks[0].save()
+        self.assertEqual(
+            count_task_type_tasks([self.task_type.id, other_type.id]),
+            {self.task_type.id: 2, other_type.id: 1},
+        )
+        self.tasks[1].delete()
+        self.assertEqual(
+            count_task_type_tasks([self.task_type.id]),
+            {self.task_type.id: 1},
+        )
+
+        self.other.position = self.position
+        self.other.save()
+        self.assertEqual(
+            count_position_workers([self.position.id]),
+            {self.position.id: 2},
+        )
+        self.other.delete()
+        self.assertEqual(
+            count_position_workers([self.position.id]),
+            {self.position.id: 1},
+        )
+        self.assertFalse(
+            TaskCountRollup.objects.filter(
+                kind=TaskCountRollup.WORKER, object_id=self.other.id
+            ).exists()
+        )
+
+    def test_page_counts_default(self) -> None:
+        view = PageCountsMixin()
+        view.model = TaskType
+        other = TaskType.objects.create(name="Feature")
+        with self.assertRaises(ImproperlyConfigured):
+            view.count_objects([self.task_type.id])
+        view.counts_relation = "task"
+        self.assertEqual(
+            view.count_objects([self.task_type.id, other.id]),
+            {self.task_type.id: 3, other.id: 0},
+        )
@@ -0,0 +1,255 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from task_manager.models import Position, Task, TaskType
+
+
+API_TASK_LIST_URL = reverse("task_manager:api-task-list")
+API_WORKER_LIST_URL = reverse("task_manager:api-worker-list")
+API_POSITION_LIST_URL = reverse("task_manager:api-position-list")
+
+
+class PublicApiTest(TestCase):
+
+    def test_login_required(self) -> None:
+        response = self.client.get(API_TASK_LIST_URL)
+        self.assertEqual(response.status_code, 401)
+        self.assertIn("detail", response.json())
+
+
+class PrivateApiTest(TestCase):
+
+    def setUp(self) -> None:
+        self.position = Position.objects.create(name="Developer")
+        self.user = get_user_model().objects.create_user(
+            username="test.user",
+            password="1qazcde3",
+            position=self.position,
+        )
+        self.client.force_login(self.user)
+        self.task_type = TaskType.objects.create(name="Bug")
+        for index in range(5):
+            task = Task.objects.create(
+                name=f"Task {index}",
+                description="Test description",
+                deadline="2024-09-09",
+                priority=Task.PRIORITY_CHOICES["LOW"],
+                task_type=self.task_type,
+            )
+            task.assignees.add(self.user)
+
+    def send_json(self, method, url, data):
+        return getattr(self.client, method)(
+            url,
+            json.dumps(data),
+            content_type="application/json",
+        )
+
+    def test_list_is_cursor_paginated(self) -> None:
+        response = self.client.get(API_TASK_LIST_URL, {"limit": 2})
+        data = response.json()
+        self.assertEqual(len(data["results"]), 2)
+        self.assertIsNone(data["previous"])
+
+        names = [task["name"] for task in data["results"]]
+        while data["next"]:
+            data = self.client.get(data["next"]).json()
+            names += [task["name"] for task in data["results"]]
+        self.assertEqual(names, [f"Task {index}" for index in range(5)])
+
+    def test_list_query_count_is_constant(self) -> None:
+        # session, user, tasks with task types, assignees
+        with self.assertNumQueries(4):
+            response = self.client.get(API_TASK_LIST_URL)
+        task = response.json()["results"][0]
+        self.assertEqual(
+            task["task_type"],
+            {"id": self.task_type.id, "name": "Bug"},
+        )
+        self.assertEqual(task["assignees"], [self.user.id])
+
+    def test_sparse_fieldsets(self) -> None:
+        response = self.client.get(API_TASK_LIST_URL, {"fields": "name"})
+        self.assertEqual(
+            set(response.json()["results"][0]),
+            {"id", "name"},
+        )
+        response = self.client.get(API_TASK_LIST_URL, {"fields": "secret"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_filter_and_search(self) -> None:
+        Task.objects.filter(name="Task 3").update(is_completed=True)
+        response = self.client.get(
+            API_TASK_LIST_URL, {"is_completed": "True"}
+        )
+        self.assertEqual(
+            [task["name"] for task in response.json()["results"]],
+            ["Task 3"],
+        )
+        response = self.client.get(API_TASK_LIST_URL, {"search": "task 4"})
+        self.assertEqual(
+            [task["name"] for task in response.json()["results"]],
+            ["Task 4"],
+        )
+
+    def test_invalid_filter_value(self) -> None:
+        for params in [
+            {"priority": "URGENT"},
+            {"is_completed": "maybe"},
+            {"task_type": "x"},
+        ]:
+            with self.subTest(params):
+                response = self.client.get(API_TASK_LIST_URL, params)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(set(response.json()["errors"]), set(params))
+
+    def test_invalid_cursor(self) -> None:
+        response = self.client.get(API_TASK_LIST_URL, {"cursor": "bogus"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_detail(self) -> None:
+        task = Task.objects.first()
+        url = reverse("task_manager:api-task-detail", args=[task.id])
+        response = self.client.get(url)
+        self.assertEqual(response.json()["name"], task.name)
+        url = reverse("task_manager:api-task-detail", args=[0])
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_bulk_create(self) -> None:
+        objects = [
+            {
+                "name": f"New task {index}",
+                "description": "Created in bulk",
+                "deadline": "2024-10-01",
+                "priority": Task.Priority.HIGHT,
+                "task_type": self.task_type.id,
+                "assignees": [self.user.id],
+            }
+            for index in range(50)
+        ]
+        response = self.send_json("post", API_TASK_LIST_URL, objects)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.json()["results"]), 50)
+        created = Task.objects.filter(description="Created in bulk")
+        self.assertEqual(created.count(), 50)
+        self.assertEqual(
+            Task.assignees.through.objects.filter(task__in=created).count(),
+            50,
+        )
+
+    def test_bulk_create_is_atomic(self) -> None:
+        objects = [
+            {
+                "name": "Valid",
+                "description": "Test",
+                "deadline": "2024-10-01",
+                "priority": Task.Priority.LOW,
+            },
+            {
+                "name": "Invalid",
+                "description": "Test",
+                "deadline": "not a date",
+                "priority": Task.Priority.LOW,
+                "assignees": [0],
+            },
+        ]
+        response = self.send_json("post", API_TASK_LIST_URL, objects)
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()["errors"]
+        self.assertEqual(set(errors), {"1"})
+        self.assertIn("deadline", errors["1"])
+        self.assertIn("assignees", errors["1"])
+        self.assertFalse(Task.objects.filter(name="Valid").exists())
+
+    def test_bulk_create_with_malformed_references(self) -> None:
+        objects = [
+            {
+                "name": "x",
+                "deadline": "2030-01-01",
+                "priority": 1,
+                "task_type": {"a": 1},
+            },
+            {
+                "name": "y",
+                "deadline": "2030-01-01",
+                "priority": 1,
+                "task_type": self.task_type.id,
+                "assignees": [[self.user.id], {"id": self.user.id}],
+            },
+        ]
+        response = self.send_json("post", API_TASK_LIST_URL, objects)
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()["errors"]
+        self.assertEqual(errors["0"]["task_type"], ["Expected an id."])
+        self.assertEqual(
+            errors["1"]["assignees"], ["Expected a list of ids."]
+        )
+
+        response = self.send_json(
+            "patch", API_TASK_LIST_URL, [{"id": [1], "name": "z"}]
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_bulk_update(self) -> None:
+        tasks = list(Task.objects.order_by("id")[:2])
+        response = self.send_json(
+            "patch",
+            API_TASK_LIST_URL,
+            [
+                {"id": tasks[0].id, "is_completed": True},
+                {"id": tasks[1].id, "assignees": []},
+            ],
+        )
+        self.assertEqual(response.status_code, 200)
+        tasks[0].refresh_from_db()
+        self.assertTrue(tasks[0].is_completed)
+        self.assertFalse(tasks[1].assignees.exists())
+
+    def test_bulk_update_with_string_ids(self) -> None:
+        task = Task.objects.order_by("id").first()
+        other_type = TaskType.objects.create(name="Feature")
+        response = self.send_json(
+            "patch",
+            API_TASK_LIST_URL,
+            [
+                {
+                    "id": str(task.id),
+                    "task_type": str(other_type.id),
+                    "assignees": [str(self.user.id)],
+                },
+            ],
+        )
+        self.assertEqual(response.status_code, 200)
+        task.refresh_from_db()
+        self.assertEqual(task.task_type, other_type)
+        self.assertEqual(list(task.assignees.all()), [self.user])
+
+        response = self.send_json(
+            "patch", API_TASK_LIST_URL, [{"id": "abc", "name": "z"}]
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_bulk_delete(self) -> None:
+        ids = list(Task.objects.values_list("id", flat=True)[:3])
+        response = self.send_json(
+            "delete", API_TASK_LIST_URL, {"ids": ids}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Task.objects.count(), 2)
+
+    def test_invalid_json(self) -> None:
+        response = self.client.post(
+            API_POSITION_LIST_URL,
+            "{",
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_workers_cannot_be_created_through_the_api(self) -> None:
+        response = self.send_json(
+            "post", API_WORKER_LIST_URL, [{"first_name": "New"}]
+        )
+        self.assertEqual(response.status_code, 405)
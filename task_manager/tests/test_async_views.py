@@ -0,0 +1,210 @@
+import json
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import include, path, resolve, reverse
+
+from task_manager.models import Task, TaskType
+from task_manager.search import get_search_backend
+
+
+urlpatterns = [
+    path(
+        "",
+        include("task_manager.async_urls", namespace="task_manager"),
+    ),
+    path("accounts/", include("django.contrib.auth.urls")),
+]
+
+SYNC_URLCONF = "it_company_task_manager.urls"
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncViewTest(TestCase):
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="test.user",
+            password="1qazcde3",
+        )
+        self.task_type = TaskType.objects.create(name="Bug")
+        self.tasks = Task.objects.bulk_create(
+            Task(
+                name="Task %d" % index,
+                description="Test description",
+                deadline="2024-06-01",
+                priority=Task.Priority.LOW,
+                task_type=self.task_type,
+            )
+            for index in range(8)
+        )
+        self.tasks[0].assignees.add(self.user)
+        self.client.force_login(self.user)
+        self.async_client.force_login(self.user)
+        cache.clear()
+
+    def get(self, url, params=None, **kwargs):
+        return async_to_sync(self.async_client.get)(url, params, **kwargs)
+
+    def get_sync(self, url, params=None):
+        with override_settings(ROOT_URLCONF=SYNC_URLCONF):
+            return self.client.get(url, params)
+
+    def test_views_are_async(self) -> None:
+        for url in (
+            reverse("task_manager:index"),
+            reverse("task_manager:task-list"),
+            reverse("task_manager:task-detail", args=[self.tasks[0].id]),
+            reverse("task_manager:worker-autocomplete"),
+            reverse("task_manager:api-task-list"),
+            reverse("task_manager:api-worker-detail", args=[self.user.id]),
+        ):
+            view = resolve(url).func
+            self.assertTrue(
+                iscoroutinefunction(view)
+                or getattr(view, "view_is_async", False),
+                url,
+            )
+
+    def test_index(self) -> None:
+        response = self.get(reverse("task_manager:index"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["num_tasks"], 8)
+        self.assertEqual(response.context["num_visits"], 1)
+
+    def test_task_list_matches_sync_view(self) -> None:
+        url = reverse("task_manager:task-list")
+        for params in (
+            {"count": 1},
+            {"assignee": self.user.id, "order": "name"},
+            {"task_type": self.task_type.id, "order": "-deadline"},
+        ):
+            response = self.get(url, params)
+            expected = self.get_sync(url, params)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(
+                list(response.context["task_list"]),
+                list(expected.context["task_list"]),
+            )
+            self.assertEqual(
+                response.context["facets"], expected.context["facets"]
+            )
+        self.assertEqual(response.context["page_obj"].has_next(), True)
+
+        response = self.get(url, {"count": 1})
+        self.assertEqual(response.context["total_count"], 8)
+        next_page = self.get(
+            url, {"cursor": response.context["page_obj"].next_cursor}
+        )
+        self.assertEqual(len(next_page.context["task_list"]), 2)
+
+    def test_task_detail(self) -> None:
+        task = self.tasks[0]
+        response = self.get(
+            reverse("task_manager:task-detail", args=[task.id])
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["task"], task)
+        self.assertTrue(response.context["task"].is_assigned)
+        self.assertEqual(
+            list(response.context["task"].assignees.all()), [self.user]
+        )
+
+        response = self.get(reverse("task_manager:task-detail", args=[0]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_json_endpoints_match_sync_views(self) -> None:
+        for url, params in (
+            (reverse("task_manager:api-task-list"), {"limit": 3}),
+            (
+                reverse("task_manager:api-task-list"),
+                {
+                    "fields": "name,assignees",
+                    "priority": int(Task.Priority.LOW),
+                },
+            ),
+            (
+                reverse(
+                    "task_manager:api-task-detail", args=[self.tasks[0].id]
+                ),
+                None,
+            ),
+            (reverse("task_manager:worker-autocomplete"), {"q": "test"}),
+        ):
+            response = self.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(
+                response.json(), self.get_sync(url, params).json()
+            )
+
+        response = self.get(
+            reverse("task_manager:api-task-list"), {"cursor": "invalid"}
+        )
+        self.assertEqual(response.status_code, 400)
+        response = self.get(
+            reverse("task_manager:api-task-list"), {"priority": "URGENT"}
+        )
+        self.assertEqual(response.status_code, 400)
+        response = self.get(reverse("task_manager:api-task-detail", args=[0]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_search_backend_lookup(self) -> None:
+        for url in (
+            reverse("task_manager:worker-autocomplete"),
+            reverse("task_manager:api-task-list"),
+        ):
+            get_search_backend.cache_clear()
+            response = self.get(url, {"q": "test", "search": "task"})
+            self.assertEqual(response.status_code, 200)
+
+    def test_api_writes(self) -> None:
+        url = reverse("task_manager:api-task-list")
+        post = async_to_sync(self.async_client.post)
+        response = post(
+            url,
+            json.dumps([{
+                "name": "Created",
+                "description": "Test description",
+                "deadline": "2024-06-01",
+                "priority": Task.Priority.HIGHT,
+                "task_type": self.task_type.id,
+            }]),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 201)
+        task_id = response.json()["results"][0]["id"]
+
+        response = async_to_sync(self.async_client.delete)(
+            url,
+            json.dumps({"ids": [task_id]}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.json(), {"deleted": 1})
+
+        response = post(
+            reverse("task_manager:api-worker-list"),
+            json.dumps([{"username": "new.worker"}]),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 405)
+
+    def test_login_required(self) -> None:
+        async_to_sync(self.async_client.alogout)()
+        for url in (
+            reverse("task_manager:index"),
+            reverse("task_manager:task-list"),
+            reverse("task_manager:task-detail", args=[self.tasks[0].id]),
+        ):
+            response = self.get(url)
+            self.assertEqual(response.status_code, 302)
+            self.assertTrue(response.url.startswith(reverse("login")))
+        response = self.get(reverse("task_manager:api-task-list"))
+        self.assertEqual(response.status_code, 401)
+
+    def test_middleware_runs_async(self) -> None:
+        response = self.get(reverse("task_manager:task-list"))
+        self.assertRegex(
+            response["Server-Timing"], r'db;dur=[\d.]+;desc="[1-9]\d* queries"'
+        )
@@ -0,0 +1,87 @@
+import datetime
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from task_manager.benchmarks import (
+    SCENARIOS,
+    BenchmarkFixtures,
+    compare,
+    get_uncovered_patterns,
+    run_benchmarks,
+)
+
+
+BASELINE = {
+    "1000": {
+        "task list": {
+            "p50_ms": 10.0,
+            "p95_ms": 20.0,
+            "queries": 5,
+            "bytes": 1000,
+        },
+    },
+}
+
+
+class BenchmarkScenarioTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        call_command(
+            "seed_data",
+            positions=2,
+            task_types=2,
+            workers=5,
+            tasks=20,
+            base_date=datetime.date(2024, 6, 1),
+            stdout=StringIO(),
+        )
+        cls.user = get_user_model().objects.create_user(
+            username="benchmark",
+            password="benchmark",
+            is_staff=True,
+        )
+
+    def test_every_url_has_a_scenario(self) -> None:
+        fixtures = BenchmarkFixtures(self.user)
+        self.assertEqual(get_uncovered_patterns(SCENARIOS, fixtures), [])
+
+    def test_scenarios_succeed(self) -> None:
+        # Raises if a request answers with an unexpected status.
+        results = run_benchmarks(BenchmarkFixtures(self.user), repeat=1)
+        self.assertEqual(
+            set(results), {scenario.name for scenario in SCENARIOS}
+        )
+        self.assertGreater(results["task list"]["queries"], 0)
+        self.assertGreater(results["task list"]["bytes"], 0)
+
+
+class CompareTest(TestCase):
+
+    def compare(self, **metrics) -> list:
+        results = {
+            "1000": {"task list": {**BASELINE["1000"]["task list"], **metrics}}
+        }
+        return compare(
+            results,
+            BASELINE,
+            tolerance=0.25,
+            query_tolerance=0,
+            min_delta_ms=5,
+        )
+
+    def test_within_tolerance(self) -> None:
+        self.assertEqual(self.compare(p50_ms=14.9, p95_ms=25.0), [])
+        self.assertEqual(self.compare(bytes=1250), [])
+
+    def test_regressions(self) -> None:
+        self.assertEqual(len(self.compare(p95_ms=25.1)), 1)
+        self.assertEqual(len(self.compare(queries=6)), 1)
+        self.assertEqual(len(self.compare(bytes=1251)), 1)
+
+    def test_new_scenarios_are_not_regressions(self) -> None:
+        results = {"1000": {"new page": BASELINE["1000"]["task list"]}}
+        self.assertEqual(compare(results, BASELINE, 0.25, 0, 5), [])
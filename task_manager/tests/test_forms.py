@@ -0,0 +1,82 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from task_manager.forms import TaskForm
+from task_manager.models import Task, TaskType
+
+
+class TaskFormAssigneesTest(TestCase):
+
+    def setUp(self) -> None:
+        self.workers = get_user_model().objects.bulk_create(
+            get_user_model()(username=f"worker.{index}")
+            for index in range(20)
+        )
+        self.task_type = TaskType.objects.create(name="Bug")
+        self.data = {
+            "name": "Test task",
+            "description": "Test description",
+            "deadline": "09/09/2024",
+            "priority": "LOW",
+            "task_type": self.task_type.id,
+            "assignees": [self.workers[0].id, self.workers[1].id],
+        }
+
+    def test_renders_only_selected_workers(self) -> None:
+        task = Task.objects.create(
+            name="Test task",
+            description="Test description",
+            deadline="2024-09-09",
+            priority=Task.Priority.LOW,
+        )
+        task.assignees.add(self.workers[3])
+        html = str(TaskForm(instance=task)["assignees"])
+        self.assertEqual(html.count("<option"), 1)
+        self.assertIn('value="%s" selected' % self.workers[3].id, html)
+        self.assertIn("data-autocomplete-url", html)
+        self.assertEqual(str(TaskForm()["assignees"]).count("<option"), 0)
+
+    def test_validation_fetches_only_submitted_workers(self) -> None:
+        form = TaskForm(data=self.data)
+        # task type lookup and model validation, then the submitted workers
+        with self.assertNumQueries(3):
+            self.assertTrue(form.is_valid())
+        self.assertEqual(
+            set(form.cleaned_data["assignees"]),
+            {self.workers[0], self.workers[1]},
+        )
+
+    def test_unknown_worker_is_invalid(self) -> None:
+        form = TaskForm(data={**self.data, "assignees": [0]})
+        self.assertFalse(form.is_valid())
+        self.assertIn("assignees", form.errors)
+        form = TaskForm(data={**self.data, "assignees": ["x"]})
+        self.assertFalse(form.is_valid())
+        self.assertIn("<select", str(form["assignees"]))
+
+
+class TaskFormPriorityTest(TestCase):
+
+    def test_accepts_values_and_names(self) -> None:
+        task_type = TaskType.objects.create(name="Bug")
+        worker = get_user_model().objects.create(username="worker")
+        for priority in ("1", "URGENT", "urgent"):
+            with self.subTest(priority=priority):
+                form = TaskForm(
+                    data={
+                        "name": "Test task",
+                        "description": "Test description",
+                        "deadline": "09/09/2024",
+                        "priority": priority,
+                        "task_type": task_type.id,
+                        "assignees": [worker.id],
+                    }
+                )
+                self.assertTrue(form.is_valid())
+                self.assertEqual(
+                    form.cleaned_data["priority"], Task.Priority.URGENT
+                )
+
+    def test_renders_labels(self) -> None:
+        html = str(TaskForm()["priority"])
+        self.assertIn('<option value="1">Urgent</option>', html)
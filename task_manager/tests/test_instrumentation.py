@@ -0,0 +1,140 @@
+import json
+import re
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from task_manager.instrumentation import (
+    InstrumentedCache,
+    RequestMetrics,
+    current_metrics,
+)
+from task_manager.models import Task, TaskType
+
+
+TASK_LIST_URL = reverse("task_manager:task-list")
+
+
+class PerformanceMiddlewareTest(TestCase):
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="test.user",
+            password="1qazcde3",
+        )
+        self.client.force_login(self.user)
+        task_type = TaskType.objects.create(name="Bug")
+        Task.objects.create(
+            name="Fix login",
+            description="Test description",
+            deadline="2024-06-01",
+            priority=Task.Priority.LOW,
+            task_type=task_type,
+        )
+        cache.clear()
+
+    @staticmethod
+    def parse_server_timing(header) -> dict:
+        metrics = {}
+        for metric in header.split(", "):
+            name, *params = metric.split(";")
+            metrics[name] = dict(param.split("=", 1) for param in params)
+        return metrics
+
+    def test_server_timing_header(self) -> None:
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(TASK_LIST_URL)
+        metrics = self.parse_server_timing(response["Server-Timing"])
+        self.assertEqual(set(metrics), {"db", "tpl", "cache", "total"})
+        self.assertEqual(
+            metrics["db"]["desc"],
+            '"%d queries"' % len(context.captured_queries),
+        )
+        self.assertGreater(float(metrics["tpl"]["dur"]), 0)
+        self.assertGreaterEqual(
+            float(metrics["total"]["dur"]), float(metrics["tpl"]["dur"])
+        )
+
+    def test_times_rendering_of_render_shortcut(self) -> None:
+        # index returns an HttpResponse rendered by render().
+        response = self.client.get(reverse("task_manager:index"))
+        metrics = self.parse_server_timing(response["Server-Timing"])
+        self.assertGreater(float(metrics["tpl"]["dur"]), 0)
+
+    @override_settings(VIEW_CACHE_ENABLED=True)
+    def test_counts_cache_hits_and_misses(self) -> None:
+        self.client.get(TASK_LIST_URL)
+        response = self.client.get(TASK_LIST_URL)
+        self.assertEqual(response["X-View-Cache"], "HIT")
+        hits, misses = re.search(
+            r'cache;desc="hits=(\d+) misses=(\d+)"',
+            response["Server-Timing"],
+        ).groups()
+        self.assertGreater(int(hits), 0)
+
+    def test_instrumented_cache(self) -> None:
+        cache = InstrumentedCache(
+            "instrumented-test",
+            {
+                "OPTIONS": {
+                    "BACKEND": "django.core.cache.backends.locmem."
+                    "LocMemCache",
+                },
+            },
+        )
+        cache.set("zero", 0)
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        try:
+            self.assertEqual(cache.get("zero"), 0)
+            self.assertEqual(cache.get("missing", "default"), "default")
+            self.assertEqual(
+                cache.get_many(["zero", "missing"]), {"zero": 0}
+            )
+        finally:
+            current_metrics.reset(token)
+        self.assertEqual((metrics.cache_hits, metrics.cache_misses), (2, 2))
+
+    @override_settings(VISIT_COUNTER_FLUSH_EVERY=2)
+    def test_counts_session_writes(self) -> None:
+        with self.assertLogs("task_manager.performance", "INFO") as logs:
+            self.client.get(reverse("task_manager:index"))
+            self.client.get(reverse("task_manager:index"))
+        self.assertEqual(
+            [
+                json.loads(record.getMessage())["session_writes"]
+                for record in logs.records
+            ],
+            [0, 1],
+        )
+
+    @override_settings(SERVER_TIMING_ENABLED=False)
+    def test_header_can_be_disabled(self) -> None:
+        response = self.client.get(TASK_LIST_URL)
+        self.assertNotIn("Server-Timing", response)
+
+    def test_structured_log_line(self) -> None:
+        with self.assertLogs("task_manager.performance", "INFO") as logs:
+            self.client.get(TASK_LIST_URL, {"order": "deadline"})
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["view"], "task_manager:task-list")
+        self.assertEqual(record["path"], TASK_LIST_URL)
+        self.assertEqual(record["status"], 200)
+        self.assertGreater(record["queries"], 0)
+        self.assertNotIn("slow_queries", record)
+
+    @override_settings(SLOW_REQUEST_THRESHOLD_MS=0)
+    def test_slow_requests_log_their_sql(self) -> None:
+        with self.assertLogs("task_manager.performance", "WARNING") as logs:
+            self.client.get(TASK_LIST_URL)
+        record = json.loads(logs.records[0].getMessage())
+        self.assertTrue(
+            any(
+                "task_manager_task" in query["sql"]
+                for query in record["slow_queries"]
+            )
+        )
@@ -0,0 +1,136 @@
+import os
+import subprocess
+import sys
+import tempfile
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from prometheus_client import REGISTRY, generate_latest
+
+from task_manager.metrics import get_registry
+
+
+METRICS_URL = reverse("task_manager:metrics")
+TASK_LIST_URL = reverse("task_manager:task-list")
+
+
+def sample(name, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class MetricsTest(TestCase):
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="test.user",
+            password="1qazcde3",
+        )
+        self.staff = get_user_model().objects.create_user(
+            username="test.staff",
+            password="1qazcde3",
+            is_staff=True,
+        )
+        self.client.force_login(self.user)
+        cache.clear()
+
+    def test_request_metrics(self) -> None:
+        view = "task_manager:task-list"
+        requests = sample(
+            "task_manager_requests_total",
+            view=view,
+            method="GET",
+            status="200",
+        )
+        durations = sample(
+            "task_manager_request_duration_seconds_count", view=view
+        )
+        queries = sample(
+            "task_manager_db_query_duration_seconds_count", view=view
+        )
+        self.client.get(TASK_LIST_URL)
+        self.assertEqual(
+            sample(
+                "task_manager_requests_total",
+                view=view,
+                method="GET",
+                status="200",
+            ),
+            requests + 1,
+        )
+        self.assertEqual(
+            sample("task_manager_request_duration_seconds_count", view=view),
+            durations + 1,
+        )
+        self.assertGreater(
+            sample("task_manager_db_query_duration_seconds_count", view=view),
+            queries,
+        )
+
+    @override_settings(VIEW_CACHE_ENABLED=True)
+    def test_cache_lookups(self) -> None:
+        view = "task_manager:task-list"
+        hits = sample(
+            "task_manager_cache_lookups_total", view=view, result="hit"
+        )
+        self.client.get(TASK_LIST_URL)
+        self.client.get(TASK_LIST_URL)
+        self.assertGreater(
+            sample(
+                "task_manager_cache_lookups_total", view=view, result="hit"
+            ),
+            hits,
+        )
+
+    @override_settings(VISIT_COUNTER_FLUSH_EVERY=1)
+    def test_session_writes(self) -> None:
+        view = "task_manager:index"
+        writes = sample("task_manager_session_writes_total", view=view)
+        self.client.get(reverse("task_manager:index"))
+        self.assertEqual(
+            sample("task_manager_session_writes_total", view=view),
+            writes + 1,
+        )
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_endpoint_access(self) -> None:
+        self.assertEqual(self.client.get(METRICS_URL).status_code, 403)
+        self.assertEqual(
+            self.client.get(
+                METRICS_URL, headers={"Authorization": "Bearer wrong"}
+            ).status_code,
+            403,
+        )
+        response = self.client.get(
+            METRICS_URL, headers={"Authorization": "Bearer secret"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"task_manager_requests_total", response.content)
+
+        self.client.force_login(self.staff)
+        self.assertEqual(self.client.get(METRICS_URL).status_code, 200)
+
+    def test_aggregates_worker_processes(self) -> None:
+        script = (
+            "import django; django.setup();"
+            "from task_manager.metrics import REQUESTS;"
+            "REQUESTS.labels('worker-test', 'GET', 200).inc()"
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            with mock.patch.dict(
+                os.environ, {"PROMETHEUS_MULTIPROC_DIR": directory}
+            ):
+                for _ in range(2):
+                    subprocess.run(
+                        [sys.executable, "-c", script],
+                        check=True,
+                        env=os.environ,
+                    )
+                output = generate_latest(get_registry()).decode()
+        self.assertIn(
+            'task_manager_requests_total{method="GET",status="200",'
+            'view="worker-test"} 2.0',
+            output,
+        )
@@ -0,0 +1,60 @@
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+
+BEFORE = ("task_manager", "0007_task_filter_indexes")
+AFTER = ("task_manager", "0008_integer_priority")
+
+
+class IntegerPriorityMigrationTest(TransactionTestCase):
+
+    def setUp(self) -> None:
+        self.migrate(BEFORE)
+        apps = self.executor.loader.project_state(BEFORE).apps
+        self.task_type = apps.get_model(
+            "task_manager", "TaskType"
+        ).objects.create(name="Bug")
+        self.Task = apps.get_model("task_manager", "Task")
+
+    def tearDown(self) -> None:
+        self.migrate(
+            *(
+                node for node in self.executor.loader.graph.leaf_nodes()
+                if node[0] == "task_manager"
+            )
+        )
+
+    def migrate(self, *targets) -> None:
+        self.executor = MigrationExecutor(connection)
+        self.executor.migrate(list(targets))
+        self.executor.loader.build_graph()
+
+    def create_task(self, priority):
+        return self.Task.objects.create(
+            name="Task",
+            description="Test description",
+            deadline="2024-06-01",
+            priority=priority,
+            task_type=self.task_type,
+        )
+
+    def test_names_and_labels_become_values(self) -> None:
+        urgent = self.create_task("URGENT")
+        medium = self.create_task("Medium")
+        self.migrate(AFTER)
+        Task = self.executor.loader.project_state(AFTER).apps.get_model(
+            "task_manager", "Task"
+        )
+        self.assertEqual(Task.objects.get(pk=urgent.pk).priority, 1)
+        self.assertEqual(Task.objects.get(pk=medium.pk).priority, 3)
+
+    def test_unknown_priority_fails_the_migration(self) -> None:
+        task = self.create_task("Critical")
+        message = r"\(%d, 'Critical'\)" % task.pk
+        with self.assertRaisesRegex(ValueError, message):
+            self.migrate(AFTER)
+        self.assertEqual(
+            self.Task.objects.get(pk=task.pk).priority, "Critical"
+        )
+        self.Task.objects.filter(pk=task.pk).update(priority="LOW")
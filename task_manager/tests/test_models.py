@@ -1,7 +1,10 @@
-from django.test import TestCase
+from django.db import connection
+from django.test import RequestFactory, TestCase
 from django.contrib.auth import get_user_model
 
 from task_manager.models import Task, TaskType, Position
+from task_manager.pagination import CursorPaginator
+from task_manager.views import TaskListView
 
 
 class ModelTest(TestCase):
@@ -56,3 +59,64 @@ class ModelTest(TestCase):
             str(self.worker),
             f"{self.worker.position} {full_name_str}"
         )
+
+
+class TaskIndexTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.index_names = [index.name for index in Task._meta.indexes]
+        cls.list_params = [
+            {"task_completion": "False", "order": "deadline"},
+            {"task_completion": "True", "order": "-deadline"},
+            {"task_completion": "False", "order": "name"},
+            {"task_completion": "all", "order": "-name"},
+        ]
+        task_types = [
+            TaskType.objects.create(name=name) for name in ("Bug", "Feature")
+        ]
+        cls.list_params += [
+            {"task_type": task_types[0].id, "order": "deadline"},
+            {"priority": "LOW", "order": "deadline"},
+            {"task_completion": "False", "order": "priority"},
+        ]
+        for index in range(20):
+            Task.objects.create(
+                name=f"Task {index}",
+                description="Test description",
+                deadline=f"2024-01-{index + 1:02d}",
+                is_completed=index % 2 == 0,
+                priority=(
+                    Task.Priority.LOW if index % 3 else Task.Priority.URGENT
+                ),
+                task_type=task_types[index % 2],
+            )
+
+    def explain_list_queries(self, params) -> list:
+        view = TaskListView()
+        view.request = RequestFactory().get("/", params)
+        paginator = CursorPaginator(view.get_queryset(), view.paginate_by)
+        first_page = paginator.page()
+        seek = paginator.queryset.filter(
+            paginator.get_seek_filter(
+                paginator.get_keys(first_page[-1]),
+                backwards=False,
+            )
+        )
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET enable_seqscan = off")
+        return [
+            paginator.queryset[:7].explain(),
+            seek[:7].explain(),
+        ]
+
+    def test_task_list_queries_use_indexes(self) -> None:
+        for params in self.list_params:
+            for plan in self.explain_list_queries(params):
+                with self.subTest(params=params, plan=plan):
+                    self.assertTrue(
+                        any(name in plan for name in self.index_names)
+                    )
+                    self.assertNotIn("TEMP B-TREE", plan)
+                    self.assertNotIn("Sort Key", plan)
@@ -0,0 +1,120 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from task_manager.models import Position, Task, TaskType, Worker
+from task_manager.ordering import TASK_ORDERINGS, WORKER_ORDERINGS
+from task_manager.pagination import add_tiebreaker
+
+
+class OrderingRegistryTest(TestCase):
+
+    def test_unknown_key_falls_back_to_default(self) -> None:
+        self.assertEqual(TASK_ORDERINGS.get_key("deadline"), "deadline")
+        self.assertEqual(TASK_ORDERINGS.get_key("password"), "none")
+        self.assertEqual(TASK_ORDERINGS.get_key(None), "none")
+
+    def test_orderings_get_id_tiebreaker(self) -> None:
+        self.assertEqual(
+            TASK_ORDERINGS.get_ordering("deadline"), ["deadline", "pk"]
+        )
+        self.assertEqual(
+            TASK_ORDERINGS.get_ordering("-name"), ["-name", "-pk"]
+        )
+        self.assertEqual(TASK_ORDERINGS.get_ordering("none"), ["id"])
+
+    def test_unique_field_needs_no_tiebreaker(self) -> None:
+        self.assertEqual(
+            WORKER_ORDERINGS.get_ordering("username"), ["username"]
+        )
+        self.assertEqual(add_tiebreaker(Task, ["-pk"]), ["-pk"])
+
+    def test_missing_annotation_falls_back_to_default(self) -> None:
+        self.assertEqual(
+            TASK_ORDERINGS.get_ordering("relevance", Task.objects.all()),
+            ["id"],
+        )
+
+
+class ListOrderingViewTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = get_user_model().objects.create_user(
+            username="test.user",
+            password="1qazcde3",
+        )
+        task_type = TaskType.objects.create(name="Bug")
+        for name in ("Beta", "Alpha", "Gamma"):
+            Position.objects.create(name=name)
+            TaskType.objects.create(name=name)
+            Task.objects.create(
+                name=name,
+                description="Test description",
+                deadline="2024-01-01",
+                priority=Task.Priority.LOW,
+                task_type=task_type,
+            )
+        Worker.objects.bulk_create(
+            Worker(username=name.lower()) for name in ("beta", "alpha")
+        )
+
+    def setUp(self) -> None:
+        self.client.force_login(self.user)
+
+    def names(self, url_name, params, key="name") -> list:
+        response = self.client.get(reverse(url_name), params)
+        self.assertEqual(response.status_code, 200)
+        return [
+            getattr(obj, key) for obj in response.context["object_list"]
+        ]
+
+    def test_sort_keys(self) -> None:
+        self.assertEqual(
+            self.names("task_manager:task-list", {"order": "-name"}),
+            ["Gamma", "Beta", "Alpha"],
+        )
+        self.assertEqual(
+            self.names("task_manager:position-list", {"order": "name"}),
+            ["Alpha", "Beta", "Gamma"],
+        )
+        self.assertEqual(
+            self.names("task_manager:task_type-list", {"order": "-name"}),
+            ["Gamma", "Bug", "Beta", "Alpha"],
+        )
+        self.assertEqual(
+            self.names(
+                "task_manager:worker-list",
+                {"order": "username"},
+                key="username",
+            ),
+            ["alpha", "beta", "test.user"],
+        )
+
+    def test_invalid_order_uses_default(self) -> None:
+        for url_name in (
+            "task_manager:task-list",
+            "task_manager:position-list",
+            "task_manager:task_type-list",
+        ):
+            with self.subTest(url_name=url_name):
+                self.assertEqual(
+                    self.names(url_name, {"order": "description"}),
+                    self.names(url_name, {}),
+                )
+
+    def test_invalid_order_keeps_search(self) -> None:
+        self.assertEqual(
+            self.names(
+                "task_manager:position-list",
+                {"name": "Alpha", "order": "nope"},
+            ),
+            ["Alpha"],
+        )
+
+    def test_equal_keys_page_by_id(self) -> None:
+        response = self.client.get(
+            reverse("task_manager:task-list"), {"order": "deadline"}
+        )
+        tasks = list(response.context["object_list"])
+        self.assertEqual(tasks, sorted(tasks, key=lambda task: task.pk))
@@ -0,0 +1,127 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from task_manager.models import Task, TaskType
+from task_manager.pagination import CursorPaginator, encode_cursor
+
+
+TASK_LIST_URL = reverse("task_manager:task-list")
+
+
+class CursorPaginatorTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        task_type = TaskType.objects.create(name="Bug")
+        for index in range(15):
+            Task.objects.create(
+                name=f"Task {index % 5}",
+                description="Test description",
+                deadline=f"2024-01-{index % 7 + 1:02d}",
+                priority=Task.PRIORITY_CHOICES["LOW"],
+                task_type=task_type,
+            )
+
+    def walk(self, ordering) -> list:
+        paginator = CursorPaginator(Task.objects.order_by(ordering), 4)
+        page = paginator.page()
+        rows = list(page)
+        while page.has_next():
+            page = paginator.page(page.next_cursor)
+            rows.extend(page)
+        return rows
+
+    def test_pages_cover_every_row_once_in_order(self) -> None:
+        for ordering in ["name", "-name", "deadline", "-deadline"]:
+            with self.subTest(ordering):
+                tiebreaker = "-pk" if ordering.startswith("-") else "pk"
+                self.assertEqual(
+                    self.walk(ordering),
+                    list(Task.objects.order_by(ordering, tiebreaker)),
+                )
+
+    def test_previous_cursor_returns_previous_page(self) -> None:
+        paginator = CursorPaginator(Task.objects.order_by("-deadline"), 4)
+        first = paginator.page()
+        second = paginator.page(first.next_cursor)
+        self.assertFalse(first.has_previous())
+        self.assertEqual(
+            list(paginator.page(second.previous_cursor)),
+            list(first),
+        )
+
+    def test_page_does_not_count_rows(self) -> None:
+        paginator = CursorPaginator(Task.objects.order_by("name"), 4)
+        with self.assertNumQueries(1):
+            paginator.page()
+
+
+class CursorPaginationViewTest(TestCase):
+
+    def setUp(self) -> None:
+        self.admin = get_user_model().objects.create_superuser(
+            username="admin.user",
+            password="1qazcde3",
+        )
+        self.client.force_login(self.admin)
+        for index in range(8):
+            Task.objects.create(
+                name=f"Task {index}",
+                description="Test description",
+                deadline="2024-09-09",
+                priority=Task.PRIORITY_CHOICES["LOW"],
+            )
+
+    def test_task_list_next_page_by_cursor(self) -> None:
+        response = self.client.get(TASK_LIST_URL, {"order": "-name"})
+        self.assertTrue(response.context["is_paginated"])
+        page_obj = response.context["page_obj"]
+        self.assertContains(response, "cursor=" + page_obj.next_cursor)
+        response = self.client.get(
+            TASK_LIST_URL,
+            {"order": "-name", "cursor": page_obj.next_cursor},
+        )
+        self.assertEqual(
+            list(response.context["task_list"]),
+            list(Task.objects.order_by("-name")[6:]),
+        )
+
+    def test_invalid_cursor_returns_404(self) -> None:
+        response = self.client.get(TASK_LIST_URL, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 404)
+        response = self.client.get(
+            TASK_LIST_URL,
+            {"cursor": encode_cursor(["a", "b", "c"], "n")},
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_tampered_cursor_returns_404(self) -> None:
+        urls = [
+            TASK_LIST_URL,
+            reverse("task_manager:worker-list"),
+            reverse("task_manager:position-list"),
+            reverse("task_manager:worker-task-list", args=[self.admin.id]),
+        ]
+        for url in urls:
+            with self.subTest(url):
+                response = self.client.get(
+                    url, {"cursor": encode_cursor(["abc"], "n")}
+                )
+                self.assertEqual(response.status_code, 404)
+        for values in [["abc", 1], [None, 1], [[1], {"a": 1}]]:
+            with self.subTest(values):
+                response = self.client.get(
+                    TASK_LIST_URL,
+                    {
+                        "order": "deadline",
+                        "cursor": encode_cursor(values, "n"),
+                    },
+                )
+                self.assertEqual(response.status_code, 404)
+
+    def test_count_only_when_requested(self) -> None:
+        response = self.client.get(TASK_LIST_URL)
+        self.assertNotIn("total_count", response.context)
+        response = self.client.get(TASK_LIST_URL, {"count": "1"})
+        self.assertEqual(response.context["total_count"], 8)
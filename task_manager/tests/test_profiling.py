@@ -0,0 +1,199 @@
+import threading
+import time
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import (
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    override_settings,
+)
+from django.urls import reverse
+
+from task_manager.profiling import (
+    ProfilingMiddleware,
+    StackSampler,
+    get_profile,
+    make_token,
+)
+
+
+TASK_LIST_URL = reverse("task_manager:task-list")
+
+
+def busy_wait(seconds) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class StackSamplerTest(SimpleTestCase):
+
+    def test_collapsed_stacks(self) -> None:
+        sampler = StackSampler(0.001)
+        sampler.start()
+        busy_wait(0.05)
+        sampler.stop()
+        lines = sampler.collapsed().splitlines()
+        self.assertTrue(lines)
+        for line in lines:
+            stack, count = line.rsplit(" ", 1)
+            self.assertGreater(int(count), 0)
+        self.assertTrue(
+            any(
+                line.startswith("%s:busy_wait" % busy_wait.__module__)
+                for line in lines
+            )
+        )
+
+    def test_no_samples_after_stop(self) -> None:
+        sampler = StackSampler(0.001)
+        sampler.start()
+        sampler.stop()
+        count = sum(sampler.samples.values())
+        busy_wait(0.01)
+        self.assertEqual(sum(sampler.samples.values()), count)
+
+
+@override_settings(PROFILING_INTERVAL_MS=1)
+class ProfilingMiddlewareTest(TestCase):
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="test.user",
+            password="1qazcde3",
+        )
+        self.staff = get_user_model().objects.create_user(
+            username="test.staff",
+            password="1qazcde3",
+            is_staff=True,
+        )
+        cache.clear()
+
+    def test_staff_query_flag(self) -> None:
+        self.client.force_login(self.staff)
+        response = self.client.get(TASK_LIST_URL, {"profile": "1"})
+        profile = get_profile(response["X-Profile-Id"])
+        self.assertEqual(profile["mode"], "sample")
+        self.assertEqual(profile["view"], "task_manager:task-list")
+        self.assertEqual(profile["status"], 200)
+
+        detail = self.client.get(
+            reverse("task_manager:profile-detail", args=[profile["id"]])
+        )
+        self.assertEqual(detail["Content-Type"], "text/plain; charset=utf-8")
+        self.assertEqual(detail.content.decode(), profile["output"])
+
+    def test_cprofile_mode(self) -> None:
+        self.client.force_login(self.staff)
+        response = self.client.get(TASK_LIST_URL, {"profile": "cprofile"})
+        profile = get_profile(response["X-Profile-Id"])
+        self.assertEqual(profile["mode"], "cprofile")
+        self.assertIn("cumulative", profile["output"])
+
+    def test_overlapping_cprofile_requests(self) -> None:
+        entered = threading.Event()
+        release = threading.Event()
+
+        def get_response(request):
+            if request.path == "/slow/":
+                entered.set()
+                release.wait(5)
+            return HttpResponse()
+
+        def request(path):
+            return RequestFactory().get(
+                path, headers={"X-Profile": make_token("cprofile")}
+            )
+
+        middleware = ProfilingMiddleware(get_response)
+        responses = {}
+        thread = threading.Thread(
+            target=lambda: responses.update(
+                slow=middleware(request("/slow/"))
+            )
+        )
+        thread.start()
+        self.assertTrue(entered.wait(5))
+        try:
+            overlapping = middleware(request("/fast/"))
+        finally:
+            release.set()
+            thread.join()
+        self.assertIn("X-Profile-Id", responses["slow"])
+        self.assertNotIn("X-Profile-Id", overlapping)
+
+        self.assertIn("X-Profile-Id", middleware(request("/fast/")))
+
+    def test_async_requests_are_sampled(self) -> None:
+        async def get_response(request):
+            return HttpResponse()
+
+        middleware = ProfilingMiddleware(get_response)
+        response = async_to_sync(middleware)(
+            RequestFactory().get(
+                "/", headers={"X-Profile": make_token("cprofile")}
+            )
+        )
+        self.assertEqual(
+            get_profile(response["X-Profile-Id"])["mode"], "sample"
+        )
+
+    def test_query_flag_ignored_for_other_users(self) -> None:
+        self.client.force_login(self.user)
+        response = self.client.get(TASK_LIST_URL, {"profile": "1"})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("X-Profile-Id", response)
+
+    def test_signed_header(self) -> None:
+        self.client.force_login(self.user)
+        response = self.client.get(
+            TASK_LIST_URL, headers={"X-Profile": make_token("cprofile")}
+        )
+        self.assertEqual(
+            get_profile(response["X-Profile-Id"])["mode"], "cprofile"
+        )
+
+        response = self.client.get(
+            TASK_LIST_URL, headers={"X-Profile": "cprofile:forged"}
+        )
+        self.assertNotIn("X-Profile-Id", response)
+
+    def test_sample_rate(self) -> None:
+        self.client.force_login(self.user)
+        with override_settings(PROFILING_SAMPLE_RATE=0.5):
+            with mock.patch("random.random", return_value=0.25):
+                sampled = self.client.get(TASK_LIST_URL)
+            with mock.patch("random.random", return_value=0.75):
+                skipped = self.client.get(TASK_LIST_URL)
+        self.assertIn("X-Profile-Id", sampled)
+        self.assertNotIn("X-Profile-Id", skipped)
+
+    def test_profiles_are_staff_only(self) -> None:
+        self.client.force_login(self.staff)
+        profile_id = self.client.get(TASK_LIST_URL, {"profile": "1"})[
+            "X-Profile-Id"
+        ]
+        results = self.client.get(
+            reverse("task_manager:profile-list")
+        ).json()["results"]
+        self.assertEqual([result["id"] for result in results], [profile_id])
+        self.assertNotIn("output", results[0])
+
+        self.client.force_login(self.user)
+        for url in (
+            reverse("task_manager:profile-list"),
+            reverse("task_manager:profile-detail", args=[profile_id]),
+        ):
+            self.assertEqual(self.client.get(url).status_code, 302)
+
+    def test_unknown_profile(self) -> None:
+        self.client.force_login(self.staff)
+        response = self.client.get(
+            reverse("task_manager:profile-detail", args=["missing"])
+        )
+        self.assertEqual(response.status_code, 404)
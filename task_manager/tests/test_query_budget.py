@@ -0,0 +1,160 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from task_manager.models import Position, Task, TaskType, Worker
+from task_manager.query_budget import (
+    QueryBudget,
+    QueryBudgetExceeded,
+    QueryBudgetTestMixin,
+)
+from task_manager.views import TaskListView
+
+
+class ViewQueryBudgetTest(QueryBudgetTestMixin, TestCase):
+
+    def setUp(self) -> None:
+        self.position = Position.objects.create(name="Developer")
+        self.user = get_user_model().objects.create_user(
+            username="test.user",
+            password="1qazcde3",
+            position=self.position,
+        )
+        self.client.force_login(self.user)
+        self.task_type = TaskType.objects.create(name="Bug")
+        self.task = self.create_tasks(1)[0]
+        self.row_count = 0
+
+    def create_tasks(self, count) -> list:
+        tasks = Task.objects.bulk_create(
+            Task(
+                name="Task",
+                description="Test description",
+                deadline="2024-06-01",
+                priority=Task.Priority.LOW,
+                task_type=self.task_type,
+            )
+            for _ in range(count)
+        )
+        Task.assignees.through.objects.bulk_create(
+            Task.assignees.through(task=task, worker=self.user)
+            for task in tasks
+        )
+        return tasks
+
+    def create_workers(self, count) -> None:
+        start = self.row_count
+        self.row_count += count
+        workers = Worker.objects.bulk_create(
+            Worker(username="worker%d" % index, position=self.position)
+            for index in range(start, start + count)
+        )
+        Task.assignees.through.objects.bulk_create(
+            Task.assignees.through(task=self.task, worker=worker)
+            for worker in workers
+        )
+
+    def create_named(self, model):
+        def add_rows(count) -> None:
+            start = self.row_count
+            self.row_count += count
+            model.objects.bulk_create(
+                model(name="Row %d" % index)
+                for index in range(start, start + count)
+            )
+
+        return add_rows
+
+    def test_task_list(self) -> None:
+        self.assertQueryBudget(
+            reverse("task_manager:task-list"), self.create_tasks
+        )
+        self.assertQueryBudget(
+            reverse("task_manager:task-list"),
+            self.create_tasks,
+            sizes=(12, 20),
+            params={
+                "assignee": self.user.id,
+                "task_type": self.task_type.id,
+                "order": "priority",
+            },
+        )
+
+    def test_task_detail(self) -> None:
+        self.assertQueryBudget(
+            reverse("task_manager:task-detail", args=[self.task.id]),
+            self.create_workers,
+        )
+
+    def test_worker_detail(self) -> None:
+        url = reverse("task_manager:worker-detail", args=[self.user.id])
+        self.assertQueryBudget(url, self.create_tasks)
+        self.assertQueryBudget(
+            reverse("task_manager:worker-task-list", args=[self.user.id]),
+            self.create_tasks,
+            sizes=(12, 20),
+        )
+
+    def test_list_pages(self) -> None:
+        self.assertQueryBudget(
+            reverse("task_manager:worker-list"), self.create_workers
+        )
+        self.assertQueryBudget(
+            reverse("task_manager:position-list"),
+            self.create_named(Position),
+        )
+        self.assertQueryBudget(
+            reverse("task_manager:task_type-list"),
+            self.create_named(TaskType),
+        )
+
+    def test_index_and_json_endpoints(self) -> None:
+        self.assertQueryBudget(
+            reverse("task_manager:index"), self.create_tasks
+        )
+        self.assertQueryBudget(
+            reverse("task_manager:worker-autocomplete"),
+            self.create_workers,
+            params={"q": "work"},
+        )
+        self.assertQueryBudget(
+            reverse("task_manager:api-task-list"), self.create_tasks
+        )
+        self.assertQueryBudget(
+            reverse("task_manager:api-worker-detail", args=[self.user.id]),
+            self.create_tasks,
+        )
+
+
+class QueryBudgetMiddlewareTest(TestCase):
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="test.user",
+            password="1qazcde3",
+        )
+        self.client.force_login(self.user)
+
+    @override_settings(DEBUG=True)
+    def test_over_budget_request_fails_in_debug(self) -> None:
+        with mock.patch.object(
+            TaskListView, "query_budget", QueryBudget(1)
+        ):
+            with self.assertRaisesMessage(
+                QueryBudgetExceeded, "over its budget of 1"
+            ):
+                self.client.get(reverse("task_manager:task-list"))
+
+    @override_settings(DEBUG=True)
+    def test_within_budget_in_debug(self) -> None:
+        response = self.client.get(reverse("task_manager:task-list"))
+        self.assertEqual(response.status_code, 200)
+
+    def test_inactive_without_debug(self) -> None:
+        with mock.patch.object(
+            TaskListView, "query_budget", QueryBudget(1)
+        ):
+            response = self.client.get(reverse("task_manager:task-list"))
+        self.assertEqual(response.status_code, 200)
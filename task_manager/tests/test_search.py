@@ -0,0 +1,78 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from task_manager.models import Position, Task
+from task_manager.search import (
+    IContainsSearchBackend,
+    get_search_backend,
+    search,
+)
+
+
+TASK_LIST_URL = reverse("task_manager:task-list")
+
+
+class SearchTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.queries = ["", "a", "Fix", "LOG IN", "bug when", "guest", "zzz"]
+        for name in [
+            "Add an opportunity to log in as a guest",
+            "Fix a bug when names were sorted wrong",
+            "Fix a bug when some people cant log in",
+            "Guest guest guest",
+        ]:
+            Task.objects.create(
+                name=name,
+                description="Test description",
+                deadline="2024-09-09",
+                priority=Task.PRIORITY_CHOICES["LOW"],
+            )
+
+    def test_search_matches_icontains(self) -> None:
+        for query in self.queries:
+            with self.subTest(query):
+                self.assertEqual(
+                    set(search(Task.objects.all(), query)),
+                    set(Task.objects.filter(name__icontains=query)),
+                )
+
+    def test_index_follows_updates_and_deletes(self) -> None:
+        position = Position.objects.create(name="Developer")
+        self.assertEqual(
+            list(search(Position.objects.all(), "velo")),
+            [position],
+        )
+        position.name = "Designer"
+        position.save()
+        self.assertFalse(search(Position.objects.all(), "velo").exists())
+        self.assertTrue(search(Position.objects.all(), "sign").exists())
+        position.delete()
+        self.assertFalse(search(Position.objects.all(), "sign").exists())
+
+    def test_ranked_search_orders_best_match_first(self) -> None:
+        if type(get_search_backend()) is IContainsSearchBackend:
+            self.skipTest("The fallback backend does not rank")
+        ranked = search(Task.objects.all(), "guest", ranked=True)
+        self.assertEqual(
+            ranked.order_by("-search_rank").first().name,
+            "Guest guest guest",
+        )
+
+    def test_task_list_orders_by_relevance(self) -> None:
+        admin = get_user_model().objects.create_superuser(
+            username="admin.user",
+            password="1qazcde3",
+        )
+        self.client.force_login(admin)
+        response = self.client.get(
+            TASK_LIST_URL,
+            {"name": "fix", "task_completion": "all", "order": "relevance"},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            set(response.context["task_list"]),
+            set(Task.objects.filter(name__icontains="fix")),
+        )
@@ -0,0 +1,105 @@
+import datetime
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from task_manager.aggregates import count_worker_tasks_live
+from task_manager.models import (
+    Position,
+    Task,
+    TaskCountRollup,
+    TaskType,
+    Worker,
+)
+from task_manager.search import search
+
+
+class SeedDataCommandTest(TestCase):
+
+    def seed(self, **options) -> None:
+        options = {
+            "positions": 3,
+            "task_types": 4,
+            "workers": 20,
+            "tasks": 50,
+            "seed": 7,
+            "base_date": datetime.date(2024, 6, 1),
+            "batch_size": 16,
+            "stdout": StringIO(),
+            **options,
+        }
+        call_command("seed_data", **options)
+
+    @staticmethod
+    def snapshot() -> list:
+        return list(
+            Task.objects.order_by("pk").values_list(
+                "name",
+                "description",
+                "deadline",
+                "is_completed",
+                "priority",
+                "task_type__name",
+            )
+        ) + list(
+            Task.assignees.through.objects.order_by(
+                "task", "worker"
+            ).values_list("task__name", "worker__username")
+        )
+
+    def test_creates_requested_rows(self) -> None:
+        self.seed()
+        self.assertEqual(Position.objects.count(), 3)
+        self.assertEqual(TaskType.objects.count(), 4)
+        self.assertEqual(Worker.objects.count(), 20)
+        self.assertEqual(Task.objects.count(), 50)
+        self.assertTrue(Task.assignees.through.objects.exists())
+        self.assertFalse(Task.objects.filter(task_type=None).exists())
+        worker = Worker.objects.first()
+        self.assertTrue(worker.check_password("seed-password"))
+
+    def test_same_seed_gives_same_rows(self) -> None:
+        self.seed()
+        first = self.snapshot()
+        for model in (Task, Worker, TaskType, Position):
+            model.objects.all().delete()
+        self.seed()
+        self.assertEqual(self.snapshot(), first)
+        Task.objects.all().delete()
+        self.seed(seed=8, workers=0, task_types=0, positions=0)
+        self.assertNotEqual(self.snapshot(), first)
+
+    def test_appends_after_existing_rows(self) -> None:
+        self.seed()
+        self.seed()
+        self.assertEqual(Task.objects.count(), 100)
+        self.assertEqual(Worker.objects.count(), 40)
+        task = Task.objects.create(
+            name="Created later",
+            description="Test description",
+            deadline="2024-06-01",
+            priority=Task.Priority.LOW,
+        )
+        self.assertEqual(task.pk, 101)
+
+    def test_seeded_rows_are_searchable(self) -> None:
+        self.seed()
+        task = Task.objects.order_by("pk").last()
+        self.assertIn(task, search(Task.objects.all(), task.name))
+
+    @override_settings(TASK_COUNT_ROLLUPS=True)
+    def test_rebuilds_rollups(self) -> None:
+        self.seed()
+        worker_ids = list(Worker.objects.values_list("pk", flat=True))
+        live = count_worker_tasks_live(worker_ids)
+        rollups = TaskCountRollup.objects.filter(kind=TaskCountRollup.WORKER)
+        self.assertEqual(rollups.count(), 20)
+        for rollup in rollups:
+            self.assertEqual(
+                rollup.total, live.get(rollup.object_id, {"total": 0})["total"]
+            )
+
+    def test_rejects_negative_counts(self) -> None:
+        with self.assertRaises(CommandError):
+            self.seed(tasks=-1)
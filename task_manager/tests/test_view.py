@@ -1,10 +1,18 @@
-from django.test import TestCase, Client
+from django.core.cache import cache
+from django.db import connection
+from django.db.models.signals import post_init
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 
+from task_manager.counters import get_dashboard_counts
 from task_manager.models import Task, TaskType, Position
+from task_manager.views import TaskListView
 
 
+INDEX_URL = reverse("task_manager:index")
+
 POSITION_LIST_URL = reverse("task_manager:position-list")
 POSITION_CREATE_URL = reverse("task_manager:position-create")
 POSITION_UPDATE_URL_STR = "task_manager:position-update"
@@ -656,17 +664,17 @@ class PrivateTaskViewTest(TestCase):
         )
         self.task.assignees.set([self.user, ])
         url = reverse(TASK_TOGGLE_TASK_ASSIGN_URL_STR, args=[self.task.id, ])
-        self.client.get(url)
-        self.assignees = self.task.assignees.all()
+        self.client.post(url)
         self.assertEqual(
-            list(self.assignees),
-            list(self.task.assignees.all())
+            set(self.task.assignees.all()),
+            {self.user, self.admin}
         )
-        self.client.get(url)
-        self.assertNotEqual(
-            list(self.assignees),
-            list(self.task.assignees.all())
+        self.client.post(url)
+        self.assertEqual(
+            list(self.task.assignees.all()),
+            [self.user, ]
         )
+        self.assertEqual(self.client.get(url).status_code, 405)
 
 
 class PublicWorkerViewTest(TestCase):
@@ -862,3 +870,377 @@ class PrivateWorkerViewTest(TestCase):
         self.user.refresh_from_db()
         self.assertRedirects(response, WORKER_LIST_URL)
         self.assertEqual(self.user.username, new_username)
+
+
+class PrivateIndexViewTest(TestCase):
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.admin = get_user_model().objects.create_superuser(
+            username="admin.user",
+            password="1qazcde3",
+        )
+        self.client.force_login(self.admin)
+        self.client.get(INDEX_URL)
+
+    def test_index_counters_served_from_cache(self) -> None:
+        with self.assertNumQueries(0):
+            get_dashboard_counts()
+
+    def test_index_counters_invalidated_on_change(self) -> None:
+        Position.objects.create(name="Developer")
+        task_type = TaskType.objects.create(name="Bug")
+        response = self.client.get(INDEX_URL)
+        self.assertEqual(response.context["num_positions"], 1)
+        self.assertEqual(response.context["num_tasktypes"], 1)
+        self.assertEqual(response.context["num_workers"], 1)
+        task_type.delete()
+        response = self.client.get(INDEX_URL)
+        self.assertEqual(response.context["num_tasktypes"], 0)
+
+    def test_index_visits_do_not_write_session(self) -> None:
+        with self.assertNumQueries(2):
+            response = self.client.get(INDEX_URL)
+        self.assertEqual(response.context["num_visits"], 2)
+        self.assertNotIn("num_visits", self.client.session)
+
+    @override_settings(VISIT_COUNTER_FLUSH_EVERY=3)
+    def test_index_visits_flushed_to_session_in_batches(self) -> None:
+        for _ in range(3):
+            response = self.client.get(INDEX_URL)
+        self.assertEqual(response.context["num_visits"], 4)
+        self.assertEqual(self.client.session["num_visits"], 3)
+        response = self.client.get(INDEX_URL)
+        self.assertEqual(response.context["num_visits"], 5)
+
+
+class ToggleAssignViewTest(TestCase):
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="test.user",
+            password="1qazcde3",
+        )
+        self.client.force_login(self.user)
+        self.tasks = [
+            Task.objects.create(
+                name=f"Task {index}",
+                description="Test description",
+                deadline="2024-09-09",
+                priority=Task.PRIORITY_CHOICES["LOW"],
+            )
+            for index in range(3)
+        ]
+        self.url = reverse(
+            TASK_TOGGLE_TASK_ASSIGN_URL_STR, args=[self.tasks[0].id]
+        )
+
+    def test_toggle_redirects_to_task_detail(self) -> None:
+        response = self.client.post(self.url)
+        self.assertRedirects(
+            response,
+            reverse(TASK_DETAIL_URL_STR, args=[self.tasks[0].id]),
+        )
+        self.assertTrue(self.tasks[0].assignees.filter(id=self.user.id))
+        self.client.post(self.url)
+        self.assertFalse(self.tasks[0].assignees.filter(id=self.user.id))
+
+    def test_toggle_returns_json(self) -> None:
+        with self.assertNumQueries(7):
+            response = self.client.post(
+                self.url, HTTP_ACCEPT="application/json"
+            )
+        self.assertEqual(
+            response.json(),
+            {"tasks": [{"id": self.tasks[0].id, "assigned": True}]},
+        )
+
+    def test_toggle_returns_partial_html(self) -> None:
+        response = self.client.post(
+            self.url, HTTP_X_REQUESTED_WITH="XMLHttpRequest"
+        )
+        self.assertTemplateUsed(response, "includes/task_assignees.html")
+        self.assertContains(response, "Remove me from the task")
+        self.assertNotContains(response, "<html")
+
+    def test_batch_toggle(self) -> None:
+        self.tasks[0].assignees.add(self.user)
+        response = self.client.post(
+            reverse(TASK_TOGGLE_TASK_ASSIGN_URL_STR),
+            {"task_id": [task.id for task in self.tasks]},
+            HTTP_ACCEPT="application/json",
+        )
+        self.assertEqual(
+            response.json()["tasks"],
+            [
+                {"id": self.tasks[0].id, "assigned": False},
+                {"id": self.tasks[1].id, "assigned": True},
+                {"id": self.tasks[2].id, "assigned": True},
+            ],
+        )
+        self.assertEqual(
+            set(self.user.tasks.values_list("id", flat=True)),
+            {self.tasks[1].id, self.tasks[2].id},
+        )
+
+    def test_missing_or_invalid_task(self) -> None:
+        url = reverse(TASK_TOGGLE_TASK_ASSIGN_URL_STR, args=[0])
+        self.assertEqual(self.client.post(url).status_code, 404)
+        response = self.client.post(
+            reverse(TASK_TOGGLE_TASK_ASSIGN_URL_STR), {"task_id": "x"}
+        )
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(reverse(TASK_TOGGLE_TASK_ASSIGN_URL_STR))
+        self.assertEqual(response.status_code, 400)
+
+    def test_get_is_not_allowed(self) -> None:
+        self.assertEqual(self.client.get(self.url).status_code, 405)
+
+
+class TaskDetailAssignmentTest(TestCase):
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="test.user",
+            password="1qazcde3",
+        )
+        self.client.force_login(self.user)
+        self.task = Task.objects.create(
+            name="Test task",
+            description="Test description",
+            deadline="2024-09-09",
+            priority=Task.PRIORITY_CHOICES["LOW"],
+        )
+        self.url = reverse(TASK_DETAIL_URL_STR, args=[self.task.id])
+
+    def get_detail(self) -> tuple[int, int]:
+        """
+        Return the number of queries run and Task rows loaded by the page.
+        """
+        loaded = []
+
+        def count_task(sender, **kwargs):
+            loaded.append(sender)
+
+        post_init.connect(count_task, sender=Task)
+        try:
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(self.url)
+        finally:
+            post_init.disconnect(count_task, sender=Task)
+        return len(queries), len(loaded)
+
+    def test_is_assigned_flag(self) -> None:
+        response = self.client.get(self.url)
+        self.assertFalse(response.context["task"].is_assigned)
+        self.assertContains(response, "Assign me to the task")
+        self.task.assignees.add(self.user)
+        response = self.client.get(self.url)
+        self.assertTrue(response.context["task"].is_assigned)
+        self.assertContains(response, "Remove me from the task")
+
+    def test_cost_does_not_depend_on_user_tasks(self) -> None:
+        self.task.assignees.add(self.user)
+        num_queries, num_tasks = self.get_detail()
+        self.assertEqual(num_tasks, 1)
+        for index in range(50):
+            Task.objects.create(
+                name=f"Other task {index}",
+                description="Test description",
+                deadline="2024-09-09",
+                priority=Task.PRIORITY_CHOICES["LOW"],
+            ).assignees.add(self.user)
+        self.assertEqual(self.get_detail(), (num_queries, 1))
+
+
+class WorkerTaskListViewTest(TestCase):
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="test.user",
+            password="1qazcde3",
+        )
+        self.client.force_login(self.user)
+        for index in range(15):
+            Task.objects.create(
+                name=f"Task {index:02}",
+                description="Test description",
+                deadline=f"2024-09-{index + 1:02}",
+                is_completed=index % 3 == 0,
+                priority=Task.PRIORITY_CHOICES["LOW"],
+            ).assignees.add(self.user)
+        self.detail_url = reverse(WORKER_DETAIL_URL_STR, args=[self.user.id])
+        self.tasks_url = reverse(
+            "task_manager:worker-task-list", args=[self.user.id]
+        )
+
+    def task_names(self, response) -> list:
+        return [task.name for task in response.context["task_page"]]
+
+    def test_detail_page_shows_first_page_of_tasks(self) -> None:
+        response = self.client.get(self.detail_url)
+        self.assertEqual(
+            self.task_names(response),
+            [f"Task {index:02}" for index in range(12)],
+        )
+        self.assertContains(response, "Load more")
+        self.assertNotContains(response, "Task 12")
+
+    def test_fragment_loads_next_pages(self) -> None:
+        response = self.client.get(self.tasks_url)
+        self.assertNotContains(response, "<html")
+        response = self.client.get(
+            self.tasks_url,
+            {"cursor": response.context["task_page"].next_cursor},
+        )
+        self.assertEqual(
+            self.task_names(response),
+            ["Task 12", "Task 13", "Task 14"],
+        )
+        self.assertNotContains(response, "Load more")
+
+    def test_status_and_deadline_filters(self) -> None:
+        response = self.client.get(
+            self.tasks_url,
+            {
+                "status": "completed",
+                "deadline_from": "2024-09-02",
+                "deadline_to": "2024-09-09",
+            },
+        )
+        self.assertEqual(
+            self.task_names(response),
+            ["Task 03", "Task 06"],
+        )
+        response = self.client.get(self.tasks_url, {"status": "open"})
+        self.assertNotIn("Task 00", self.task_names(response))
+
+    def test_invalid_cursor(self) -> None:
+        response = self.client.get(self.tasks_url, {"cursor": "bogus"})
+        self.assertEqual(response.status_code, 404)
+
+
+class WorkerAutocompleteViewTest(TestCase):
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="test.user",
+            password="1qazcde3",
+        )
+        get_user_model().objects.bulk_create(
+            get_user_model()(
+                username=f"dev.{index:02}",
+                first_name="Alice" if index == 5 else "Bob",
+            )
+            for index in range(30)
+        )
+        self.url = reverse("task_manager:worker-autocomplete")
+
+    def test_login_required(self) -> None:
+        response = self.client.get(self.url, {"q": "dev"})
+        self.assertNotEqual(response.status_code, 200)
+
+    def test_results_are_limited(self) -> None:
+        self.client.force_login(self.user)
+        results = self.client.get(self.url, {"q": "dev"}).json()["results"]
+        self.assertEqual(len(results), 20)
+
+    def test_matches_names(self) -> None:
+        self.client.force_login(self.user)
+        results = self.client.get(self.url, {"q": "ali"}).json()["results"]
+        self.assertEqual(
+            [result["id"] for result in results],
+            [get_user_model().objects.get(username="dev.05").id],
+        )
+
+    def test_empty_query(self) -> None:
+        self.client.force_login(self.user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.json(), {"results": []})
+
+
+class TaskListFilterTest(TestCase):
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="test.user",
+            password="1qazcde3",
+        )
+        self.client.force_login(self.user)
+        self.bug = TaskType.objects.create(name="Bug")
+        self.feature = TaskType.objects.create(name="Feature")
+        specs = [
+            ("Fix login", self.bug, "URGENT", "2024-09-01", False),
+            ("Fix logout", self.bug, "LOW", "2024-09-05", True),
+            ("Add export", self.feature, "LOW", "2024-09-10", False),
+            ("Add import", self.feature, "MEDIUM", "2024-09-20", False),
+        ]
+        self.tasks = {}
+        for name, task_type, priority, deadline, is_completed in specs:
+            self.tasks[name] = Task.objects.create(
+                name=name,
+                description="Test description",
+                deadline=deadline,
+                is_completed=is_completed,
+                priority=Task.Priority[priority],
+                task_type=task_type,
+            )
+        self.tasks["Add export"].assignees.add(self.user)
+
+    def task_names(self, params) -> list:
+        response = self.client.get(TASK_LIST_URL, params)
+        return sorted(task.name for task in response.context["task_list"])
+
+    def test_filters(self) -> None:
+        self.assertEqual(
+            self.task_names({"assignee": self.user.id}),
+            ["Add export"],
+        )
+        self.assertEqual(
+            self.task_names({"task_type": self.bug.id}),
+            ["Fix login", "Fix logout"],
+        )
+        self.assertEqual(
+            self.task_names({"priority": "LOW"}),
+            ["Add export", "Fix logout"],
+        )
+        self.assertEqual(
+            self.task_names(
+                {"deadline_from": "2024-09-05", "deadline_to": "2024-09-10"}
+            ),
+            ["Add export", "Fix logout"],
+        )
+        self.assertEqual(
+            self.task_names({"task_type": self.feature.id, "priority": "LOW"}),
+            ["Add export"],
+        )
+
+    def test_order_by_priority(self) -> None:
+        response = self.client.get(TASK_LIST_URL, {"order": "priority"})
+        self.assertEqual(
+            [task.name for task in response.context["task_list"]],
+            ["Fix login", "Add import", "Fix logout", "Add export"],
+        )
+
+    def test_invalid_filters_are_ignored(self) -> None:
+        self.assertEqual(
+            len(self.task_names({"task_type": "x", "task_completion": "?"})),
+            4,
+        )
+
+    def test_facets_count_current_filter(self) -> None:
+        response = self.client.get(TASK_LIST_URL, {"task_completion": "False"})
+        facets = response.context["facets"]
+        self.assertEqual(
+            facets["status"],
+            [("Not completed", 3), ("Completed", 0)],
+        )
+        self.assertEqual(facets["task_type"], [("Bug", 1), ("Feature", 2)])
+        self.assertIn(("Urgent", 1), facets["priority"])
+        self.assertIn(("Low", 1), facets["priority"])
+        self.assertContains(response, "Feature: 2")
+
+    def test_facets_use_one_query(self) -> None:
+        queryset = Task.objects.all()
+        with self.assertNumQueries(1):
+            TaskListView.get_facets(queryset)
@@ -0,0 +1,130 @@
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from prometheus_client import REGISTRY
+
+from task_manager.models import Task, TaskType
+from task_manager.view_cache import (
+    CSRF_PLACEHOLDER,
+    get_model_versions,
+)
+
+
+TASK_LIST_URL = reverse("task_manager:task-list")
+TASK_TYPE_LIST_URL = reverse("task_manager:task_type-list")
+POSITION_LIST_URL = reverse("task_manager:position-list")
+
+
+@override_settings(VIEW_CACHE_ENABLED=True)
+class ViewCacheTest(TestCase):
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.admin = get_user_model().objects.create_superuser(
+            username="admin.user",
+            password="1qazcde3",
+        )
+        self.client.force_login(self.admin)
+        self.task_type = TaskType.objects.create(name="Bug")
+        self.task = Task.objects.create(
+            name="Fix the login page",
+            description="Test description",
+            deadline="2024-09-09",
+            priority=Task.PRIORITY_CHOICES["LOW"],
+            task_type=self.task_type,
+        )
+
+    def test_second_request_is_served_from_cache(self) -> None:
+        first = self.client.get(TASK_LIST_URL, {"order": "name"})
+        self.assertEqual(first["X-View-Cache"], "MISS")
+        with self.assertNumQueries(2):
+            second = self.client.get(TASK_LIST_URL, {"order": "name"})
+        self.assertEqual(second["X-View-Cache"], "HIT")
+        self.assertContains(second, self.task.name)
+        self.assertContains(second, 'name="csrfmiddlewaretoken"')
+        self.assertNotContains(second, CSRF_PLACEHOLDER)
+
+    def test_query_string_is_normalised(self) -> None:
+        self.client.get(TASK_LIST_URL, {"order": "name", "name": "fix"})
+        response = self.client.get(TASK_LIST_URL + "?name=fix&order=name")
+        self.assertEqual(response["X-View-Cache"], "HIT")
+        response = self.client.get(TASK_LIST_URL, {"order": "-name"})
+        self.assertEqual(response["X-View-Cache"], "MISS")
+
+    def test_model_changes_invalidate_dependent_views(self) -> None:
+        self.client.get(TASK_LIST_URL)
+        self.client.get(POSITION_LIST_URL)
+        Task.objects.create(
+            name="Write the docs",
+            description="Test description",
+            deadline="2024-09-10",
+            priority=Task.PRIORITY_CHOICES["LOW"],
+        )
+        response = self.client.get(TASK_LIST_URL)
+        self.assertEqual(response["X-View-Cache"], "MISS")
+        self.assertContains(response, "Write the docs")
+        response = self.client.get(POSITION_LIST_URL)
+        self.assertEqual(response["X-View-Cache"], "HIT")
+
+    def test_assignment_invalidates_task_detail(self) -> None:
+        url = reverse("task_manager:task-detail", args=[self.task.id])
+        self.client.get(url)
+        self.task.assignees.add(self.admin)
+        response = self.client.get(url)
+        self.assertEqual(response["X-View-Cache"], "MISS")
+        self.assertContains(response, "Remove me from the task")
+
+    def test_version_is_bumped_again_on_commit(self) -> None:
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.task.assignees.add(self.admin)
+            (version,) = get_model_versions([Task])
+        self.assertEqual(len(callbacks), 1)
+        for callback in callbacks:
+            callback()
+        self.assertGreater(get_model_versions([Task])[0], version)
+
+    def test_hit_and_miss_metrics(self) -> None:
+        def lookups(outcome):
+            return REGISTRY.get_sample_value(
+                "task_manager_view_cache_lookups_total",
+                {"view": "TaskTypeListView", "outcome": outcome},
+            ) or 0
+
+        hits, misses = lookups("hit"), lookups("miss")
+        for _ in range(3):
+            self.client.get(TASK_TYPE_LIST_URL)
+        self.assertEqual(lookups("miss"), misses + 1)
+        self.assertEqual(lookups("hit"), hits + 2)
+
+
+class FragmentCacheTest(TestCase):
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.admin = get_user_model().objects.create_superuser(
+            username="admin.user",
+            password="1qazcde3",
+        )
+        self.client.force_login(self.admin)
+        self.task = Task.objects.create(
+            name="Fix the login page",
+            description="Old description",
+            deadline="2024-09-09",
+            priority=Task.PRIORITY_CHOICES["LOW"],
+        )
+
+    def test_task_card_is_cached_per_version(self) -> None:
+        self.client.get(TASK_LIST_URL)
+        key = make_template_fragment_key(
+            "task_card",
+            [self.task.id, self.task.updated_at, self.task.task_type],
+        )
+        self.assertIn("Old description", cache.get(key))
+
+        self.task.description = "New description"
+        self.task.save()
+        response = self.client.get(TASK_LIST_URL)
+        self.assertContains(response, "New description")
+        self.assertNotContains(response, "Old description")
@@ -0,0 +1,10 @@
+from debug_toolbar.middleware import show_toolbar as default_show_toolbar
+from django.conf import settings
+
+
+def show_toolbar(request):
+    """
+    The debug toolbar's own check, skipped unless DEBUG: it resolves
+    host.docker.internal on every request, which can block for seconds.
+    """
+    return settings.DEBUG and default_show_toolbar(request)
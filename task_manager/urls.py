@@ -1,5 +1,8 @@
 from django.urls import path
 
+import task_manager.api as api
+import task_manager.metrics as metrics
+import task_manager.profiling as profiling
 import task_manager.views as views
 
 
@@ -34,11 +37,21 @@ urlpatterns = [
         views.WorkerListView.as_view(),
         name="worker-list",
     ),
+    path(
+        "workers/autocomplete/",
+        views.WorkerAutocompleteView.as_view(),
+        name="worker-autocomplete",
+    ),
     path(
         "workers/<int:pk>/",
         views.WorkerDetailView.as_view(),
         name="worker-detail",
     ),
+    path(
+        "workers/<int:pk>/tasks/",
+        views.WorkerTaskListView.as_view(),
+        name="worker-task-list",
+    ),
     path(
         "workers/create/",
         views.WorkerCreateView.as_view(),
@@ -99,11 +112,71 @@ urlpatterns = [
         views.TaskDeleteView.as_view(),
         name="task-delete",
     ),
+    path(
+        "tasks/<int:pk>/toggle-assign/",
+        views.ToggleAssignToTask.as_view(),
+        name="toggle-task-assign",
+    ),
     path(
         "tasks/toggle-assign/",
         views.ToggleAssignToTask.as_view(),
         name="toggle-task-assign",
     ),
+    path(
+        "api/tasks/",
+        api.ApiListView.as_view(resource=api.TaskResource),
+        name="api-task-list",
+    ),
+    path(
+        "api/tasks/<int:pk>/",
+        api.ApiDetailView.as_view(resource=api.TaskResource),
+        name="api-task-detail",
+    ),
+    path(
+        "api/workers/",
+        api.ApiListView.as_view(resource=api.WorkerResource),
+        name="api-worker-list",
+    ),
+    path(
+        "api/workers/<int:pk>/",
+        api.ApiDetailView.as_view(resource=api.WorkerResource),
+        name="api-worker-detail",
+    ),
+    path(
+        "api/positions/",
+        api.ApiListView.as_view(resource=api.PositionResource),
+        name="api-position-list",
+    ),
+    path(
+        "api/positions/<int:pk>/",
+        api.ApiDetailView.as_view(resource=api.PositionResource),
+        name="api-position-detail",
+    ),
+    path(
+        "api/task_types/",
+        api.ApiListView.as_view(resource=api.TaskTypeResource),
+        name="api-task_type-list",
+    ),
+    path(
+        "api/task_types/<int:pk>/",
+        api.ApiDetailView.as_view(resource=api.TaskTypeResource),
+        name="api-task_type-detail",
+    ),
+    path(
+        "metrics",
+        metrics.metrics_view,
+        name="metrics",
+    ),
+    path(
+        "profiles/",
+        profiling.profile_list,
+        name="profile-list",
+    ),
+    path(
+        "profiles/<str:profile_id>/",
+        profiling.profile_detail,
+        name="profile-detail",
+    ),
 ]
 
 app_name = "task_manager"
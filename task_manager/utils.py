@@ -1,4 +1,8 @@
+import copy
+import hashlib
 import json
+import logging
+import threading
 from django.template import Context
 from django.utils import translation
 
@@ -13,9 +17,14 @@ from django.core.serializers.json import DjangoJSONEncoder
 from django.http import HttpResponse
 
 try:
-    from django.core.urlresolvers import reverse, resolve, NoReverseMatch
+    from django.core.urlresolvers import (
+        reverse,
+        resolve,
+        NoReverseMatch,
+        Resolver404,
+    )
 except ImportError:
-    from django.urls import reverse, resolve, NoReverseMatch
+    from django.urls import reverse, resolve, NoReverseMatch, Resolver404
 
 from django.contrib.admin import AdminSite
 from django.utils.text import capfirst
@@ -34,9 +43,20 @@ try:
 except ImportError:
     from ordereddict import OrderedDict
 
+from task_manager.metrics import ADMIN_SITE_LOOKUPS
+
 
 default_apps_icon = {"auth": "fa fa-users"}
 
+MENU_CACHE_SIZE = 128
+
+_menu_cache = OrderedDict()
+_menu_cache_lock = threading.Lock()
+
+_admin_sites_by_namespace = {}
+
+logger = logging.getLogger(__name__)
+
 
 class JsonResponse(HttpResponse):
     """
@@ -145,21 +165,55 @@ def get_app_list(context, order=True):
 
 
 def get_admin_site(context):
+    """
+    Return the admin site serving the current request.
+    The result is memoised on the request and per URL namespace, so a
+    render resolves the admin site at most once.
+    """
+    request = context.get("request")
+    admin_site = getattr(request, "_admin_site", None)
+    if admin_site is None:
+        admin_site = resolve_admin_site(request)
+        if request is not None:
+            request._admin_site = admin_site
+    return admin_site
+
+
+def resolve_admin_site(request):
     try:
-        current_resolver = resolve(context.get("request").path)
-        index_resolver = resolve(
-            reverse("%s:index" % current_resolver.namespaces[0])
+        match = getattr(request, "resolver_match", None) or resolve(
+            request.path
         )
+        namespace = match.namespaces[0]
+    except (AttributeError, IndexError, Resolver404):
+        ADMIN_SITE_LOOKUPS.labels("miss").inc()
+        return admin.site
+
+    admin_site = _admin_sites_by_namespace.get(namespace)
+    if admin_site is None:
+        ADMIN_SITE_LOOKUPS.labels("miss").inc()
+        admin_site = find_namespace_admin_site(namespace)
+        _admin_sites_by_namespace[namespace] = admin_site
+    else:
+        ADMIN_SITE_LOOKUPS.labels("hit").inc()
+    return admin_site
+
 
+def find_namespace_admin_site(namespace):
+    try:
+        index_resolver = resolve(reverse("%s:index" % namespace))
+    except (NoReverseMatch, Resolver404):
+        index_resolver = None
+
+    if index_resolver is not None:
         if hasattr(index_resolver.func, "admin_site"):
             return index_resolver.func.admin_site
 
-        for func_closure in index_resolver.func.__closure__:
+        for func_closure in index_resolver.func.__closure__ or ():
             if isinstance(func_closure.cell_contents, AdminSite):
                 return func_closure.cell_contents
-    except Exception as e:
-        print(f"An unexpected error eccurred: {e}")
 
+    logger.debug("No admin site found for namespace %r", namespace)
     return admin.site
 
 
@@ -347,7 +401,7 @@ def get_menu_item_url(url, original_app_list):
         return url
 
 
-def get_menu_items(context):
+def build_menu_items(context):
     pinned_apps = []
     original_app_list = OrderedDict(
         map(
@@ -497,6 +551,38 @@ def get_menu_items(context):
 
         app_list = list(map(map_item, original_app_list.values()))
 
+    return app_list
+
+
+def get_menu_items(context):
+    """
+    Return the admin menu with the ``current`` flags set for this request.
+    The menu itself only depends on the admin site, the user's permissions
+    and the active language, so it is built once per combination.
+    """
+    request = context["request"]
+    key = (
+        get_admin_site(context).name,
+        get_permission_fingerprint(request.user),
+        translation.get_language(),
+    )
+    with _menu_cache_lock:
+        app_list = _menu_cache.get(key)
+        if app_list is not None:
+            _menu_cache.move_to_end(key)
+    if app_list is None:
+        app_list = build_menu_items(context)
+        with _menu_cache_lock:
+            _menu_cache[key] = app_list
+            while len(_menu_cache) > MENU_CACHE_SIZE:
+                _menu_cache.popitem(last=False)
+
+    app_list = copy.deepcopy(app_list)
+    mark_current_menu_items(app_list, request.path)
+    return app_list
+
+
+def mark_current_menu_items(app_list, path):
     current_found = False
 
     for app in app_list:
@@ -505,7 +591,7 @@ def get_menu_items(context):
                 if (
                     not current_found
                     and model.get("url")
-                    and context["request"].path.startswith(model["url"])
+                    and path.startswith(model["url"])
                 ):
                     model["current"] = True
                     current_found = True
@@ -515,14 +601,28 @@ def get_menu_items(context):
             if (
                 not current_found
                 and app.get("url")
-                and context["request"].path.startswith(app["url"])
+                and path.startswith(app["url"])
             ):
                 app["current"] = True
                 current_found = True
             else:
                 app["current"] = False
 
-    return app_list
+
+def clear_menu_cache():
+    with _menu_cache_lock:
+        _menu_cache.clear()
+
+
+def get_permission_fingerprint(user):
+    if user.is_superuser:
+        return "superuser"
+    perms = ",".join(sorted(user.get_all_permissions()))
+    return "%d-%d-%s" % (
+        user.is_active,
+        user.is_staff,
+        hashlib.md5(perms.encode()).hexdigest(),
+    )
 
 
 def context_to_dict(context):
@@ -0,0 +1,179 @@
+import hashlib
+import re
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+
+from task_manager.metrics import VIEW_CACHE_LOOKUPS
+from task_manager.utils import get_permission_fingerprint
+
+
+VERSION_KEY = "task_manager:version:%s"
+CSRF_PLACEHOLDER = "__task_manager_csrf_token__"
+CSRF_INPUT_RE = re.compile(
+    r'(name="csrfmiddlewaretoken" value=")[^"]*(")'
+)
+
+
+def get_cache():
+    return caches[getattr(settings, "VIEW_CACHE_ALIAS", "default")]
+
+
+def get_model_versions(models):
+    """
+    Return the current cache version of each model label.
+    Versions start from a timestamp, so an evicted counter never falls back
+    to a value that older cache entries were stored under.
+    """
+    cache = get_cache()
+    keys = [VERSION_KEY % model._meta.label_lower for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def incr_version(key):
+    cache = get_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), None)
+
+
+def bump_model_version(model, using=None):
+    key = VERSION_KEY % model._meta.label_lower
+    incr_version(key)
+    # Bump it again once the change is visible to other connections, so a
+    # concurrent request cannot cache the pre-commit rows under the new
+    # version.
+    transaction.on_commit(lambda: incr_version(key), using=using)
+
+
+def normalize_query(query_dict):
+    return "&".join(
+        "%s=%s" % (key, value)
+        for key, value in sorted(
+            (key, value)
+            for key in query_dict
+            for value in query_dict.getlist(key)
+        )
+    )
+
+
+class CachedViewMixin:
+    """
+    Cache the rendered GET response of a view.
+
+    The key covers the view, the user's permission scope (or the user
+    itself with ``cache_per_user``), the normalised query string and the
+    versions of ``cache_models``, which signals bump on every change.
+    CSRF tokens are stored as a placeholder and refreshed on every hit.
+    Views with async handlers are dispatched by ``adispatch``.
+    """
+
+    cache_models = ()
+    cache_per_user = False
+    cache_timeout = None
+
+    def get_cache_scope(self):
+        user = self.request.user
+        if self.cache_per_user:
+            return "user-%s" % user.pk
+        return get_permission_fingerprint(user)
+
+    def get_cache_key(self):
+        versions = get_model_versions(self.cache_models)
+        query = normalize_query(self.request.GET)
+        return "task_manager:view:%s:%s:%s:%s" % (
+            self.get_cache_view_name(),
+            self.get_cache_scope(),
+            ".".join(str(version) for version in versions),
+            hashlib.md5(
+                (self.request.path + "?" + query).encode()
+            ).hexdigest(),
+        )
+
+    def get_cache_view_name(self):
+        return type(self).__name__
+
+    def is_cacheable(self, request):
+        return request.method == "GET" and getattr(
+            settings, "VIEW_CACHE_ENABLED", True
+        )
+
+    def get_cached_response(self):
+        """
+        Return the cache key of the request and the cached response, or
+        ``None`` on a miss.
+        """
+        view_name = self.get_cache_view_name()
+        cache_key = self.get_cache_key()
+        cached = get_cache().get(cache_key)
+        if cached is None:
+            VIEW_CACHE_LOOKUPS.labels(view_name, "miss").inc()
+            return cache_key, None
+        VIEW_CACHE_LOOKUPS.labels(view_name, "hit").inc()
+        content, content_type = cached
+        response = HttpResponse(
+            content.replace(CSRF_PLACEHOLDER, get_token(self.request)),
+            content_type=content_type,
+        )
+        response["X-View-Cache"] = "HIT"
+        return cache_key, response
+
+    def cache_response(self, cache_key, response):
+        if response.status_code == 200:
+            if hasattr(response, "render") and callable(response.render):
+                response.add_post_render_callback(
+                    lambda rendered: self.store_response(cache_key, rendered)
+                )
+            else:
+                self.store_response(cache_key, response)
+        response["X-View-Cache"] = "MISS"
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.view_is_async:
+            return self.adispatch(request, *args, **kwargs)
+        if not self.is_cacheable(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        cache_key, response = self.get_cached_response()
+        if response is not None:
+            return response
+        response = super().dispatch(request, *args, **kwargs)
+        self.cache_response(cache_key, response)
+        return response
+
+    async def adispatch(self, request, *args, **kwargs):
+        if not self.is_cacheable(request):
+            return await super().dispatch(request, *args, **kwargs)
+
+        # The key depends on the user's permissions, which may need a query.
+        cache_key, response = await sync_to_async(self.get_cached_response)()
+        if response is not None:
+            return response
+        response = await super().dispatch(request, *args, **kwargs)
+        await sync_to_async(self.cache_response)(cache_key, response)
+        return response
+
+    def store_response(self, cache_key, response):
+        content = CSRF_INPUT_RE.sub(
+            r"\g<1>%s\g<2>" % CSRF_PLACEHOLDER,
+            response.content.decode(response.charset),
+        )
+        timeout = self.cache_timeout
+        if timeout is None:
+            timeout = getattr(settings, "VIEW_CACHE_TIMEOUT", 300)
+        get_cache().set(
+            cache_key,
+            (content, response["Content-Type"]),
+            timeout,
+        )
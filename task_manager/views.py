@@ -1,4 +1,12 @@
-from django.http import HttpRequest, HttpResponse, HttpResponseRedirect
+from django.http import (
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseBadRequest,
+    HttpResponseRedirect,
+)
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Count, Q
 from django.shortcuts import render
 from django.urls import reverse_lazy
 from django.views import generic
@@ -13,54 +21,132 @@ from task_manager.forms import (
     TaskTypeNameSearchForm,
     WorkerForm,
     WorkerUpdateForm,
+    WorkerTaskFilterForm,
     WorkerUsernameSearchForm,
 )
 
+from .aggregates import (
+    WORKER_TASK_COUNTS,
+    count_position_workers,
+    count_task_type_tasks,
+    count_worker_tasks,
+)
+from .assignments import annotate_is_assigned, toggle_assignments
+from .counters import get_dashboard_counts
 from .models import Worker, Position, TaskType, Task
+from .ordering import (
+    POSITION_ORDERINGS,
+    TASK_ORDERINGS,
+    TASK_TYPE_ORDERINGS,
+    WORKER_ORDERINGS,
+    OrderingMixin,
+)
+from .pagination import (
+    CURSOR_VAR,
+    CursorPaginationMixin,
+    CursorPaginator,
+    InvalidCursor,
+)
+from .query_budget import query_budget
+from .search import search
+from .utils import JsonResponse
+from .view_cache import CachedViewMixin
+from .visits import record_visit
 
 
+@query_budget(3)
 @login_required
 def index(request: HttpRequest) -> HttpResponse:
 
-    num_workers = Worker.objects.count()
-    num_positions = Position.objects.count()
-    num_tasktypes = TaskType.objects.count()
-    num_tasks = Task.objects.count()
+    counts = get_dashboard_counts()
 
-    num_visits = request.session.get("num_visits", 0)
-    request.session["num_visits"] = num_visits + 1
+    num_visits = record_visit(request)
 
-    context = {
-        "num_workers": num_workers,
-        "num_positions": num_positions,
-        "num_tasktypes": num_tasktypes,
-        "num_tasks": num_tasks,
-        "num_visits": num_visits + 1,
-    }
+    context = get_index_context(counts, num_visits)
 
     return render(request, "task_manager/index.html", context=context)
 
 
-class PositionListView(LoginRequiredMixin, generic.ListView):
+def get_index_context(counts, num_visits):
+    return {
+        "num_workers": counts["num_workers"],
+        "num_positions": counts["num_positions"],
+        "num_tasktypes": counts["num_tasktypes"],
+        "num_tasks": counts["num_tasks"],
+        "num_visits": num_visits,
+    }
+
+
+class PageCountsMixin:
+    """
+    Set ``counts_attr`` on every object of the page from a single grouped
+    query made by ``count_objects`` over the page's ids. By default it
+    counts the related objects of ``counts_relation``.
+    """
+
+    counts_attr = None
+    counts_relation = None
+    counts_default = 0
+
+    def count_objects(self, ids):
+        if self.counts_relation is None:
+            raise ImproperlyConfigured(
+                "%s needs either a counts_relation or a count_objects() "
+                "override." % self.__class__.__name__
+            )
+        return dict(
+            self.model.objects.filter(pk__in=ids).values("pk").annotate(
+                count=Count(self.counts_relation)
+            ).order_by().values_list("pk", "count")
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        objects = list(context["object_list"])
+        counts = self.count_objects([obj.pk for obj in objects])
+        for obj in objects:
+            setattr(
+                obj,
+                self.counts_attr,
+                counts.get(obj.pk, self.counts_default),
+            )
+        context["object_list"] = objects
+        context_object_name = self.get_context_object_name(self.object_list)
+        if context_object_name is not None:
+            context[context_object_name] = objects
+        return context
+
+
+@query_budget(6)
+class PositionListView(
+    LoginRequiredMixin,
+    CachedViewMixin,
+    CursorPaginationMixin,
+    OrderingMixin,
+    PageCountsMixin,
+    generic.ListView,
+):
+    cache_models = (Position, Worker)
     model = Position
     paginate_by = 6
+    orderings = POSITION_ORDERINGS
+    counts_attr = "num_workers"
+    count_objects = staticmethod(count_position_workers)
 
     def get_context_data(self, *, object_list=None, **kwargs):
         context = super(PositionListView, self).get_context_data(**kwargs)
         name = self.request.GET.get("name", "")
         context["search_form"] = PositionNameSearchForm(
-            initial={"name": name},
+            initial={"name": name, "order": self.get_ordering_key()},
         )
         return context
 
     def get_queryset(self):
-        queryset = super().get_queryset().order_by("id")
+        queryset = super().get_queryset()
         form = PositionNameSearchForm(self.request.GET)
-        if form.is_valid():
-            return queryset.filter(
-                name__icontains=form.cleaned_data["name"]
-            )
-        return queryset
+        form.is_valid()
+        queryset = search(queryset, form.cleaned_data.get("name", ""))
+        return self.order_queryset(queryset)
 
 
 class PositionCreateView(LoginRequiredMixin, generic.CreateView):
@@ -80,33 +166,155 @@ class PositionDeleteView(LoginRequiredMixin, generic.DeleteView):
     success_url = reverse_lazy("task_manager:position-list")
 
 
-class WorkerListView(LoginRequiredMixin, generic.ListView):
+@query_budget(6)
+class WorkerListView(
+    LoginRequiredMixin,
+    CachedViewMixin,
+    CursorPaginationMixin,
+    OrderingMixin,
+    PageCountsMixin,
+    generic.ListView,
+):
+    cache_models = (Worker, Position, Task)
     model = Worker
     paginate_by = 6
+    orderings = WORKER_ORDERINGS
+    counts_attr = "task_counts"
+    counts_default = WORKER_TASK_COUNTS
+    count_objects = staticmethod(count_worker_tasks)
 
     def get_context_data(self, *, object_list=None, **kwargs):
         context = super(WorkerListView, self).get_context_data(**kwargs)
         username = self.request.GET.get("username", "")
         context["search_form"] = WorkerUsernameSearchForm(
-            initial={"username": username},
+            initial={"username": username, "order": self.get_ordering_key()},
         )
         return context
 
     def get_queryset(self):
-        queryset = Worker.objects.select_related("position").order_by("id")
+        queryset = Worker.objects.select_related("position")
         form = WorkerUsernameSearchForm(self.request.GET)
-        if form.is_valid():
-            return queryset.filter(
-                username__icontains=form.cleaned_data["username"]
-            )
-        return queryset
+        form.is_valid()
+        queryset = search(queryset, form.cleaned_data.get("username", ""))
+        return self.order_queryset(queryset)
+
 
+class WorkerTasksMixin:
+    """
+    Provide one cursor page of a worker's tasks, filtered by completion
+    status and deadline range, as ``task_page`` and ``task_filter_form``.
+    """
 
-class WorkerDetailView(LoginRequiredMixin, generic.DetailView):
+    tasks_per_page = 12
+
+    def get_worker_tasks(self, worker_id):
+        form = WorkerTaskFilterForm(self.request.GET)
+        queryset = Task.objects.filter(assignees=worker_id).only(
+            "id", "name", "description", "deadline", "updated_at"
+        ).order_by("deadline")
+        if form.is_valid():
+            status = form.cleaned_data["status"]
+            if status == "open":
+                queryset = queryset.filter(is_completed=False)
+            elif status == "completed":
+                queryset = queryset.filter(is_completed=True)
+            if form.cleaned_data["deadline_from"]:
+                queryset = queryset.filter(
+                    deadline__gte=form.cleaned_data["deadline_from"]
+                )
+            if form.cleaned_data["deadline_to"]:
+                queryset = queryset.filter(
+                    deadline__lte=form.cleaned_data["deadline_to"]
+                )
+
+        paginator = CursorPaginator(queryset, self.tasks_per_page)
+        try:
+            page = paginator.page(self.request.GET.get(CURSOR_VAR))
+        except InvalidCursor as e:
+            raise Http404("Invalid cursor: %s" % e)
+        return {
+            "worker_id": worker_id,
+            "task_page": page,
+            "task_filter_form": form,
+        }
+
+
+@query_budget(6)
+class WorkerDetailView(
+    LoginRequiredMixin,
+    CachedViewMixin,
+    WorkerTasksMixin,
+    generic.DetailView,
+):
+    cache_models = (Worker, Position, Task)
     model = Worker
-    queryset = Worker.objects.select_related("position").prefetch_related(
-        "tasks"
-    )
+    queryset = Worker.objects.select_related("position")
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update(self.get_worker_tasks(self.object.id))
+        return context
+
+
+@query_budget(5)
+class WorkerTaskListView(
+    LoginRequiredMixin,
+    CachedViewMixin,
+    WorkerTasksMixin,
+    generic.TemplateView,
+):
+    """
+    Serve further pages of the worker's tasks as an HTML fragment for the
+    "Load more" button on the worker page.
+    """
+
+    cache_models = (Task,)
+    template_name = "includes/worker_tasks.html"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update(self.get_worker_tasks(self.kwargs["pk"]))
+        return context
+
+
+@query_budget(3)
+class WorkerAutocompleteView(LoginRequiredMixin, generic.View):
+    """
+    Return up to ``limit`` workers whose username, first or last name
+    starts with ``q``, plus username matches from the search backend.
+    """
+
+    limit = 20
+    min_query_length = 1
+
+    def get(self, request, *args, **kwargs) -> JsonResponse:
+        query = self.get_query()
+        if len(query) < self.min_query_length:
+            return JsonResponse({"results": []})
+        return self.results_response(self.get_workers(query))
+
+    def get_query(self):
+        return self.request.GET.get("q", "").strip()
+
+    def get_workers(self, query):
+        workers = Worker.objects.select_related("position")
+        prefix = workers.filter(
+            Q(username__istartswith=query)
+            | Q(first_name__istartswith=query)
+            | Q(last_name__istartswith=query)
+        )
+        return (prefix | search(workers, query)).order_by(
+            "username"
+        )[:self.limit]
+
+    @staticmethod
+    def results_response(workers):
+        return JsonResponse({
+            "results": [
+                {"id": worker.id, "text": str(worker)}
+                for worker in workers
+            ],
+        })
 
 
 class WorkerCreateView(LoginRequiredMixin, generic.CreateView):
@@ -126,9 +334,21 @@ class WorkerDeleteView(LoginRequiredMixin, generic.DeleteView):
     success_url = reverse_lazy("task_manager:worker-list")
 
 
-class TaskTypeListView(LoginRequiredMixin, generic.ListView):
+@query_budget(6)
+class TaskTypeListView(
+    LoginRequiredMixin,
+    CachedViewMixin,
+    CursorPaginationMixin,
+    OrderingMixin,
+    PageCountsMixin,
+    generic.ListView,
+):
+    cache_models = (TaskType, Task)
     model = TaskType
     paginate_by = 6
+    orderings = TASK_TYPE_ORDERINGS
+    counts_attr = "num_tasks"
+    count_objects = staticmethod(count_task_type_tasks)
     template_name = "task_manager/task_type_list.html"
     context_object_name = "task_type_list"
 
@@ -136,18 +356,16 @@ class TaskTypeListView(LoginRequiredMixin, generic.ListView):
         context = super(TaskTypeListView, self).get_context_data(**kwargs)
         name = self.request.GET.get("name", "")
         context["search_form"] = TaskTypeNameSearchForm(
-            initial={"name": name},
+            initial={"name": name, "order": self.get_ordering_key()},
         )
         return context
 
     def get_queryset(self):
-        queryset = super().get_queryset().order_by("id")
+        queryset = super().get_queryset()
         form = TaskTypeNameSearchForm(self.request.GET)
-        if form.is_valid():
-            return queryset.filter(
-                name__icontains=form.cleaned_data["name"]
-            )
-        return queryset
+        form.is_valid()
+        queryset = search(queryset, form.cleaned_data.get("name", ""))
+        return self.order_queryset(queryset)
 
 
 class TaskTypeCreateView(LoginRequiredMixin, generic.CreateView):
@@ -170,54 +388,128 @@ class TaskTypeDeleteView(LoginRequiredMixin, generic.DeleteView):
     template_name = "task_manager/task_type_confirm_delete.html"
 
 
-class TaskListView(LoginRequiredMixin, generic.ListView):
+@query_budget(10)
+class TaskListView(
+    LoginRequiredMixin,
+    CachedViewMixin,
+    CursorPaginationMixin,
+    OrderingMixin,
+    generic.ListView,
+):
+    cache_models = (Task, TaskType, Worker)
     model = Task
     paginate_by = 6
+    orderings = TASK_ORDERINGS
 
     def get_context_data(self, *, object_list=None, **kwargs):
         context = super(TaskListView, self).get_context_data(**kwargs)
-        name = self.request.GET.get("name", "")
-        task_completion = self.request.GET.get("task_completion", "all")
-        order = self.request.GET.get("order", "none")
-        context["filter_form"] = TaskFilterForm(
-            initial={
-                "name": name,
-                "task_completion": task_completion,
-                "order": order,
-            },
+        initial = {
+            "name": "",
+            "task_completion": "all",
+        }
+        initial.update(
+            (name, self.request.GET[name])
+            for name in TaskFilterForm.base_fields
+            if self.request.GET.get(name)
         )
+        initial["order"] = self.get_ordering_key()
+        context["filter_form"] = TaskFilterForm(initial=initial)
+        context["facets"] = self.get_facets(self.filtered_queryset)
         return context
 
+    def get_filter_data(self):
+        form = TaskFilterForm(self.request.GET)
+        form.is_valid()
+        # Fields that failed validation are simply not applied.
+        return form.cleaned_data
+
     def get_queryset(self):
-        queryset = Task.objects.select_related("task_type").order_by("id")
+        self.filter_data = self.get_filter_data()
+        queryset = Task.objects.select_related("task_type")
         queryset = self.filter_by_completion_status(queryset)
+        queryset = self.filter_by_fields(queryset)
         queryset = self.filter_by_name(queryset)
-        queryset = self.order_by(queryset)
-        return queryset
+        self.filtered_queryset = queryset
+        return self.order_queryset(queryset)
 
     def filter_by_completion_status(self, queryset):
-        completion_status = self.request.GET.get("task_completion", "all")
-        if completion_status != "all":
+        completion_status = self.filter_data.get("task_completion")
+        if completion_status in ("True", "False"):
             return queryset.filter(is_completed=completion_status)
         return queryset
 
-    def filter_by_name(self, queryset):
-        form = TaskFilterForm(self.request.GET)
-        if form.is_valid():
-            return queryset.filter(name__icontains=form.cleaned_data["name"])
-        return queryset
-
-    def order_by(self, queryset):
-        order = self.request.GET.get("order", "none")
-        if order != "none":
-            return queryset.order_by(order)
+    def filter_by_fields(self, queryset):
+        data = self.filter_data
+        if data.get("assignee"):
+            queryset = queryset.filter(assignees=data["assignee"])
+        if data.get("task_type"):
+            queryset = queryset.filter(task_type=data["task_type"])
+        if data.get("priority"):
+            queryset = queryset.filter(priority=data["priority"])
+        if data.get("deadline_from"):
+            queryset = queryset.filter(deadline__gte=data["deadline_from"])
+        if data.get("deadline_to"):
+            queryset = queryset.filter(deadline__lte=data["deadline_to"])
         return queryset
 
+    def filter_by_name(self, queryset):
+        return search(
+            queryset,
+            self.filter_data.get("name", ""),
+            ranked=self.get_ordering_key() == "relevance",
+        )
 
-class TaskDetailView(LoginRequiredMixin, generic.DetailView):
+    @classmethod
+    def get_facets(cls, queryset):
+        """
+        Count the filtered tasks per priority, task type and status from a
+        single query grouped by all three.
+        """
+        return cls.count_facets(cls.get_facet_rows(queryset))
+
+    @staticmethod
+    def get_facet_rows(queryset):
+        return queryset.order_by().values(
+            "priority", "task_type", "task_type__name", "is_completed"
+        ).annotate(count=Count("id"))
+
+    @staticmethod
+    def count_facets(rows):
+        priorities = dict.fromkeys(Task.Priority.values, 0)
+        task_types = {}
+        statuses = {True: 0, False: 0}
+        for row in rows:
+            priorities[row["priority"]] += row["count"]
+            task_type = row["task_type__name"] or "No type"
+            task_types[task_type] = task_types.get(task_type, 0) + row["count"]
+            statuses[row["is_completed"]] += row["count"]
+        return {
+            "priority": [
+                (Task.Priority(value).label, count)
+                for value, count in priorities.items()
+            ],
+            "task_type": sorted(task_types.items()),
+            "status": [
+                ("Not completed", statuses[False]),
+                ("Completed", statuses[True]),
+            ],
+        }
+
+
+@query_budget(6)
+class TaskDetailView(
+    LoginRequiredMixin,
+    CachedViewMixin,
+    generic.DetailView,
+):
+    cache_models = (Task, TaskType, Worker, Position)
+    cache_per_user = True
     model = Task
     queryset = Task.objects.prefetch_related("assignees__position")
 
+    def get_queryset(self):
+        return annotate_is_assigned(super().get_queryset(), self.request.user)
+
 
 class TaskCreateView(LoginRequiredMixin, generic.CreateView):
     model = Task
@@ -236,17 +528,55 @@ class TaskDeleteView(LoginRequiredMixin, generic.DeleteView):
     success_url = reverse_lazy("task_manager:task-list")
 
 
-class ToggleAssignToTask(LoginRequiredMixin, generic.UpdateView):
+class ToggleAssignToTask(LoginRequiredMixin, generic.View):
+    """
+    Toggle the current worker's assignment to one task (``pk`` in the URL)
+    or to every ``task_id`` posted.
 
-    def post(self, request, *args, **kwargs) -> HttpResponseRedirect:
-        worker = request.user
-        task_id = request.POST.get("task_id")
-        task = Task.objects.get(id=task_id)
+    Answers with JSON when asked for it, with the assignees fragment of the
+    task page for in-page requests and with a redirect otherwise.
+    """
 
-        if worker in task.assignees.all():
-            task.assignees.remove(worker)
+    def post(self, request, *args, **kwargs) -> HttpResponse:
+        if "pk" in kwargs:
+            task_ids = [kwargs["pk"]]
         else:
-            task.assignees.add(worker)
-        return HttpResponseRedirect(
-            reverse_lazy("task_manager:task-detail", args=[task_id])
-        )
+            try:
+                task_ids = [
+                    int(task_id) for task_id in request.POST.getlist("task_id")
+                ]
+            except ValueError:
+                return HttpResponseBadRequest("Invalid task_id")
+        if not task_ids:
+            return HttpResponseBadRequest("No task_id given")
+
+        assigned = toggle_assignments(request.user, task_ids)
+        if len(task_ids) == 1 and not assigned:
+            raise Http404("No task found matching the query")
+
+        if request.accepts("application/json") and not request.accepts(
+            "text/html"
+        ):
+            return JsonResponse({
+                "tasks": [
+                    {"id": task_id, "assigned": assigned[task_id]}
+                    for task_id in task_ids
+                    if task_id in assigned
+                ],
+            })
+        if len(task_ids) == 1:
+            task_id = task_ids[0]
+            if request.headers.get("X-Requested-With") == "XMLHttpRequest":
+                task = annotate_is_assigned(
+                    Task.objects.prefetch_related("assignees__position"),
+                    request.user,
+                ).get(pk=task_id)
+                return render(
+                    request,
+                    "includes/task_assignees.html",
+                    {"task": task},
+                )
+            return HttpResponseRedirect(
+                reverse_lazy("task_manager:task-detail", args=[task_id])
+            )
+        return HttpResponseRedirect(reverse_lazy("task_manager:task-list"))
@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.core.cache import cache
+
+
+VISITS_CACHE_KEY = "task_manager:visits:%s"
+SESSION_VISITS_KEY = "num_visits"
+
+
+def record_visit(request):
+    """
+    Count a visit of the current session and return the running total.
+
+    Increments are buffered in the cache and only written to the session
+    (and so to the session store) every ``VISIT_COUNTER_FLUSH_EVERY``
+    visits, so most requests leave the session untouched.
+    """
+    session = request.session
+    stored = session.get(SESSION_VISITS_KEY, 0)
+    if session.session_key is None:
+        session[SESSION_VISITS_KEY] = stored + 1
+        return stored + 1
+
+    key = VISITS_CACHE_KEY % session.session_key
+    timeout = getattr(settings, "VISIT_COUNTER_TIMEOUT", None)
+    cache.add(key, 0, timeout)
+    try:
+        pending = cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout)
+        pending = 1
+
+    if pending >= getattr(settings, "VISIT_COUNTER_FLUSH_EVERY", 10):
+        session[SESSION_VISITS_KEY] = stored + pending
+        # Keep increments made by concurrent requests since our incr.
+        cache.decr(key, pending)
+    return stored + pending